@@ -0,0 +1,61 @@
+import sys
+import tracemalloc
+import types
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import pyrevolt
+
+COUNT: int = 50000
+UNSLOTTED: dict[type, type] = {object: object}
+
+def Unslotted(cls: type) -> type:
+    # The same class and bases without __slots__ and without interning IDs, the way these classes used to be laid
+    # out. A plain subclass would not do, it inherits the slots and only adds an empty __dict__ next to them
+    if cls not in UNSLOTTED:
+        slots: tuple[str, ...] = getattr(cls, "__slots__", ())
+        namespace: dict = {name: value for name, value in vars(cls).items() if name not in slots and name not in ("__slots__", "__dict__", "__weakref__")}
+        unslotted: type = type(f"Unslotted{cls.__name__}", tuple(Unslotted(base) for base in cls.__bases__), namespace)
+        for name, value in namespace.items():
+            if not isinstance(value, types.FunctionType):
+                continue
+            # super() finds the class through the __class__ cell of the method, which has to point at the copy
+            closure: tuple|None = value.__closure__
+            if "__class__" in value.__code__.co_freevars:
+                closure = tuple(types.CellType(unslotted) if free == "__class__" else cell for free, cell in zip(value.__code__.co_freevars, closure))
+            function: types.FunctionType = types.FunctionType(value.__code__, {**value.__globals__, "Intern": lambda ID: ID}, value.__name__, value.__defaults__, closure)
+            function.__kwdefaults__ = value.__kwdefaults__
+            setattr(unslotted, name, function)
+        UNSLOTTED[cls] = unslotted
+    return UNSLOTTED[cls]
+
+def Measure(build: callable) -> tuple[float, list]:
+    tracemalloc.start()
+    before: int = tracemalloc.get_traced_memory()[0]
+    objects: list = [build(index) for index in range(COUNT)]
+    after: int = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / COUNT, objects
+
+def main() -> None:
+    server: pyrevolt.Server = pyrevolt.Server("01SERVER", None, "Server", [], 0, roles={})
+    users: list[pyrevolt.User] = [pyrevolt.User(f"{index:026d}", f"user{index}") for index in range(COUNT)]
+    slotted: types.SimpleNamespace = types.SimpleNamespace(**{cls.__name__: cls for cls in (pyrevolt.User, pyrevolt.Status, pyrevolt.Member, pyrevolt.Role, pyrevolt.TextChannel, pyrevolt.Message)})
+    # Objects built inside a case, like the Status of a User, are unslotted too
+    unslotted: types.SimpleNamespace = types.SimpleNamespace(**{name: Unslotted(cls) for name, cls in vars(slotted).items()})
+    cases: dict[str, callable] = {
+        "User": lambda classes, index: classes.User(f"{index:026d}", f"user{index}", badges=0, online=True, status=classes.Status(pyrevolt.Presence.Online)),
+        "Member": lambda classes, index: classes.Member(users[index], server, nickname=None, roles=[]),
+        "Role": lambda classes, index: classes.Role(f"{index:026d}", "Role", 0, colour=None, hoist=False, rank=index),
+        "Status": lambda classes, index: classes.Status(pyrevolt.Presence.Online, text="Playing"),
+        "TextChannel": lambda classes, index: classes.TextChannel(f"{index:026d}", server, "general"),
+        "Message": lambda classes, index: classes.Message(f"{index:026d}", "01CHANNEL", users[index % 100].userID, content="Hello"),
+    }
+    print(f"{'Class':<12} {'Slotted':>10} {'Unslotted':>10} {'Saved':>8}")
+    for name, build in cases.items():
+        slottedSize, kept = Measure(lambda index: build(slotted, index))
+        unslottedSize, keptUnslotted = Measure(lambda index: build(unslotted, index))
+        print(f"{name:<12} {slottedSize:>9.0f}B {unslottedSize:>9.0f}B {1 - slottedSize / unslottedSize:>7.0%}")
+        del kept, keptUnslotted
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,19 @@
 from .client import Method, Request, HTTPClient
-from .gateway import GatewayKeepAlive, Gateway, GatewayEvent
+from .codec import JSONCodec, OrjsonCodec, MsgspecCodec, GetCodec
+from .ratelimit import Bucket, RateLimiter
+from .cache import CacheStats, MessageCache, IndexedStore, UserStore, ChannelStore, MemberStore
+from .gateway import GatewayKeepAlive, Gateway, GatewayEvent, EventRegistry
 from .events import *
 from .session import Session
-from .bot import Bot
-from .exceptions import ClosedSocketException
+from .dispatcher import Dispatcher
+from .sender import MessageSender
+from .persistence import SessionStore
+from .bot import CommandNode, Bot
+from .cluster import Cluster
+from .permissions import Permission, PermissionCalculator
+from .exceptions import ClosedSocketException, HTTPException, RateLimitedException, ArgumentConversionException
 from .structs.user import Relationship, Presence, Status, BotUser, User
 from .structs.channels import ChannelType, Channel, SavedMessages, DirectMessage, Group, TextChannel, VoiceChannel, Message, EmbedType, EmbedImageSize, Embed, Masquerade, Reply
 from .structs.server import Category, SystemMessages, Role, Server
-from .structs.member import Member
\ No newline at end of file
+from .structs.member import Member
+from .structs.common import Snapshot
\ No newline at end of file
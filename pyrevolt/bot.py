@@ -1,82 +1,223 @@
 from __future__ import annotations
 import asyncio
-import json
+import inspect
 from typing import Any
 from .structs.member import Member
-from .exceptions import InvalidSession
-from .gateway import GatewayEvent
+from .cache import MessageCache
+from .client import HTTPClient
+from .codec import JSONCodec
+from .dispatcher import Dispatcher
+from .converters import CONVERTERS, Convert, GetParameters
+from .exceptions import InvalidSession, ArgumentConversionException
+from .gateway import GatewayEvent, EventRegistry
+from .events import Event
 from .session import Session
+from .persistence import SessionStore
 from .structs.channels import Channel, Message
 from .structs.user import User
 from .structs.server import Server, Role
 
+class CommandNode:
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+        self.listener: callable|None = None
+        self.parameters: list[inspect.Parameter] = []
+        self.errors: list[callable] = []
+        self.children: dict[str, CommandNode] = {}
+
+    def __repr__(self) -> str:
+        return f"<pyrevolt.CommandNode name={self.name} listener={self.listener} children={len(self.children)}>"
+
 class Bot:
     class Commands:
         def __init__(self, bot: Bot, **kwargs) -> None:
-            self.commandListeners: dict[callable, dict[str, list[str]]] = {}
+            self.commandListeners: dict[callable, CommandNode] = {}
             self.errorListeners: dict[callable, list[callable]] = {}
             self.bot: Bot = bot
-            self.prefix: str = kwargs.get("prefix", "")
+            prefix: str|list[str]|None = kwargs.get("prefix")
+            self.prefixes: list[str] = [prefix or ""] if not isinstance(prefix, (list, tuple)) else list(prefix)
+            # Longest first so a prefix which starts another one cannot shadow it
+            self.prefixes.sort(key=len, reverse=True)
+            self.caseInsensitive: bool = kwargs.get("caseInsensitive", False)
+            self.root: CommandNode = CommandNode("")
+            self.converters: dict[type, callable] = dict(CONVERTERS)
+
+        @property
+        def prefix(self) -> str:
+            return self.prefixes[0]
+
+        def Key(self, trigger: str) -> str:
+            return trigger.casefold() if self.caseInsensitive else trigger
+
+        def GetNode(self, name: str, create: bool = False) -> CommandNode|None:
+            node: CommandNode = self.root
+            for part in name.split():
+                child: CommandNode|None = node.children.get(self.Key(part))
+                if child is None:
+                    if not create:
+                        return None
+                    child = CommandNode(part)
+                    node.children[self.Key(part)] = child
+                node = child
+            return node
 
         def Command(self, **kwargs) -> callable:
             def decorator(func: callable) -> callable:
                 func.Error = self.Error(**kwargs)
-                self.commandListeners[func] = {}
-                triggers: list[str] = [kwargs["name"]]
+                # A name with spaces registers a subcommand, "config set" runs under the "config" group
+                node: CommandNode = self.GetNode(kwargs["name"], create=True)
+                node.listener = func
+                node.parameters = GetParameters(func)
+                parent: CommandNode = self.GetNode(" ".join(kwargs["name"].split()[:-1]))
                 for alias in kwargs.get("aliases", []):
-                    triggers.append(alias)
-                self.commandListeners[func]["triggers"] = triggers
+                    parent.children[self.Key(alias)] = node
+                self.commandListeners[func] = node
+                return func
+            return decorator
+
+        def Converter(self, annotation: type) -> callable:
+            def decorator(func: callable) -> callable:
+                self.converters[annotation] = func
                 return func
             return decorator
 
         def Error(self, **kwargs) -> callable:
             def decorator(func: callable) -> callable:
-                for listener in self.commandListeners:
-                    if kwargs["name"] in self.commandListeners[listener]["triggers"]:
-                        errors = self.commandListeners[listener].get("errors", [])
-                        errors.append(func)
-                        self.commandListeners[listener]["errors"] = errors
+                self.GetNode(kwargs["name"], create=True).errors.append(func)
                 return func
             return decorator
 
+        def Route(self, content: str) -> tuple[CommandNode, list[str]]|None:
+            for prefix in self.prefixes:
+                if content.startswith(prefix):
+                    break
+            else:
+                return None
+            # Most messages are not commands, reject them on the first word before splitting the rest
+            if self.Key(content[len(prefix):].split(" ", 1)[0]) not in self.root.children:
+                return None
+            arguments: list[str] = content[len(prefix):].split(" ")
+            node: CommandNode = self.root
+            match: tuple[CommandNode, list[str]]|None = None
+            for index, argument in enumerate(arguments):
+                node = node.children.get(self.Key(argument))
+                if node is None:
+                    break
+                if node.listener is not None:
+                    match = (node, arguments[index + 1:])
+            return match
+
+        def Matches(self, content: Any) -> bool:
+            return isinstance(content, str) and self.Route(content) is not None
+
+        async def ConvertArguments(self, context: Message, node: CommandNode, arguments: list[str]) -> tuple[list, dict]:
+            # Shared by every argument of the message, so a repeated mention is only looked up once
+            cache: dict[tuple[Any, str], asyncio.Future] = {}
+            def convert(annotation: Any, argument: str) -> asyncio.Future:
+                if cache.get((annotation, argument)) is None:
+                    cache[(annotation, argument)] = asyncio.ensure_future(Convert(self.converters, annotation, argument, context))
+                return cache[(annotation, argument)]
+            def value(result: Any) -> asyncio.Future:
+                future: asyncio.Future = asyncio.get_running_loop().create_future()
+                future.set_result(result)
+                return future
+
+            positional: list[asyncio.Future] = []
+            keyword: dict[str, asyncio.Future] = {}
+            index: int = 0
+            try:
+                for parameter in node.parameters:
+                    match parameter.kind:
+                        case inspect.Parameter.POSITIONAL_ONLY | inspect.Parameter.POSITIONAL_OR_KEYWORD:
+                            if index < len(arguments):
+                                positional.append(convert(parameter.annotation, arguments[index]))
+                                index += 1
+                            elif parameter.default is not inspect.Parameter.empty:
+                                positional.append(value(parameter.default))
+                            else:
+                                raise ArgumentConversionException(f"Missing argument {parameter.name}")
+                        case inspect.Parameter.VAR_POSITIONAL:
+                            positional.extend(convert(parameter.annotation, argument) for argument in arguments[index:])
+                            index = len(arguments)
+                        case inspect.Parameter.KEYWORD_ONLY:
+                            # A keyword only parameter consumes the rest of the message
+                            if index < len(arguments):
+                                keyword[parameter.name] = convert(parameter.annotation, " ".join(arguments[index:]))
+                                index = len(arguments)
+                            elif parameter.default is not inspect.Parameter.empty:
+                                keyword[parameter.name] = value(parameter.default)
+                            else:
+                                raise ArgumentConversionException(f"Missing argument {parameter.name}")
+                # Every lookup runs at once instead of one request per argument
+                args: list = await asyncio.gather(*positional, *keyword.values())
+            except BaseException:
+                for future in cache.values():
+                    future.cancel()
+                raise
+            # Arguments the command does not declare are passed through untouched
+            return args[:len(positional)] + arguments[index:], dict(zip(keyword, args[len(positional):]))
+
         async def dispatchCommand(self, context: Message) -> None:
             if not isinstance(context.content, str):
                 return
-            if context.content.startswith(self.prefix):
-                arguments: list[str] = context.content.split(" ")
-                command: str = arguments[0][len(self.prefix):]
-
-                for listener in self.commandListeners:
-                    if command in self.commandListeners[listener]["triggers"]:
-                        for arg in arguments[1:]:
-                            # Attempt to parse argument as channel, user, or role
-                            channel: bool|Channel = await Channel.AttemptParse(arg, self.bot.session)
-                            if channel is not False:
-                                arguments[arguments.index(arg)] = channel
-                            user: bool|User = await User.AttemptParse(arg, self.bot.session)
-                            if user is not False:
-                                arguments[arguments.index(arg)] = user
-                        try:
-                            await listener(context, *tuple(arguments[1:]))
-                        except Exception as error:
-                            for errorListener in self.commandListeners[listener].get("errors", []):
-                                await errorListener(context, error)
-                        break
+            route: tuple[CommandNode, list[str]]|None = self.Route(context.content)
+            if route is None:
+                return
+            node, arguments = route
+            try:
+                # Handlers and converters such as ConvertMember read the author and channel, which may not be cached
+                if context.channel is None or context.author is None:
+                    await context.resolve(references=False)
+                args, kwargs = await self.ConvertArguments(context, node, arguments)
+                await node.listener(context, *args, **kwargs)
+            except Exception as error:
+                for errorListener in node.errors:
+                    await errorListener(context, error)
 
     def __init__(self, **kwargs) -> None:
-        self.commands = self.Commands(self, prefix=kwargs.get("prefix"))
+        self.commands = self.Commands(self, prefix=kwargs.get("prefix"), caseInsensitive=kwargs.get("caseInsensitive", False))
+        self.codec: str|JSONCodec|None = kwargs.get("codec")
+        self.client: HTTPClient|None = kwargs.get("client")
+        self.http: dict = kwargs.get("http", {})
+        self.messageCache: MessageCache|None = kwargs.get("messageCache")
+        self.cache: dict = kwargs.get("cache", {})
+        self.workers: int = kwargs.get("workers", 0)
+        self.queueSize: int = kwargs.get("queueSize", 1000)
+        self.registry: EventRegistry = kwargs.get("registry") or EventRegistry()
+        self.heartbeat: dict = kwargs.get("heartbeat", {})
+        self.messageFilter: callable|None = kwargs.get("messageFilter")
+        self.reconnect: bool = kwargs.get("reconnect", True)
+        self.maxReconnectAttempts: int|None = kwargs.get("maxReconnectAttempts")
+        self.sender: dict = kwargs.get("sender", {})
+        self.store: SessionStore|str|None = kwargs.get("store")
+        self.storeInterval: float|None = kwargs.get("storeInterval")
 
     async def Start(self, **kwargs) -> None:
-        self.session: Session = Session()
+        self.session: Session = Session(codec=self.codec, client=self.client, http=self.http, messageCache=self.messageCache, cache=self.cache, registry=self.registry, heartbeat=self.heartbeat, reconnect=self.reconnect, maxReconnectAttempts=self.maxReconnectAttempts, messageFilter=self.FilterMessage, sender=self.sender, store=self.store, storeInterval=self.storeInterval)
         if kwargs.get("token") is None:
             raise InvalidSession("No token provided")
         await self.session.Start(kwargs["token"])
-        while True:
-            data: dict = await self.session.GatewayReceive()
-            if data["type"] == GatewayEvent.OnMessage.value:
-                data["type"] = None
-                context: Message = await Message.FromJSON(json.dumps(data), self.session)
-                await self.commands.dispatchCommand(context)
+        if self.workers > 0:
+            self.dispatcher: Dispatcher = Dispatcher(self.session, self.ProcessEvent, workers=self.workers, queueSize=self.queueSize)
+            await self.dispatcher.Run()
+        else:
+            while True:
+                await self.ProcessEvent(await self.session.gateway.Receive())
+
+    @property
+    def latency(self) -> float|None:
+        return self.session.gateway.latency
+
+    def FilterMessage(self, data: dict) -> bool:
+        # Runs on the raw payload, so messages which are not commands never become Message objects
+        if self.commands.Matches(data.get("content")):
+            return True
+        return self.messageFilter is not None and self.messageFilter(data)
+
+    async def ProcessEvent(self, data: dict) -> None:
+        data: dict|None = await self.session.ProcessGateway(data)
+        if data is not None and data.get("message") is not None:
+            await self.commands.dispatchCommand(data["message"])
 
     async def __aenter__(self):
         return self
@@ -93,12 +234,15 @@ class Bot:
         except KeyboardInterrupt:
             return
 
-    def on(self, event: GatewayEvent) -> callable:
+    def on(self, event: GatewayEvent|Event) -> callable:
         def decorator(func: callable):
-            event.value.insertListener(func)
+            self.registry.Listen(getattr(event, "value", event), func)
             return func
         return decorator
 
+    def RegisterEvent(self, event: Event, handler: callable|None = None) -> None:
+        self.registry.Register(event, handler)
+
     async def GetUser(self, userID: str) -> User:
         return await self.session.GetUser(userID)
 
@@ -0,0 +1,245 @@
+from __future__ import annotations
+from collections import OrderedDict
+import time
+from typing import TYPE_CHECKING, Any
+if TYPE_CHECKING:
+    from .structs.channels import Channel, Message
+    from .structs.user import User
+
+class CacheStats:
+    def __init__(self) -> None:
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+
+    def __repr__(self) -> str:
+        return f"<pyrevolt.CacheStats hits={self.hits} misses={self.misses} evictions={self.evictions} expirations={self.expirations}>"
+
+    @property
+    def hitRate(self) -> float:
+        total: int = self.hits + self.misses
+        return self.hits / total if total > 0 else 0.0
+
+class MessageCache:
+    def __init__(self, **kwargs) -> None:
+        self.maxSize: int|None = kwargs.get("maxSize", 10000)
+        self.maxPerChannel: int|None = kwargs.get("maxPerChannel")
+        self.ttl: float|None = kwargs.get("ttl")
+        self.stats: CacheStats = CacheStats()
+        # Least recently used entries come first
+        self.entries: OrderedDict[str, tuple[Message, float]] = OrderedDict()
+        self.channels: dict[str, OrderedDict[str, None]] = {}
+
+    def __repr__(self) -> str:
+        return f"<pyrevolt.MessageCache size={len(self)} maxSize={self.maxSize} maxPerChannel={self.maxPerChannel} ttl={self.ttl}>"
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, messageID: str) -> bool:
+        return self.get(messageID, record=False) is not None
+
+    def __getitem__(self, messageID: str) -> Message:
+        message: Message|None = self.get(messageID)
+        if message is None:
+            raise KeyError(messageID)
+        return message
+
+    def __setitem__(self, messageID: str, message: Message) -> None:
+        if messageID in self.entries:
+            self.remove(messageID)
+        self.entries[messageID] = (message, time.monotonic())
+        channelID: str|None = self.ChannelID(message)
+        if channelID is not None:
+            channel: OrderedDict[str, None] = self.channels.setdefault(channelID, OrderedDict())
+            channel[messageID] = None
+            if self.maxPerChannel is not None:
+                while len(channel) > self.maxPerChannel:
+                    self.remove(next(iter(channel)))
+                    self.stats.evictions += 1
+        self.prune()
+
+    def __delitem__(self, messageID: str) -> None:
+        if self.remove(messageID) is None:
+            raise KeyError(messageID)
+
+    @staticmethod
+    def ChannelID(message: Message) -> str|None:
+        # Read the ID directly, going through Message.channel would look the channel up
+        if getattr(message, "channelID", None) is not None:
+            return message.channelID
+        channel: Any = getattr(message, "channel", None)
+        return getattr(channel, "channelID", None)
+
+    def get(self, messageID: str, default: Message|None = None, record: bool = True) -> Message|None:
+        entry: tuple[Message, float]|None = self.entries.get(messageID)
+        if entry is not None and self.expired(entry):
+            self.remove(messageID)
+            self.stats.expirations += 1
+            entry = None
+        if entry is None:
+            if record:
+                self.stats.misses += 1
+            return default
+        self.entries.move_to_end(messageID)
+        if record:
+            self.stats.hits += 1
+        return entry[0]
+
+    def pop(self, messageID: str, *default: Any) -> Message|None:
+        message: Message|None = self.remove(messageID)
+        if message is None:
+            if len(default) > 0:
+                return default[0]
+            raise KeyError(messageID)
+        return message
+
+    def remove(self, messageID: str) -> Message|None:
+        entry: tuple[Message, float]|None = self.entries.pop(messageID, None)
+        if entry is None:
+            return None
+        channelID: str|None = self.ChannelID(entry[0])
+        channel: OrderedDict[str, None]|None = self.channels.get(channelID)
+        if channel is not None:
+            channel.pop(messageID, None)
+            if len(channel) == 0:
+                self.channels.pop(channelID)
+        return entry[0]
+
+    def expired(self, entry: tuple[Message, float]) -> bool:
+        return self.ttl is not None and time.monotonic() - entry[1] > self.ttl
+
+    def prune(self) -> None:
+        if self.maxSize is not None:
+            while len(self.entries) > self.maxSize:
+                self.remove(next(iter(self.entries)))
+                self.stats.evictions += 1
+        if self.ttl is not None:
+            # Stops at the first live entry, anything left behind still expires lazily in get()
+            while len(self.entries) > 0:
+                messageID: str = next(iter(self.entries))
+                if not self.expired(self.entries[messageID]):
+                    break
+                self.remove(messageID)
+                self.stats.expirations += 1
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.channels.clear()
+
+    def values(self) -> list[Message]:
+        return [entry[0] for entry in self.entries.values()]
+
+    def Channel(self, channelID: str) -> list[Message]:
+        return [self.entries[messageID][0] for messageID in self.channels.get(channelID, [])]
+
+class IndexedStore(dict):
+    INDEXES: tuple[str, ...] = ()
+
+    def __init__(self) -> None:
+        super().__init__()
+        # Index name -> index key -> keys of the entries filed under it
+        self.indexes: dict[str, dict[Any, set[str]]] = {name: {} for name in self.INDEXES}
+        # Where each entry was filed, so it can be removed even after the object changed
+        self.indexed: dict[str, list[tuple[str, Any]]] = {}
+
+    def __repr__(self) -> str:
+        return f"<pyrevolt.{type(self).__name__} size={len(self)} indexes={list(self.indexes)}>"
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.Unindex(key)
+        super().__setitem__(key, value)
+        self.Index(key)
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self.Unindex(key)
+
+    def pop(self, key: str, *default: Any) -> Any:
+        if key not in self:
+            if len(default) > 0:
+                return default[0]
+            raise KeyError(key)
+        value: Any = super().pop(key)
+        self.Unindex(key)
+        return value
+
+    def popitem(self) -> tuple[str, Any]:
+        key, value = super().popitem()
+        self.Unindex(key)
+        return key, value
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self) -> None:
+        super().clear()
+        self.indexed.clear()
+        for index in self.indexes.values():
+            index.clear()
+
+    def IndexKeys(self, key: str, value: Any) -> list[tuple[str, Any]]:
+        return []
+
+    def Index(self, key: str) -> None:
+        entries: list[tuple[str, Any]] = self.IndexKeys(key, self[key])
+        self.indexed[key] = entries
+        for name, indexKey in entries:
+            self.indexes[name].setdefault(indexKey, set()).add(key)
+
+    def Unindex(self, key: str) -> None:
+        for name, indexKey in self.indexed.pop(key, []):
+            keys: set[str]|None = self.indexes[name].get(indexKey)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if len(keys) == 0:
+                self.indexes[name].pop(indexKey)
+
+    def Reindex(self, key: str) -> None:
+        # Objects are patched in place by update events, which the store cannot see
+        if key in self:
+            self.Unindex(key)
+            self.Index(key)
+
+    def Keys(self, name: str, indexKey: Any) -> set[str]:
+        return self.indexes[name].get(indexKey, set())
+
+    def Lookup(self, name: str, indexKey: Any) -> list[Any]:
+        return [self[key] for key in self.Keys(name, indexKey)]
+
+class UserStore(IndexedStore):
+    INDEXES: tuple[str, ...] = ("username",)
+
+    def IndexKeys(self, key: str, value: User) -> list[tuple[str, Any]]:
+        username: Any = getattr(value, "username", None)
+        return [("username", username.lower())] if isinstance(username, str) else []
+
+class ChannelStore(IndexedStore):
+    INDEXES: tuple[str, ...] = ("server", "name")
+
+    def IndexKeys(self, key: str, value: Channel) -> list[tuple[str, Any]]:
+        server: Any = getattr(value, "server", None)
+        if server is None:
+            return []
+        # Ready links channels to their server after they are stored, so the server may still be its ID
+        serverID: str = getattr(server, "serverID", server)
+        entries: list[tuple[str, Any]] = [("server", serverID)]
+        name: Any = getattr(value, "name", None)
+        if isinstance(name, str):
+            entries.append(("name", (serverID, name.lower())))
+        return entries
+
+class MemberStore(IndexedStore):
+    INDEXES: tuple[str, ...] = ("server", "user")
+
+    def IndexKeys(self, key: str, value: Any) -> list[tuple[str, Any]]:
+        serverID, _, userID = key.partition(".")
+        return [("server", serverID), ("user", userID)]
@@ -1,8 +1,10 @@
 from enum import Enum
-import json
+import asyncio
 from typing import Any
-from aiohttp import ClientSession
-from .exceptions import ClosedSocketException
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+from .codec import JSONCodec, GetCodec
+from .ratelimit import Bucket, RateLimiter
+from .exceptions import ClosedSocketException, HTTPException, RateLimitedException
 
 class Method(Enum):
     GET = "GET"
@@ -13,9 +15,12 @@ class Method(Enum):
 
 class Request:
     API_BASE_URL: str = "https://api.revolt.chat"
+    # Revolt expects a JSON body on these even when there is nothing to send, so an empty object is sent
+    BODY_METHODS: tuple[Method, ...] = (Method.POST, Method.PUT, Method.PATCH)
     
     def __init__(self, method: Method, url: str, **kwargs) -> None:
         self.method: Method = method
+        self.path: str = url
         self.url: str = f"{self.API_BASE_URL}{url}"
         self.data: dict[str, Any] = kwargs.get("data", dict())
         self.headers: dict[str, str] = kwargs.get("headers", dict())
@@ -23,6 +28,14 @@ class Request:
         if kwargs.get("auth") is not None:
             self.AddAuthentication(kwargs.get("auth"))
 
+    @property
+    def token(self) -> str|None:
+        return self.headers.get("x-bot-token") or self.headers.get("x-session-token")
+
+    @property
+    def hasBody(self) -> bool:
+        return self.method in self.BODY_METHODS or (self.method != Method.GET and len(self.data) > 0)
+
     def AddAuthentication(self, token: str, bot: bool = True) -> None:
         if bot:
             self.headers["x-bot-token"] = token
@@ -30,22 +43,86 @@ class Request:
             self.headers["x-session-token"] = token
 
 class HTTPClient:
-    def __init__(self) -> None:
-        self.client: ClientSession = ClientSession()
+    def __init__(self, **kwargs) -> None:
+        self.codec: JSONCodec = GetCodec(kwargs.get("codec"))
+        self.rateLimiter: RateLimiter = RateLimiter()
+        self.maxRetries: int = kwargs.get("maxRetries", 3)
+        # A 5xx can arrive after the server acted on the request, so only methods which are safe to repeat are retried
+        self.retryMethods: set[Method] = set(kwargs.get("retryMethods", (Method.GET, Method.PUT, Method.DELETE)))
+        self.limit: int = kwargs.get("limit", 100)
+        self.limitPerHost: int = kwargs.get("limitPerHost", 0)
+        self.dnsCacheTTL: int|None = kwargs.get("dnsCacheTTL", 300)
+        self.keepAliveTimeout: float = kwargs.get("keepAliveTimeout", 60)
+        self.timeout: float|None = kwargs.get("timeout", 30)
+        self.client: ClientSession|None = None
+        self.closed: bool = False
+
+    def GetClient(self) -> ClientSession:
+        if self.closed:
+            raise ClosedSocketException()
+        # Created lazily so the pool is bound to the running event loop
+        if self.client is None:
+            connector: TCPConnector = TCPConnector(
+                limit = self.limit,
+                limit_per_host = self.limitPerHost,
+                use_dns_cache = self.dnsCacheTTL is not None,
+                ttl_dns_cache = self.dnsCacheTTL,
+                keepalive_timeout = self.keepAliveTimeout
+            )
+            self.client = ClientSession(connector=connector, timeout=ClientTimeout(total=self.timeout))
+        return self.client
 
     async def Close(self) -> None:
-        await self.client.close()
+        self.closed = True
+        if self.client is not None:
+            await self.client.close()
+
+    def QueueDepth(self) -> dict[str, int]:
+        return self.rateLimiter.QueueDepth()
+
+    def DecodeBody(self, content: bytes, contentType: str, status: int) -> Any:
+        if len(content) > 0 and "json" in contentType:
+            try:
+                return self.codec.Decode(content)
+            except ValueError:
+                pass
+        if status < 400 or len(content) == 0:
+            return {}
+        # Proxies answer errors with HTML, which is kept so the status check and callers can still see it
+        return {"type": "InvalidResponse", "status": status, "body": content.decode(errors="replace")}
 
     async def Request(self, request: Request) -> dict:
-        if not self.client.closed:
-            async with self.client.request(
+        body: str|bytes|None = None
+        if request.hasBody:
+            body = self.codec.Encode(request.data)
+            request.headers["Content-Type"] = "application/json"
+        for attempt in range(self.maxRetries + 1):
+            client: ClientSession = self.GetClient()
+            bucket: Bucket = self.rateLimiter.GetBucket(request.method.value, request.path, request.token)
+            await bucket.Acquire()
+            async with client.request(
                 method = request.method.value,
                 url = request.url,
-                data = json.dumps(request.data),
+                data = body,
                 headers = request.headers,
                 params = request.params
             ) as result:
-                # TODO: Add status code check
-                return await result.json()
-        else:
-            raise ClosedSocketException()
+                bucket = self.rateLimiter.Update(request.method.value, request.path, result.headers, request.token)
+                content: bytes = await result.read()
+                status: int = result.status
+                contentType: str = result.headers.get("Content-Type", "")
+            data: Any = self.DecodeBody(content, contentType, status)
+            if status == 429:
+                retryAfter: float = (data.get("retry_after", 1000) if isinstance(data, dict) else 1000) / 1000
+                bucket.Block(retryAfter)
+                if attempt == self.maxRetries:
+                    raise RateLimitedException(f"Rate limited on {request.method.value} {request.path}", status=status, data=data, retryAfter=retryAfter)
+                await asyncio.sleep(RateLimiter.Jitter(retryAfter))
+                continue
+            if status >= 500:
+                if attempt == self.maxRetries or request.method not in self.retryMethods:
+                    raise HTTPException(f"{request.method.value} {request.path} failed with status {status}", status=status, data=data)
+                await asyncio.sleep(RateLimiter.Backoff(attempt))
+                continue
+            # Other errors are still returned for callers to inspect through the "type" key
+            return data
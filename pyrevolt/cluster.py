@@ -0,0 +1,152 @@
+from __future__ import annotations
+import asyncio
+import multiprocessing
+import queue
+from typing import Any, Callable
+from .bot import Bot
+from .client import HTTPClient
+from .codec import JSONCodec, GetCodec
+
+class Cluster:
+    def __init__(self, **kwargs) -> None:
+        self.codec: JSONCodec = GetCodec(kwargs.get("codec"))
+        self.http: dict = kwargs.get("http", {})
+        self.ownsClient: bool = kwargs.get("client") is None
+        self.client: HTTPClient = kwargs.get("client") or HTTPClient(codec=self.codec, **self.http)
+        self.context: str|None = kwargs.get("context")
+        self.metricsInterval: float = kwargs.get("metricsInterval", 10)
+        self.bots: list[tuple[Bot, str]] = []
+        self.failures: dict[int, Exception] = {}
+        self.tasks: list[asyncio.Task] = []
+        self.shards: dict[int, dict[str, Any]] = {}
+
+    def __repr__(self) -> str:
+        return f"<pyrevolt.Cluster bots={len(self.bots)} shards={len(self.shards)} failures={len(self.failures)}>"
+
+    def Add(self, bot: Bot, token: str) -> Bot:
+        # Every bot builds its session from these, so they all share one connection pool and codec
+        bot.client = self.client
+        bot.codec = self.codec
+        self.bots.append((bot, token))
+        return bot
+
+    async def RunBot(self, index: int, bot: Bot, token: str) -> None:
+        try:
+            await bot.Start(token=token)
+        except Exception as error:
+            # One bad token or crashed bot must not take the rest of the cluster down
+            self.failures[index] = error
+        finally:
+            if getattr(bot, "session", None) is not None:
+                await bot.session.Close()
+
+    async def Start(self) -> None:
+        self.tasks = [asyncio.create_task(self.RunBot(index, bot, token)) for index, (bot, token) in enumerate(self.bots)]
+        try:
+            await asyncio.gather(*self.tasks)
+        finally:
+            await self.Close()
+
+    async def Close(self) -> None:
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+        if self.ownsClient:
+            await self.client.Close()
+
+    def Run(self) -> None:
+        try:
+            asyncio.run(self.Start())
+        except KeyboardInterrupt:
+            return
+
+    def RunProcesses(self, factory: Callable[[str], Bot], tokens: list[str], processes: int) -> None:
+        context: multiprocessing.context.BaseContext = multiprocessing.get_context(self.context)
+        metrics: multiprocessing.Queue = context.Queue()
+        options: dict = {"codec": self.codec.NAME, "http": self.http, "metricsInterval": self.metricsInterval}
+        groups: list[list[str]] = [tokens[shard::processes] for shard in range(processes)]
+        workers: list[multiprocessing.Process] = [
+            context.Process(target=RunShard, args=(shard, factory, group, options, metrics), daemon=True)
+            for shard, group in enumerate(groups) if len(group) > 0
+        ]
+        for worker in workers:
+            worker.start()
+        try:
+            while any(worker.is_alive() for worker in workers) or not metrics.empty():
+                try:
+                    shard, shardMetrics = metrics.get(timeout=self.metricsInterval)
+                except queue.Empty:
+                    continue
+                self.shards[shard] = shardMetrics
+        except KeyboardInterrupt:
+            for worker in workers:
+                worker.terminate()
+        finally:
+            for worker in workers:
+                worker.join()
+
+    @staticmethod
+    def BotMetrics(bot: Bot) -> dict[str, Any]:
+        session: Any = getattr(bot, "session", None)
+        if session is None:
+            return {"bots": 1, "connected": 0, "latency": None, "latencySamples": 0, "reconnects": 0, "users": 0, "channels": 0, "servers": 0, "members": 0, "messages": 0}
+        latency: float|None = session.gateway.latency
+        return {
+            "bots": 1,
+            "connected": int(bool(session.gateway.websocket.open)),
+            "latency": latency,
+            "latencySamples": int(latency is not None),
+            "reconnects": session.gateway.reconnects,
+            "users": len(session.users),
+            "channels": len(session.channels),
+            "servers": len(session.servers),
+            "members": len(session.members),
+            "messages": len(session.messages)
+        }
+
+    @staticmethod
+    def Aggregate(metrics: list[dict[str, Any]]) -> dict[str, Any]:
+        result: dict[str, Any] = {}
+        latency: float = 0.0
+        for entry in metrics:
+            for key, value in entry.items():
+                if key == "latency":
+                    if value is not None:
+                        latency += value * entry["latencySamples"]
+                    continue
+                result[key] = result.get(key, 0) + value
+        samples: int = result.get("latencySamples", 0)
+        result["latency"] = latency / samples if samples > 0 else None
+        return result
+
+    def Metrics(self) -> dict[str, Any]:
+        if len(self.shards) > 0:
+            return self.Aggregate(list(self.shards.values()))
+        result: dict[str, Any] = self.Aggregate([self.BotMetrics(bot) for bot, _ in self.bots])
+        result["failures"] = len(self.failures)
+        result["httpQueueDepth"] = sum(self.client.QueueDepth().values())
+        return result
+
+def RunShard(shard: int, factory: Callable[[str], Bot], tokens: list[str], options: dict, metrics: multiprocessing.Queue) -> None:
+    cluster: Cluster = Cluster(**options)
+    for token in tokens:
+        cluster.Add(factory(token), token)
+
+    async def report() -> None:
+        while True:
+            await asyncio.sleep(cluster.metricsInterval)
+            metrics.put((shard, cluster.Metrics()))
+
+    async def runner() -> None:
+        reporter: asyncio.Task = asyncio.create_task(report())
+        try:
+            await cluster.Start()
+        finally:
+            reporter.cancel()
+            metrics.put((shard, cluster.Metrics()))
+
+    try:
+        asyncio.run(runner())
+    except KeyboardInterrupt:
+        return
@@ -0,0 +1,60 @@
+from __future__ import annotations
+import json
+from typing import Any
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+class JSONCodec:
+    NAME: str = "json"
+
+    def Encode(self, data: Any) -> str|bytes:
+        return json.dumps(data)
+
+    def Decode(self, data: str|bytes) -> Any:
+        return json.loads(data)
+
+class OrjsonCodec(JSONCodec):
+    NAME: str = "orjson"
+
+    def Encode(self, data: Any) -> bytes:
+        return orjson.dumps(data)
+
+    def Decode(self, data: str|bytes) -> Any:
+        return orjson.loads(data)
+
+class MsgspecCodec(JSONCodec):
+    NAME: str = "msgspec"
+
+    def __init__(self) -> None:
+        self.encoder: msgspec.json.Encoder = msgspec.json.Encoder()
+        self.decoder: msgspec.json.Decoder = msgspec.json.Decoder()
+
+    def Encode(self, data: Any) -> bytes:
+        return self.encoder.encode(data)
+
+    def Decode(self, data: str|bytes) -> Any:
+        return self.decoder.decode(data)
+
+def AvailableCodecs() -> dict[str, type[JSONCodec]]:
+    codecs: dict[str, type[JSONCodec]] = {}
+    if orjson is not None:
+        codecs[OrjsonCodec.NAME] = OrjsonCodec
+    if msgspec is not None:
+        codecs[MsgspecCodec.NAME] = MsgspecCodec
+    codecs[JSONCodec.NAME] = JSONCodec
+    return codecs
+
+def GetCodec(codec: str|JSONCodec|None = None) -> JSONCodec:
+    if isinstance(codec, JSONCodec):
+        return codec
+    codecs: dict[str, type[JSONCodec]] = AvailableCodecs()
+    if codec is None:
+        # Fastest installed codec first, the standard library is always last
+        return next(iter(codecs.values()))()
+    return codecs.get(codec, JSONCodec)()
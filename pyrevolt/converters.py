@@ -0,0 +1,93 @@
+from __future__ import annotations
+import inspect
+import types
+from typing import TYPE_CHECKING, Any, Callable, Union, get_args, get_origin, get_type_hints
+from .exceptions import ArgumentConversionException
+from .structs.channels import Channel
+from .structs.user import User
+from .structs.member import Member
+if TYPE_CHECKING:
+    from .structs.channels import Message
+
+def MentionID(argument: str, start: str) -> str|None:
+    if argument.startswith(start) and argument.endswith(">"):
+        return argument[len(start):-1]
+    return None
+
+def ConvertBool(argument: str, context: Message) -> bool:
+    match argument.lower():
+        case "true" | "yes" | "on" | "1":
+            return True
+        case "false" | "no" | "off" | "0":
+            return False
+    raise ValueError(f"{argument} is not a boolean")
+
+async def ConvertUser(argument: str, context: Message) -> User:
+    user: User|bool|None = await User.AttemptParse(argument, context.session)
+    if user is False or user is None:
+        raise ValueError(f"{argument} is not a user")
+    return user
+
+async def ConvertChannel(argument: str, context: Message) -> Channel:
+    channel: Channel|bool|None = await Channel.AttemptParse(argument, context.session)
+    if channel is False or channel is None:
+        raise ValueError(f"{argument} is not a channel")
+    return channel
+
+async def ConvertMember(argument: str, context: Message) -> Member:
+    userID: str|None = MentionID(argument, "<@")
+    server: Any = getattr(context.channel, "server", None)
+    if userID is None or getattr(server, "serverID", None) is None:
+        raise ValueError(f"{argument} is not a member")
+    member: Member|None = await Member.FromID(server.serverID + "." + userID, context.session)
+    if member is None:
+        raise ValueError(f"{argument} is not a member")
+    return member
+
+CONVERTERS: dict[type, Callable[[str, Message], Any]] = {
+    str: lambda argument, context: argument,
+    int: lambda argument, context: int(argument),
+    float: lambda argument, context: float(argument),
+    bool: ConvertBool,
+    User: ConvertUser,
+    Channel: ConvertChannel,
+    Member: ConvertMember
+}
+
+def GetParameters(func: Callable) -> list[inspect.Parameter]:
+    try:
+        hints: dict[str, Any] = get_type_hints(func)
+    except Exception:
+        # Annotations which cannot be resolved are left as plain strings
+        hints = {}
+    parameters: list[inspect.Parameter] = list(inspect.signature(func).parameters.values())[1:]
+    return [parameter.replace(annotation=hints.get(parameter.name, inspect.Parameter.empty)) for parameter in parameters]
+
+def GetConverter(converters: dict[type, Callable], annotation: Any) -> Callable|None:
+    for base in getattr(annotation, "__mro__", (annotation,)):
+        if base in converters:
+            return converters[base]
+    return None
+
+async def Convert(converters: dict[type, Callable], annotation: Any, argument: str, context: Message) -> Any:
+    if annotation is inspect.Parameter.empty or annotation is Any:
+        return argument
+    options: tuple = get_args(annotation) if get_origin(annotation) in (Union, types.UnionType) else (annotation,)
+    for option in options:
+        if option is type(None):
+            continue
+        converter: Callable|None = GetConverter(converters, option)
+        if converter is None:
+            raise ArgumentConversionException(f"No converter for {option}", argument=argument, annotation=annotation)
+        try:
+            result: Any = converter(argument, context)
+            if inspect.isawaitable(result):
+                result = await result
+        except ValueError:
+            continue
+        if isinstance(option, type) and not isinstance(result, option):
+            continue
+        return result
+    if type(None) in options:
+        return None
+    raise ArgumentConversionException(f"Could not convert {argument} to {annotation}", argument=argument, annotation=annotation)
@@ -0,0 +1,80 @@
+from __future__ import annotations
+import asyncio
+from typing import TYPE_CHECKING, Awaitable, Callable
+if TYPE_CHECKING:
+    from .session import Session
+
+class Dispatcher:
+    # Events which every queued event must wait for, and which must finish before anything after them runs.
+    # Creates and deletes are included as later events can refer to the object from any partition, like a
+    # ChannelCreate after the ServerCreate of its server, and they are rare enough for the stall not to matter
+    BARRIERS: set[str] = {
+        "Authenticated", "Ready", "Error",
+        "ServerCreate", "ServerDelete", "ChannelCreate", "ChannelDelete", "ServerMemberJoin", "ServerMemberLeave"
+    }
+
+    def __init__(self, session: Session, callback: Callable[[dict], Awaitable[None]], **kwargs) -> None:
+        self.session: Session = session
+        self.callback: Callable[[dict], Awaitable[None]] = callback
+        self.workers: int = max(kwargs.get("workers", 4), 1)
+        self.queueSize: int = kwargs.get("queueSize", 1000)
+        self.queues: list[asyncio.Queue] = [asyncio.Queue(self.queueSize) for _ in range(self.workers)]
+        self.tasks: list[asyncio.Task] = []
+
+    @staticmethod
+    def PartitionKey(data: dict) -> str:
+        if data.get("channel") is not None:
+            return data["channel"]
+        # Create events carry the ID as "_id", updates and deletes of the same object as "id"
+        key: str|dict|None = data.get("id", data.get("_id"))
+        if isinstance(key, dict):
+            return key.get("server", "")
+        return key or ""
+
+    def QueueDepth(self) -> list[int]:
+        return [queue.qsize() for queue in self.queues]
+
+    async def Enqueue(self, data: dict) -> None:
+        if data.get("type") == "Bulk":
+            for event in data["v"]:
+                await self.Enqueue(event)
+            return
+        if data.get("type") in self.BARRIERS:
+            await self.Join()
+            await self.callback(data)
+            return
+        # Events sharing a channel (or server/user) always land on the same worker, which keeps them in order
+        queue: asyncio.Queue = self.queues[hash(self.PartitionKey(data)) % self.workers]
+        await queue.put(data)
+
+    async def Join(self) -> None:
+        for queue in self.queues:
+            await queue.join()
+
+    async def Worker(self, queue: asyncio.Queue) -> None:
+        while True:
+            data: dict = await queue.get()
+            try:
+                await self.callback(data)
+            finally:
+                queue.task_done()
+
+    async def Reader(self) -> None:
+        while True:
+            await self.Enqueue(await self.session.gateway.Receive())
+
+    async def Run(self) -> None:
+        self.tasks = [asyncio.create_task(self.Worker(queue)) for queue in self.queues]
+        self.tasks.append(asyncio.create_task(self.Reader()))
+        try:
+            done, _ = await asyncio.wait(self.tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                task.result()
+        finally:
+            await self.Stop()
+
+    async def Stop(self) -> None:
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
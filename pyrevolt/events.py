@@ -128,4 +128,8 @@ class UserUpdate(Event):
 
 class UserRelationship(Event):
     VALUE = "UserRelationship"
-    LISTENERS: list[callable] = []
\ No newline at end of file
+    LISTENERS: list[callable] = []
+
+class Unknown(Event):
+    VALUE = "Unknown"
+    LISTENERS: list[callable] = []
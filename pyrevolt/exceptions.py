@@ -1,3 +1,5 @@
+from typing import Any
+
 class WebsocketError(Exception):
     pass
 
@@ -17,4 +19,21 @@ class ClosedSocketException(WebsocketError):
     pass
 
 class InvalidMessageException(Exception):
-    pass
\ No newline at end of file
+    pass
+
+class ArgumentConversionException(Exception):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args)
+        self.argument: str|None = kwargs.get("argument")
+        self.annotation: Any = kwargs.get("annotation")
+
+class HTTPException(Exception):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args)
+        self.status: int|None = kwargs.get("status")
+        self.data: dict|None = kwargs.get("data")
+
+class RateLimitedException(HTTPException):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.retryAfter: float|None = kwargs.get("retryAfter")
\ No newline at end of file
@@ -1,12 +1,19 @@
 from __future__ import annotations
 from enum import Enum
 from .events import *
-from threading import Thread, Event
+from collections import deque
 import asyncio
+import logging
+import time
 from .client import HTTPClient, Request, Method
 from websockets import client
-import json
-from .exceptions import ClosedSocketException
+from websockets.exceptions import ConnectionClosed, WebSocketException
+import aiohttp
+from .codec import JSONCodec, GetCodec
+from .ratelimit import RateLimiter
+from .exceptions import ClosedSocketException, HTTPException
+
+logger: logging.Logger = logging.getLogger(__name__)
 
 class GatewayEvent(Enum):
     Authenticate = Authenticate()
@@ -40,21 +47,121 @@ class GatewayEvent(Enum):
     ServerRoleDelete = ServerRoleDelete()
     UserUpdate = UserUpdate()
     UserRelationship = UserRelationship()
+    Unknown = Unknown()
+
+class EventRegistry:
+    def __init__(self) -> None:
+        # Keyed by the wire name so resolving an incoming type is a single dict lookup
+        self.events: dict[str, Event] = {event.value.VALUE: event.value for event in GatewayEvent}
+        self.handlers: dict[str, callable] = {}
+        # Kept per registry rather than on the event, so bots sharing a loop only hear their own events
+        self.listeners: dict[str, list[callable]] = {}
+
+    def __repr__(self) -> str:
+        return f"<pyrevolt.EventRegistry events={len(self.events)} handlers={len(self.handlers)} listeners={sum(len(listeners) for listeners in self.listeners.values())}>"
+
+    def SetDefaults(self, handlers: dict[str, callable]) -> None:
+        for name, handler in handlers.items():
+            self.handlers.setdefault(name, handler)
+
+    def Register(self, event: Event, handler: callable|None = None) -> None:
+        self.events[event.VALUE] = event
+        if handler is not None:
+            self.handlers[event.VALUE] = handler
 
-class GatewayKeepAlive(Thread):
-    def __init__(self, *args, gateway: Gateway, interval: float, **kwargs) -> None:
-        super().__init__(*args, **kwargs)
+    def Listen(self, event: Event, callback: callable) -> None:
+        self.listeners.setdefault(event.VALUE, []).append(callback)
+
+    def Listeners(self, event: Event) -> list[callable]:
+        # Listeners added on the event itself are global and heard through every registry
+        return self.listeners.get(event.VALUE, []) + getattr(event, "LISTENERS", [])
+
+    async def Dispatch(self, event: Event, *args) -> None:
+        for listener in self.Listeners(event):
+            await listener(*args)
+
+    def Resolve(self, name: str) -> tuple[Event, callable|None]:
+        event: Event|None = self.events.get(name)
+        if event is None:
+            return GatewayEvent.Unknown.value, self.handlers.get(GatewayEvent.Unknown.value.VALUE)
+        return event, self.handlers.get(name)
+
+class GatewayKeepAlive:
+    HISTOGRAM_BOUNDS: tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+    def __init__(self, gateway: Gateway, interval: float, **kwargs) -> None:
         self.gateway: Gateway = gateway
         self.interval: float = interval
-        self.daemon: bool = True
-        self.stopEvent: Event = Event()
+        self.maxMissed: int = kwargs.get("maxMissed", 2)
+        self.latencies: deque[float] = deque(maxlen=kwargs.get("samples", 100))
+        self.sentAt: float|None = None
+        self.waiter: asyncio.Future|None = None
+        self.missed: int = 0
+        self.task: asyncio.Task|None = None
+
+    def __repr__(self) -> str:
+        return f"<pyrevolt.GatewayKeepAlive interval={self.interval} latency={self.latency} missed={self.missed}>"
 
-    def run(self) -> None:
-        while not self.stopEvent.wait(self.interval):
-            data: dict = self.GetPayload()
-            coro = self.gateway.Send(data)
-            func = asyncio.run_coroutine_threadsafe(coro, self.gateway.loop)
-            func.result(10)
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    @property
+    def latency(self) -> float|None:
+        return self.latencies[-1] if len(self.latencies) > 0 else None
+
+    @property
+    def averageLatency(self) -> float|None:
+        return sum(self.latencies) / len(self.latencies) if len(self.latencies) > 0 else None
+
+    def Start(self) -> None:
+        if not self.running:
+            self.sentAt = None
+            self.waiter = None
+            self.missed = 0
+            self.task = asyncio.create_task(self.Run())
+
+    def Stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    async def Run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            if self.waiter is not None and not self.waiter.done():
+                self.missed += 1
+                if self.missed >= self.maxMissed:
+                    # Closing the socket makes the pending Receive raise, which is what triggers a reconnect
+                    await self.gateway.websocket.close()
+                    return
+            try:
+                # Revolt's own ping keeps the session alive
+                await self.gateway.Send(self.GetPayload())
+                if self.waiter is None or self.waiter.done():
+                    # The websocket answers control pings as frames arrive, so a slow handler holding up Receive
+                    # or a full dispatcher queue does not count as a missed pong
+                    self.sentAt = time.monotonic()
+                    self.waiter = await self.gateway.websocket.ping()
+                    self.waiter.add_done_callback(self.Pong)
+            except Exception as error:
+                logger.warning("Sending the heartbeat failed, closing the websocket to reconnect: %r", error)
+                await self.gateway.websocket.close()
+                return
+
+    def Pong(self, waiter: asyncio.Future|None = None) -> None:
+        if waiter is not None and (waiter.cancelled() or waiter.exception() is not None):
+            return
+        if self.sentAt is not None:
+            self.latencies.append(time.monotonic() - self.sentAt)
+            self.sentAt = None
+        self.missed = 0
+
+    def Histogram(self) -> dict[float, int]:
+        histogram: dict[float, int] = {bound: 0 for bound in self.HISTOGRAM_BOUNDS + (float("inf"),)}
+        for latency in self.latencies:
+            histogram[next(bound for bound in histogram if latency <= bound)] += 1
+        return histogram
 
     def GetPayload(self) -> dict[str, str|int]:
         return {
@@ -63,45 +170,88 @@ class GatewayKeepAlive(Thread):
         }
 
 class Gateway:
-    def __init__(self) -> None:
-        self.client: HTTPClient = HTTPClient()
-        self.loop = asyncio.get_event_loop()
-        self.keepAlive: GatewayKeepAlive = GatewayKeepAlive(gateway=self, interval=20)
+    def __init__(self, **kwargs) -> None:
+        self.codec: JSONCodec = GetCodec(kwargs.get("codec"))
+        self.ownsClient: bool = kwargs.get("client") is None
+        self.client: HTTPClient = kwargs.get("client") or HTTPClient(codec=self.codec)
+        self.keepAlive: GatewayKeepAlive = GatewayKeepAlive(self, **{"interval": 20, **kwargs.get("heartbeat", {})})
         self.websocket: client.WebSocketClientProtocol | None = client.WebSocketClientProtocol()
+        self.reconnect: bool = kwargs.get("reconnect", True)
+        self.maxReconnectAttempts: int|None = kwargs.get("maxReconnectAttempts")
+        self.reconnects: int = 0
+        self.token: str|None = None
+        self.closed: bool = False
 
     async def Close(self) -> None:
-        await self.client.Close()
+        self.closed = True
+        if self.ownsClient:
+            await self.client.Close()
+        self.keepAlive.Stop()
         if self.websocket.open:
             await self.websocket.close()
-            self.keepAlive.stopEvent.set()
 
     async def GetWebsocketURL(self) -> str:
         result: dict = await self.client.Request(Request(Method.GET, "/"))
         return result["ws"]
 
     async def Connect(self) -> None:
+        self.closed = False
         if not self.websocket.open:
             self.websocket = await client.connect(await self.GetWebsocketURL())
-            self.keepAlive.stopEvent.clear()
-            self.keepAlive.start()
+            self.keepAlive.Start()
+
+    @property
+    def latency(self) -> float|None:
+        return self.keepAlive.latency
+
+    def LatencyHistogram(self) -> dict[float, int]:
+        return self.keepAlive.Histogram()
 
     async def Send(self, data: dict) -> None:
-        for event in GatewayEvent:
-            if data["type"] == event.value:
-                data["type"] = event.value.VALUE
-                break
+        data["type"] = getattr(data["type"], "VALUE", data["type"])
         if self.websocket.open:
-            await self.websocket.send(json.dumps(data))
+            payload: str|bytes = self.codec.Encode(data)
+            if isinstance(payload, bytes):
+                # Revolt expects text frames, bytes would be sent as a binary frame
+                payload = payload.decode()
+            await self.websocket.send(payload)
         else:
             raise ClosedSocketException()
 
     async def Receive(self) -> dict:
-        if self.websocket.open:
-            data: str = json.loads(await self.websocket.recv())
-            return data
-        raise ClosedSocketException()
+        while True:
+            if self.websocket.open:
+                try:
+                    frame: str|bytes = await self.websocket.recv()
+                except ConnectionClosed:
+                    frame = None
+                if frame is not None:
+                    return self.codec.Decode(frame)
+            if not self.reconnect or self.closed or self.token is None:
+                raise ClosedSocketException()
+            await self.Reconnect()
+
+    async def Reconnect(self) -> None:
+        attempt: int = 0
+        while True:
+            self.keepAlive.Stop()
+            if self.websocket.open:
+                await self.websocket.close()
+            if attempt > 0:
+                await asyncio.sleep(RateLimiter.Backoff(attempt - 1, base=1.0, cap=60.0))
+            try:
+                await self.Connect()
+                # Revolt answers with Authenticated and a fresh Ready, which the session reconciles its caches with
+                await self.Authenticate(self.token)
+                self.reconnects += 1
+                return
+            except (OSError, asyncio.TimeoutError, WebSocketException, aiohttp.ClientError, HTTPException):
+                attempt += 1
+                if self.maxReconnectAttempts is not None and attempt >= self.maxReconnectAttempts:
+                    raise ClosedSocketException(f"Could not reconnect after {attempt} attempts")
 
     async def Authenticate(self, token: str) -> None:
+        self.token = token
         await self.Send({
             "type": GatewayEvent.Authenticate.value.VALUE,
             "token": token
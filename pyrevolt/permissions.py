@@ -0,0 +1,145 @@
+from __future__ import annotations
+from enum import IntFlag
+from typing import TYPE_CHECKING, Any
+if TYPE_CHECKING:
+    from .structs.channels import Channel
+    from .structs.member import Member
+    from .structs.server import Role
+    from .structs.user import User
+
+class Permission(IntFlag):
+    ManageChannel = 1 << 0
+    ManageServer = 1 << 1
+    ManagePermissions = 1 << 2
+    ManageRole = 1 << 3
+    ManageCustomisation = 1 << 4
+    KickMembers = 1 << 6
+    BanMembers = 1 << 7
+    TimeoutMembers = 1 << 8
+    AssignRoles = 1 << 9
+    ChangeNickname = 1 << 10
+    ManageNicknames = 1 << 11
+    ChangeAvatar = 1 << 12
+    RemoveAvatars = 1 << 13
+    ViewChannel = 1 << 20
+    ReadMessageHistory = 1 << 21
+    SendMessage = 1 << 22
+    ManageMessages = 1 << 23
+    ManageWebhooks = 1 << 24
+    InviteOthers = 1 << 25
+    SendEmbeds = 1 << 26
+    UploadFiles = 1 << 27
+    Masquerade = 1 << 28
+    React = 1 << 29
+    Connect = 1 << 30
+    Speak = 1 << 31
+    Video = 1 << 32
+    MuteMembers = 1 << 33
+    DeafenMembers = 1 << 34
+    MoveMembers = 1 << 35
+
+    @classmethod
+    def All(cls) -> Permission:
+        result: Permission = cls(0)
+        for permission in cls:
+            result |= permission
+        return result
+
+# Revolt's fixed permissions for channels outside servers
+DEFAULT_VIEW_ONLY: Permission = Permission.ViewChannel | Permission.ReadMessageHistory
+DEFAULT_PERMISSIONS: Permission = DEFAULT_VIEW_ONLY | Permission.SendMessage | Permission.InviteOthers | Permission.SendEmbeds | Permission.UploadFiles | Permission.Connect | Permission.Speak
+DEFAULT_DIRECT_MESSAGE: Permission = DEFAULT_PERMISSIONS | Permission.ManageChannel | Permission.React
+
+def Override(value: Any) -> tuple[int, int]:
+    # Overrides are {"a": allow, "d": deny}, a plain number only allows
+    if isinstance(value, dict):
+        return value.get("a", 0), value.get("d", 0)
+    if isinstance(value, int):
+        return value, 0
+    return 0, 0
+
+def ApplyOverride(permissions: int, value: Any) -> int:
+    allow, deny = Override(value)
+    return (permissions | allow) & ~deny
+
+def RankedRoles(member: Member) -> list[Role]:
+    # The lowest rank is the most important, so it is applied last and wins
+    return sorted(member.roles or [], key=lambda role: role.rank if role.rank is not None else 0, reverse=True)
+
+class PermissionCalculator:
+    def __init__(self) -> None:
+        # Server ID -> (user ID, channel ID) -> permissions, so invalidation only touches one server
+        self.entries: dict[str, dict[tuple[str, str|None], Permission]] = {}
+
+    def __repr__(self) -> str:
+        return f"<pyrevolt.PermissionCalculator servers={len(self.entries)} entries={sum(len(entries) for entries in self.entries.values())}>"
+
+    @staticmethod
+    def CalculatePrivate(user: User, channel: Channel) -> Permission:
+        userID: str = user.userID
+        recipients: list[str] = [recipient.userID for recipient in getattr(channel, "recipients", [])]
+        match channel.type.value:
+            case "SavedMessages":
+                return Permission.All() if getattr(channel.user, "userID", channel.user) == userID else Permission(0)
+            case "DirectMessage":
+                if userID not in recipients:
+                    return Permission(0)
+                # Blocking either way leaves the conversation readable but nothing else
+                if any(getattr(recipient.relationship, "value", None) in ("Blocked", "BlockedOther") for recipient in channel.recipients if recipient.userID != userID):
+                    return DEFAULT_VIEW_ONLY
+                return DEFAULT_DIRECT_MESSAGE
+            case "Group":
+                if getattr(channel.owner, "userID", channel.owner) == userID:
+                    return Permission.All()
+                if userID not in recipients:
+                    return Permission(0)
+                permissions: int = channel.permissions if channel.permissions is not None else DEFAULT_DIRECT_MESSAGE
+                return Permission((permissions | Permission.ViewChannel) & Permission.All())
+        return Permission(0)
+
+    @staticmethod
+    def Calculate(member: Member|User, channel: Channel|None = None) -> Permission:
+        if channel is not None and not hasattr(channel, "rolePermissions"):
+            # Saved messages, direct messages and groups have no server, so only the user matters
+            return PermissionCalculator.CalculatePrivate(getattr(member, "user", member), channel)
+        server: Any = member.server
+        if getattr(server.owner, "userID", server.owner) == member.user.userID:
+            return Permission.All()
+        permissions: int = server.defaultPermissions if isinstance(server.defaultPermissions, int) else 0
+        roles: list[Role] = RankedRoles(member)
+        for role in roles:
+            permissions = ApplyOverride(permissions, role.permissions)
+        if channel is None:
+            return Permission(permissions & Permission.All())
+        permissions = ApplyOverride(permissions, channel.defaultPermissions)
+        rolePermissions: dict[str, Any] = channel.rolePermissions or {}
+        for role in roles:
+            permissions = ApplyOverride(permissions, rolePermissions.get(role.roleID))
+        if not permissions & Permission.ViewChannel:
+            return Permission(0)
+        return Permission(permissions & Permission.All())
+
+    def Get(self, member: Member|User, channel: Channel|None = None) -> Permission:
+        if channel is not None and not hasattr(channel, "rolePermissions"):
+            # Cheap to calculate and not tied to a server the entries could be invalidated with
+            return self.Calculate(member, channel)
+        entries: dict[tuple[str, str|None], Permission] = self.entries.setdefault(member.server.serverID, {})
+        key: tuple[str, str|None] = (member.user.userID, getattr(channel, "channelID", None))
+        permissions: Permission|None = entries.get(key)
+        if permissions is None:
+            permissions = self.Calculate(member, channel)
+            entries[key] = permissions
+        return permissions
+
+    def Invalidate(self, serverID: str, userID: str|None = None, channelID: str|None = None) -> None:
+        if userID is None and channelID is None:
+            self.entries.pop(serverID, None)
+            return
+        entries: dict[tuple[str, str|None], Permission]|None = self.entries.get(serverID)
+        if entries is None:
+            return
+        for key in [key for key in entries if key[0] == userID or (channelID is not None and key[1] == channelID)]:
+            entries.pop(key)
+
+    def Clear(self) -> None:
+        self.entries.clear()
@@ -0,0 +1,81 @@
+from __future__ import annotations
+import asyncio
+from contextlib import closing
+import hashlib
+import sqlite3
+from typing import TYPE_CHECKING
+from .codec import JSONCodec, GetCodec
+if TYPE_CHECKING:
+    from .session import Session
+
+def TokenHash(token: str) -> str:
+    # The token itself never touches the disk, only enough to tell whether the snapshot belongs to it
+    return hashlib.sha256(token.encode()).hexdigest()
+
+class SessionStore:
+    # Loaded in this order, so everything an entry refers to is already cached when it is built
+    TABLES: tuple[str, ...] = ("users", "channels", "servers", "members")
+
+    def __init__(self, path: str, **kwargs) -> None:
+        self.path: str = path
+        self.codec: JSONCodec = GetCodec(kwargs.get("codec"))
+        self.lock: asyncio.Lock = asyncio.Lock()
+
+    def __repr__(self) -> str:
+        return f"<pyrevolt.SessionStore path={self.path} codec={self.codec.NAME}>"
+
+    def Connect(self) -> sqlite3.Connection:
+        connection: sqlite3.Connection = sqlite3.connect(self.path)
+        for table in self.TABLES:
+            connection.execute(f"CREATE TABLE IF NOT EXISTS {table} (id TEXT PRIMARY KEY, data BLOB NOT NULL)")
+        connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        return connection
+
+    @staticmethod
+    def Key(table: str, data: dict) -> str:
+        if table == "members":
+            return data["_id"]["server"] + "." + data["_id"]["user"]
+        return data["_id"]
+
+    @staticmethod
+    def Dump(session: Session) -> dict[str, list[dict]]:
+        # Taken in one go on the event loop, so the snapshot is consistent even while events keep arriving
+        return {
+            "users": [user.toDict() for user in session.users.values()],
+            "channels": [channel.toDict() for channel in session.channels.values()],
+            "servers": [server.toDict() for server in session.servers.values()],
+            "members": [member.toDict() for member in session.members.values()]
+        }
+
+    def Write(self, payload: dict[str, list[dict]], meta: dict[str, str]) -> None:
+        with closing(self.Connect()) as connection, connection:
+            for table in self.TABLES:
+                connection.execute(f"DELETE FROM {table}")
+                connection.executemany(f"INSERT INTO {table} (id, data) VALUES (?, ?)", [(self.Key(table, data), self.codec.Encode(data)) for data in payload.get(table, [])])
+            connection.execute("DELETE FROM meta")
+            connection.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", list(meta.items()))
+
+    def Read(self) -> tuple[dict[str, list[dict]], dict[str, str]]:
+        with closing(self.Connect()) as connection:
+            payload: dict[str, list[dict]] = {table: [self.codec.Decode(row[0]) for row in connection.execute(f"SELECT data FROM {table}")] for table in self.TABLES}
+            meta: dict[str, str] = dict(connection.execute("SELECT key, value FROM meta"))
+        return payload, meta
+
+    async def Save(self, session: Session) -> None:
+        payload: dict[str, list[dict]] = self.Dump(session)
+        meta: dict[str, str] = {}
+        if session.token is not None and getattr(session, "self", None) is not None:
+            meta = {"token": TokenHash(session.token), "self": session.self.userID}
+        async with self.lock:
+            await asyncio.to_thread(self.Write, payload, meta)
+
+    async def Load(self, session: Session, token: str) -> dict[str, str]:
+        async with self.lock:
+            payload, meta = await asyncio.to_thread(self.Read)
+        if meta.get("token") != TokenHash(token):
+            # Saved by another token, or before one was known, so none of it may be what this one can see
+            return {}
+        if any(len(payload[table]) > 0 for table in self.TABLES):
+            # Built exactly like a Ready payload, the real Ready then reconciles it in place
+            await session.HydrateReady(payload)
+        return meta
@@ -0,0 +1,96 @@
+from __future__ import annotations
+import asyncio
+import random
+import re
+import time
+from typing import Mapping
+
+class Bucket:
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+        self.limit: int|None = None
+        self.remaining: int|None = None
+        self.resetAt: float = 0.0
+        self.waiting: int = 0
+        self.lock: asyncio.Lock = asyncio.Lock()
+
+    def __repr__(self) -> str:
+        return f"<pyrevolt.Bucket name={self.name} limit={self.limit} remaining={self.remaining} waiting={self.waiting}>"
+
+    async def Acquire(self) -> None:
+        self.waiting += 1
+        try:
+            # Holding the lock while sleeping queues every other request for this bucket in order
+            async with self.lock:
+                while True:
+                    now: float = time.monotonic()
+                    if now >= self.resetAt and self.remaining is not None and self.remaining <= 0:
+                        self.remaining = self.limit
+                    if self.remaining is None or self.remaining > 0:
+                        break
+                    await asyncio.sleep(self.resetAt - now)
+                if self.remaining is not None:
+                    self.remaining -= 1
+        finally:
+            self.waiting -= 1
+
+    def Update(self, headers: Mapping[str, str]) -> None:
+        if headers.get("X-RateLimit-Limit") is not None:
+            self.limit = int(headers["X-RateLimit-Limit"])
+        if headers.get("X-RateLimit-Remaining") is not None:
+            self.remaining = int(headers["X-RateLimit-Remaining"])
+        if headers.get("X-RateLimit-Reset-After") is not None:
+            self.resetAt = time.monotonic() + int(headers["X-RateLimit-Reset-After"]) / 1000
+
+    def Block(self, retryAfter: float) -> None:
+        self.remaining = 0
+        self.resetAt = max(self.resetAt, time.monotonic() + retryAfter)
+
+class RateLimiter:
+    ID_PATTERN: re.Pattern = re.compile(r"[0-9A-HJKMNP-TV-Z]{26}")
+
+    def __init__(self) -> None:
+        self.routes: dict[str, str] = {}
+        self.buckets: dict[str, Bucket] = {}
+        self.identities: dict[str, str] = {}
+
+    @staticmethod
+    def Route(method: str, path: str) -> tuple[str, str]:
+        ids: list[str] = RateLimiter.ID_PATTERN.findall(path)
+        return f"{method} {RateLimiter.ID_PATTERN.sub(':id', path)}", ids[0] if len(ids) > 0 else ""
+
+    def Identity(self, token: str|None) -> str:
+        if not token:
+            return ""
+        # Limits are per token, numbered so tokens never end up in bucket names
+        if self.identities.get(token) is None:
+            self.identities[token] = f"{len(self.identities)}/"
+        return self.identities[token]
+
+    def GetBucket(self, method: str, path: str, token: str|None = None) -> Bucket:
+        route, major = self.Route(method, path)
+        # Until Revolt tells us which bucket a route belongs to, every route is its own bucket
+        key: str = f"{self.Identity(token)}{self.routes.get(route, route)}:{major}"
+        if self.buckets.get(key) is None:
+            self.buckets[key] = Bucket(key)
+        return self.buckets[key]
+
+    def Update(self, method: str, path: str, headers: Mapping[str, str], token: str|None = None) -> Bucket:
+        if headers.get("X-RateLimit-Bucket") is not None:
+            route, _ = self.Route(method, path)
+            self.routes[route] = headers["X-RateLimit-Bucket"]
+        bucket: Bucket = self.GetBucket(method, path, token)
+        bucket.Update(headers)
+        return bucket
+
+    def QueueDepth(self) -> dict[str, int]:
+        return {key: bucket.waiting for key, bucket in self.buckets.items()}
+
+    @staticmethod
+    def Backoff(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+        delay: float = min(cap, base * 2 ** attempt)
+        return random.uniform(delay / 2, delay)
+
+    @staticmethod
+    def Jitter(retryAfter: float) -> float:
+        return retryAfter + random.uniform(0, min(1.0, retryAfter / 10 + 0.05))
@@ -0,0 +1,116 @@
+from __future__ import annotations
+import asyncio
+from collections import deque
+from typing import TYPE_CHECKING
+from .client import Method
+from .exceptions import HTTPException
+from .structs.channels import Message
+if TYPE_CHECKING:
+    from .session import Session
+    from .structs.channels import Channel
+
+class MessageSender:
+    def __init__(self, session: Session, **kwargs) -> None:
+        self.session: Session = session
+        self.merge: bool = kwargs.get("merge", False)
+        self.mergeDelay: float = kwargs.get("mergeDelay", 0)
+        self.maxLength: int = kwargs.get("maxLength", 2000)
+        self.concurrency: int|None = kwargs.get("concurrency")
+        self.semaphore: asyncio.Semaphore|None = asyncio.Semaphore(self.concurrency) if self.concurrency is not None else None
+        # One queue and one draining task per channel, so sends to a channel keep their order
+        self.queues: dict[str, deque[tuple[dict, asyncio.Future]]] = {}
+        self.tasks: dict[str, asyncio.Task] = {}
+
+    def __repr__(self) -> str:
+        return f"<pyrevolt.MessageSender channels={len(self.queues)} queued={sum(self.QueueDepth().values())} merge={self.merge}>"
+
+    def QueueDepth(self) -> dict[str, int]:
+        return {channelID: len(queue) for channelID, queue in self.queues.items()}
+
+    async def Send(self, channel: Channel|str, **kwargs) -> Message:
+        channelID: str = getattr(channel, "channelID", channel)
+        data: dict = await Message.generateMessageData(**kwargs)
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.queues.setdefault(channelID, deque()).append((data, future))
+        if channelID not in self.tasks:
+            self.tasks[channelID] = asyncio.create_task(self.Drain(channelID))
+        return await future
+
+    def Mergeable(self, data: dict) -> bool:
+        # Only plain text can be joined, replies, embeds and masquerades belong to one message
+        return self.merge and data.keys() == {"content"}
+
+    def Next(self, queue: deque[tuple[dict, asyncio.Future]]) -> tuple[dict|None, list[asyncio.Future]]:
+        # Callers which were cancelled while queued are dropped
+        while len(queue) > 0 and queue[0][1].done():
+            queue.popleft()
+        if len(queue) == 0:
+            return None, []
+        data, future = queue.popleft()
+        futures: list[asyncio.Future] = [future]
+        if not self.Mergeable(data):
+            return data, futures
+        content: str = data["content"]
+        while len(queue) > 0:
+            nextData, nextFuture = queue[0]
+            if nextFuture.done():
+                queue.popleft()
+                continue
+            if not self.Mergeable(nextData) or len(content) + len(nextData["content"]) + 1 > self.maxLength:
+                break
+            queue.popleft()
+            content += "\n" + nextData["content"]
+            futures.append(nextFuture)
+        return {"content": content}, futures
+
+    async def Post(self, channelID: str, data: dict) -> Message:
+        if self.semaphore is None:
+            result: dict = await self.session.Request(Method.POST, f"/channels/{channelID}/messages", data=data)
+        else:
+            async with self.semaphore:
+                result: dict = await self.session.Request(Method.POST, f"/channels/{channelID}/messages", data=data)
+        if result.get("_id") is None:
+            raise HTTPException(f"Sending the message failed: {result.get('type')}", data=result)
+        return await Message.FromDict(result, self.session)
+
+    async def Drain(self, channelID: str) -> None:
+        queue: deque[tuple[dict, asyncio.Future]] = self.queues[channelID]
+        futures: list[asyncio.Future] = []
+        try:
+            while len(queue) > 0:
+                if self.merge and self.mergeDelay > 0:
+                    # Gives rapid consecutive sends the chance to join this message
+                    await asyncio.sleep(self.mergeDelay)
+                data, futures = self.Next(queue)
+                if data is None:
+                    continue
+                try:
+                    message: Message = await self.Post(channelID, data)
+                except Exception as error:
+                    for future in futures:
+                        if not future.done():
+                            future.set_exception(error)
+                    continue
+                for future in futures:
+                    if not future.done():
+                        future.set_result(message)
+        finally:
+            # Cancelled mid Post, the callers of the message in flight are no longer in the queue for Close to cancel
+            for future in futures:
+                if not future.done():
+                    future.cancel()
+            self.tasks.pop(channelID, None)
+            if len(queue) == 0:
+                self.queues.pop(channelID, None)
+
+    async def Join(self) -> None:
+        await asyncio.gather(*self.tasks.values(), return_exceptions=True)
+
+    async def Close(self) -> None:
+        for task in self.tasks.values():
+            task.cancel()
+        await self.Join()
+        for queue in self.queues.values():
+            for _, future in queue:
+                future.cancel()
+        self.queues.clear()
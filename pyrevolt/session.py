@@ -1,237 +1,444 @@
-import json
+from __future__ import annotations
+import asyncio
+import time
+from typing import Any, Awaitable, Callable
 from .exceptions import WebsocketError, InternalWebsocketError, InvalidSession, OnboardingNotFinished, AlreadyAuthenticated
 from .client import HTTPClient, Method, Request
-from .gateway import Gateway, GatewayEvent
-from .structs.channels import Channel, Message
+from .codec import JSONCodec, GetCodec
+from .cache import MessageCache, UserStore, ChannelStore, MemberStore
+from .permissions import PermissionCalculator
+from .sender import MessageSender
+from .persistence import SessionStore
+from .gateway import Gateway, GatewayEvent, EventRegistry
+from .events import Event
+from .structs.channels import Channel, ServerChannel, Message
 from .structs.user import Relationship, User
 from .structs.server import Server, Role
 from .structs.member import Member
+from .structs.common import Snapshot
 
 class Session:
-    def __init__(self) -> None:
-        self.gateway: Gateway = Gateway()
-        self.client: HTTPClient = HTTPClient()
+    def __init__(self, **kwargs) -> None:
+        self.codec: JSONCodec = GetCodec(kwargs.get("codec"))
+        self.ownsClient: bool = kwargs.get("client") is None
+        self.client: HTTPClient = kwargs.get("client") or HTTPClient(codec=self.codec, **kwargs.get("http", {}))
+        self.gateway: Gateway = Gateway(codec=self.codec, client=self.client, heartbeat=kwargs.get("heartbeat", {}), reconnect=kwargs.get("reconnect", True), maxReconnectAttempts=kwargs.get("maxReconnectAttempts"))
         self.token: str|None = None
-        self.users: dict[str, User] = {}
-        self.channels: dict[str, Channel] = {}
+        self.users: UserStore = UserStore()
+        self.channels: ChannelStore = ChannelStore()
         self.servers: dict[str, Server] = {}
-        self.members: dict[str, Member] = {}
-        self.messages: dict[str, Message] = {}
+        self.members: MemberStore = MemberStore()
+        self.messages: MessageCache = kwargs.get("messageCache") or MessageCache(**kwargs.get("cache", {}))
+        self.inflight: dict[str, asyncio.Future] = {}
+        self.missing: dict[str, float] = {}
+        self.missingTTL: float = kwargs.get("missingTTL", 30)
+        self.registry: EventRegistry = kwargs.get("registry") or EventRegistry()
+        self.registry.SetDefaults(self.HANDLERS)
+        self.messageFilter: Callable[[dict], bool]|None = kwargs.get("messageFilter")
+        self.permissions: PermissionCalculator = kwargs.get("permissions") or PermissionCalculator()
+        self.sender: MessageSender = MessageSender(self, **kwargs.get("sender", {}))
+        store: SessionStore|str|None = kwargs.get("store")
+        self.store: SessionStore|None = SessionStore(store, codec=self.codec) if isinstance(store, str) else store
+        self.storeInterval: float|None = kwargs.get("storeInterval")
+        self.storeTask: asyncio.Task|None = None
 
     async def Connect(self) -> None:
         await self.gateway.Connect()
 
     async def Start(self, token: str) -> None:
+        meta: dict[str, str] = await self.store.Load(self, token) if self.store is not None else {}
         await self.Connect()
         await self.gateway.Authenticate(token)
         self.token = token
 
-        request: dict = await self.Request(Method.GET, "/users/@me")
-        self.self: User = await self.GetUser(request["_id"])
+        userID: str|None = meta.get("self")
+        if userID is None or self.users.get(userID) is None:
+            request: dict = await self.Request(Method.GET, "/users/@me")
+            userID = request["_id"]
+        self.self: User = await self.GetUser(userID)
+        if self.store is not None and self.storeInterval is not None:
+            self.storeTask = asyncio.create_task(self.SaveStorePeriodically())
+
+    async def SaveStorePeriodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.storeInterval)
+            await self.store.Save(self)
 
     async def Close(self) -> None:
+        await self.sender.Close()
+        if self.storeTask is not None:
+            self.storeTask.cancel()
+            await asyncio.gather(self.storeTask, return_exceptions=True)
+            self.storeTask = None
+        if self.store is not None and self.token is not None:
+            await self.store.Save(self)
         await self.gateway.Close()
-        await self.client.Close()
+        if self.ownsClient:
+            await self.client.Close()
     
     async def Request(self, method: Method, url: str, **kwargs) -> dict:
         request: Request = Request(method, url, **kwargs)
         request.AddAuthentication(self.token)
         return await self.client.Request(request)
 
+    async def Coalesce(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        future: asyncio.Future|None = self.inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fetch())
+            self.inflight[key] = future
+            future.add_done_callback(lambda _: self.inflight.pop(key, None))
+        # Shielded so one cancelled caller doesn't cancel the fetch for everyone else waiting on it
+        return await asyncio.shield(future)
+
+    def IsMissing(self, path: str) -> bool:
+        expiry: float|None = self.missing.get(path)
+        if expiry is None:
+            return False
+        if expiry <= time.monotonic():
+            self.missing.pop(path)
+            return False
+        return True
+
+    async def Fetch(self, path: str) -> dict|None:
+        if self.IsMissing(path):
+            return None
+        result: dict = await self.Request(Method.GET, path)
+        if result.get("type") is not None:
+            if result["type"] == "NotFound":
+                self.missing[path] = time.monotonic() + self.missingTTL
+            return None
+        return result
+
+    def RegisterEvent(self, event: Event, handler: Callable[[Session, dict], Awaitable[list|None]]|None = None) -> None:
+        self.registry.Register(event, handler)
+
     async def ProcessGateway(self, data: dict) -> dict:
-        for event in GatewayEvent:
-            if data["type"] == event.value.VALUE:
-                data["type"] = event.value
-                break
-
-        args: list = []
-        kwargs: dict = {}
-
-        match data["type"]:
-            case GatewayEvent.Error.value:
-                match data["error"]:
-                    case "LabelMe":
-                        raise WebsocketError("An error occured")
-                    case "InternalError":
-                        raise InternalWebsocketError("An internal error occured")
-                    case "InvalidSession":
-                        raise InvalidSession("The session is invalid")
-                    case "OnboardingNotFinished":
-                        raise OnboardingNotFinished("The onboarding is not finished")
-                    case "AlreadyAuthenticated":
-                        raise AlreadyAuthenticated("The session is already authenticated")
-                    case _:
-                        raise WebsocketError("An error occured")
-            case GatewayEvent.Bulk.value:
-                for event in data["v"]:
-                    await self.ProcessGateway(event)
-                return
-            case GatewayEvent.Ready.value:
-                await GatewayEvent.ReadySimplified.value.dispatch()
-                for index, user in enumerate(data["users"]):
-                    user: User = await User.FromJSON(json.dumps(user), self)
-                    data["users"][index] = user
-                for index, channel in enumerate(data["channels"]):
-                    channel: Channel = await Channel.FromJSON(json.dumps(channel), self)
-                    data["channels"][index] = channel
-                for index, server in enumerate(data["servers"]):
-                    server: Server = await Server.FromJSON(json.dumps(server), self)
-                    data["servers"][index] = server
-                for index, member in enumerate(data["members"]):
-                    member: Member = await Member.FromJSON(json.dumps(member), self)
-                    data["members"][index] = member
-                args.append(data["users"])
-                args.append(data["channels"])
-                args.append(data["servers"])
-                args.append(data["members"])
-            case GatewayEvent.OnMessage.value:
-                message: dict = data.copy()
-                message.pop("type")
-                message: Message = await Message.FromJSON(json.dumps(message), self)
-                self.messages[message.messageID] = message
-                args.append(message)
-            case GatewayEvent.MessageUpdate.value:
-                message: Message = self.messages.get(data["id"], await Message.FromID(data["channel"], data["id"], self)).copy()
-                args.append(message)
-                newMessage: Message = await Message.FromID(data["channel"], data["id"], self)
-                await newMessage.update(data["data"])
-                if newMessage.content == message.content:
-                    return {"type": data["type"]}
-                args.append(newMessage)
-            case GatewayEvent.MessageDelete.value:
-                message: Message = self.messages.get(data["id"])
-                if message is None:
-                    return {"type": data["type"]}
-                self.messages.pop(data["id"])
-                args.append(message)
-            case GatewayEvent.ChannelCreate.value:
-                channel: Channel = await Channel.FromJSON(json.dumps(data), self)
-                self.channels[channel.channelID] = channel
-                args.append(channel)
-            case GatewayEvent.ChannelUpdate.value:
-                channel: Channel = self.channels.get(data["id"], await Channel.FromID(data["id"], self)).copy()
-                args.append(channel)
-                newChannel: Channel = await Channel.FromID(data["id"], self)
-                await newChannel.update(data["data"], data.get("clear", []))
-                args.append(newChannel)
-            case GatewayEvent.ChannelDelete.value:
-                channel: Channel = self.channels.get(data["id"])
-                if channel is None:
-                    return {"type": data["type"]}
-                self.channels.pop(data["id"])
-                args.append(channel)
-            case GatewayEvent.ChannelGroupJoin.value | GatewayEvent.ChannelGroupLeave.value:
-                channel: Channel = self.channels.get(data["id"], await Channel.FromID(data["id"], self))
-                user: User = self.users.get(data["user"], await User.FromID(data["user"], self))
-                if data["type"] == GatewayEvent.ChannelGroupJoin.value:
-                    channel.users.append(user)
-                else:
-                    channel.users.remove(user)
-                args.append(channel)
-                args.append(user)
-            case GatewayEvent.ChannelStartTyping.value | GatewayEvent.ChannelStopTyping.value:
-                channel: Channel = self.channels.get(data["id"], await Channel.FromID(data["id"], self))
-                user: User = self.users.get(data["user"], await User.FromID(data["user"], self))
-                args.append(channel)
-                args.append(user)
-            case GatewayEvent.ChannelAck.value:
-                # Could use this for possible implementation in the future
-                pass
-            case GatewayEvent.ServerCreate.value:
-                server: Server = await Server.FromJSON(json.dumps(data), self)
-                self.servers[server.serverID] = server
-                args.append(server)
-            case GatewayEvent.ServerUpdate.value:
-                server: Server = self.servers.get(data["id"], await Server.FromID(data["id"], self)).copy()
-                args.append(server)
-                newServer: Server = await Server.FromID(data["id"], self)
-                await newServer.update(data["data"], data.get("clear", []), session=self)
-                args.append(newServer)
-            case GatewayEvent.ServerDelete.value:
-                server: Server = self.servers.get(data["id"])
-                if server is None:
-                    return {"type": data["type"]}
-                self.servers.pop(data["id"])
-                args.append(server)
-            case GatewayEvent.ServerMemberUpdate.value:
-                member: Member = await Member.FromID(data["id"]["server"] + "." + data["id"]["user"], self)
-                args.append(member)
-                newMember: Member = member.copy()
-                await newMember.update(data["data"], data.get("clear", []))
-                args.append(newMember)
-            case GatewayEvent.ServerMemberJoin.value | GatewayEvent.ServerMemberLeave.value:
-                member: Member = await Member.FromID(data["id"] + "." + data["user"], self)
-                if data["type"] == GatewayEvent.ServerMemberJoin.value:
-                    self.members[member.memberID] = member
-                    if self.users.get(member.user.userID) is None:
-                        self.users[member.user.userID] = member.user
-                else:
-                    self.members.pop(member.memberID)
-                args.append(member)
-            case GatewayEvent.ServerRoleUpdate.value:
-                server: Server = self.servers.get(data["id"], await Server.FromID(data["id"], self))
-                if server.roles.get(data["role_id"]) is None:
-                    data["data"]["_id"] = data["role_id"]
-                    server.roles[data["role_id"]] = await Role.FromJSON(json.dumps(data["data"]), self)
-                else:
-                    await server.roles[data["role_id"]].update(data["data"], data.get("clear", []))
-                args.append(server)
-                args.append(server.roles[data["role_id"]])
-            case GatewayEvent.ServerRoleDelete.value:
-                server: Server = self.servers.get(data["id"], await Server.FromID(data["id"], self))
-                if server.roles.get(data["role_id"]) is None:
-                    return {"type": data["type"]}
-                args.append(server)
-                args.append(server.roles[data["role_id"]])
-                server.roles.pop(data["role_id"])
-            case GatewayEvent.UserUpdate.value:
-                user: User = self.users.get(data["id"], await User.FromID(data["id"], self)).copy()
-                args.append(user)
-                newUser: User = await User.FromID(data["id"], self)
-                await newUser.update(data["data"], data.get("clear", []))
-                args.append(newUser)
-            case GatewayEvent.UserRelationship.value:
-                user: User = self.users.get(data["user"], await User.FromID(data["user"], self))
-                await user.update({"relationship": data["status"]})
-                args.append(user)
-                args.append(Relationship(data["status"]))
-        
-        await data["type"].dispatch(*args, **kwargs)
+        event, handler = self.registry.Resolve(data["type"])
+        if event is not GatewayEvent.Unknown.value:
+            data["type"] = event
+
+        args: list|None = []
+        if handler is not None:
+            args = await handler(self, data)
+        if args is None:
+            return {"type": data["type"]}
+
+        await self.registry.Dispatch(event, *args)
         return data
 
+    async def HandleError(self, data: dict) -> list|None:
+        match data["error"]:
+            case "LabelMe":
+                raise WebsocketError("An error occured")
+            case "InternalError":
+                raise InternalWebsocketError("An internal error occured")
+            case "InvalidSession":
+                raise InvalidSession("The session is invalid")
+            case "OnboardingNotFinished":
+                raise OnboardingNotFinished("The onboarding is not finished")
+            case "AlreadyAuthenticated":
+                raise AlreadyAuthenticated("The session is already authenticated")
+            case _:
+                raise WebsocketError("An error occured")
+
+    async def HandleBulk(self, data: dict) -> list|None:
+        for event in data["v"]:
+            await self.ProcessGateway(event)
+
+    async def HandleUnknown(self, data: dict) -> list|None:
+        return [data]
+
+    async def HandleReady(self, data: dict) -> list|None:
+        await self.registry.Dispatch(GatewayEvent.ReadySimplified.value)
+        await self.HydrateReady(data)
+        return [data["users"], data["channels"], data["servers"], data["members"]]
+
+    def WantsMessage(self, data: dict) -> bool:
+        if self.messageFilter is None:
+            return True
+        # Listeners need the object, and edits and deletes are only dispatched for cached messages
+        for event in (GatewayEvent.OnMessage, GatewayEvent.MessageUpdate, GatewayEvent.MessageDelete):
+            if len(self.registry.Listeners(event.value)) > 0:
+                return True
+        return self.messageFilter(data)
+
+    async def HandleMessage(self, data: dict) -> list|None:
+        if not self.WantsMessage(data):
+            return None
+        message: dict = data.copy()
+        message.pop("type")
+        message: Message = await Message.FromDict(message, self)
+        self.messages[message.messageID] = message
+        data["message"] = message
+        return [message]
+
+    async def HandleMessageUpdate(self, data: dict) -> list|None:
+        # Like deletes, edits are only dispatched for cached messages
+        message: Message|None = self.messages.get(data["id"])
+        if message is None:
+            return None
+        before: Snapshot = Snapshot(message)
+        await message.update(data["data"])
+        if message.content == before.content:
+            return None
+        return [before, message]
+
+    async def HandleMessageDelete(self, data: dict) -> list|None:
+        message: Message = self.messages.pop(data["id"], None)
+        if message is None:
+            return None
+        return [message]
+
+    async def HandleChannelCreate(self, data: dict) -> list|None:
+        channel: Channel = await Channel.FromDict(data, self)
+        self.channels[channel.channelID] = channel
+        return [channel]
+
+    async def HandleChannelUpdate(self, data: dict) -> list|None:
+        channel: Channel|None = self.channels.get(data["id"])
+        if channel is None:
+            return None
+        before: Snapshot = Snapshot(channel)
+        await channel.update(data["data"], data.get("clear", []))
+        self.channels.Reindex(channel.channelID)
+        self.InvalidatePermissions(channel)
+        return [before, channel]
+
+    async def HandleChannelDelete(self, data: dict) -> list|None:
+        channel: Channel = self.channels.pop(data["id"], None)
+        if channel is None:
+            return None
+        self.InvalidatePermissions(channel)
+        return [channel]
+
+    async def HandleChannelGroupMembership(self, data: dict) -> list|None:
+        channel: Channel = self.channels.get(data["id"]) or await Channel.FromID(data["id"], self)
+        user: User = self.users.get(data["user"]) or await User.FromID(data["user"], self)
+        if data["type"] == GatewayEvent.ChannelGroupJoin.value:
+            channel.recipients.append(user)
+        elif user in channel.recipients:
+            channel.recipients.remove(user)
+        return [channel, user]
+
+    async def HandleChannelTyping(self, data: dict) -> list|None:
+        channel: Channel = self.channels.get(data["id"]) or await Channel.FromID(data["id"], self)
+        user: User = self.users.get(data["user"]) or await User.FromID(data["user"], self)
+        return [channel, user]
+
+    async def HandleServerCreate(self, data: dict) -> list|None:
+        server: Server = await Server.FromDict(data, self)
+        self.servers[server.serverID] = server
+        return [server]
+
+    async def HandleServerUpdate(self, data: dict) -> list|None:
+        server: Server|None = self.servers.get(data["id"])
+        if server is None:
+            return None
+        roles: dict|None = data["data"].get("roles")
+        if roles is not None and server.roles is not None:
+            # UpdateRoles patches known roles in place, so the changed ones are snapshotted on their own
+            before: Snapshot = Snapshot(server, roles={roleID: Snapshot(role) if roleID in roles else role for roleID, role in server.roles.items()})
+        else:
+            before: Snapshot = Snapshot(server)
+        await server.update(data["data"], data.get("clear", []), session=self)
+        self.permissions.Invalidate(server.serverID)
+        return [before, server]
+
+    async def HandleServerDelete(self, data: dict) -> list|None:
+        server: Server = self.servers.pop(data["id"], None)
+        if server is None:
+            return None
+        for channelID in list(self.channels.Keys("server", server.serverID)):
+            self.channels.pop(channelID)
+        for memberID in list(self.members.Keys("server", server.serverID)):
+            self.members.pop(memberID)
+        self.permissions.Invalidate(server.serverID)
+        return [server]
+
+    async def HandleServerMemberUpdate(self, data: dict) -> list|None:
+        member: Member|None = self.members.get(data["id"]["server"] + "." + data["id"]["user"])
+        if member is None:
+            return None
+        before: Snapshot = Snapshot(member)
+        await member.update(data["data"], data.get("clear", []))
+        self.permissions.Invalidate(data["id"]["server"], userID=data["id"]["user"])
+        return [before, member]
+
+    async def HandleServerMembership(self, data: dict) -> list|None:
+        if data["type"] == GatewayEvent.ServerMemberJoin.value:
+            self.missing.pop(f"/servers/{data['id']}/members/{data['user']}", None)
+        member: Member = await Member.FromID(data["id"] + "." + data["user"], self)
+        if member is None:
+            return None
+        if data["type"] == GatewayEvent.ServerMemberJoin.value:
+            self.members[member.memberID] = member
+            if self.users.get(member.user.userID) is None:
+                self.users[member.user.userID] = member.user
+        else:
+            self.members.pop(member.memberID)
+        self.permissions.Invalidate(data["id"], userID=data["user"])
+        return [member]
+
+    async def HandleServerRoleUpdate(self, data: dict) -> list|None:
+        server: Server|None = self.servers.get(data["id"])
+        if server is None:
+            return None
+        if server.roles.get(data["role_id"]) is None:
+            data["data"]["_id"] = data["role_id"]
+            server.roles[data["role_id"]] = await Role.FromDict(data["data"])
+        else:
+            await server.roles[data["role_id"]].update(data["data"], data.get("clear", []))
+        self.permissions.Invalidate(server.serverID)
+        return [server, server.roles[data["role_id"]]]
+
+    async def HandleServerRoleDelete(self, data: dict) -> list|None:
+        server: Server|None = self.servers.get(data["id"])
+        if server is None:
+            return None
+        role: Role|None = server.roles.pop(data["role_id"], None)
+        if role is None:
+            return None
+        for member in self.ServerMembers(server.serverID):
+            if member.roles is not None and role in member.roles:
+                member.roles = [memberRole for memberRole in member.roles if memberRole is not role]
+        self.permissions.Invalidate(server.serverID)
+        return [server, role]
+
+    async def HandleUserUpdate(self, data: dict) -> list|None:
+        user: User|None = self.users.get(data["id"])
+        if user is None:
+            return None
+        before: Snapshot = Snapshot(user)
+        await user.update(data["data"], data.get("clear", []))
+        self.users.Reindex(user.userID)
+        return [before, user]
+
+    async def HandleUserRelationship(self, data: dict) -> list|None:
+        user: User = self.users.get(data["user"]) or await User.FromID(data["user"], self)
+        await user.update({"relationship": data["status"]})
+        return [user, Relationship(data["status"])]
+
+    HANDLERS: dict[str, Callable[[Session, dict], Awaitable[list|None]]] = {
+        GatewayEvent.Error.value.VALUE: HandleError,
+        GatewayEvent.Bulk.value.VALUE: HandleBulk,
+        GatewayEvent.Unknown.value.VALUE: HandleUnknown,
+        GatewayEvent.Ready.value.VALUE: HandleReady,
+        GatewayEvent.OnMessage.value.VALUE: HandleMessage,
+        GatewayEvent.MessageUpdate.value.VALUE: HandleMessageUpdate,
+        GatewayEvent.MessageDelete.value.VALUE: HandleMessageDelete,
+        GatewayEvent.ChannelCreate.value.VALUE: HandleChannelCreate,
+        GatewayEvent.ChannelUpdate.value.VALUE: HandleChannelUpdate,
+        GatewayEvent.ChannelDelete.value.VALUE: HandleChannelDelete,
+        GatewayEvent.ChannelGroupJoin.value.VALUE: HandleChannelGroupMembership,
+        GatewayEvent.ChannelGroupLeave.value.VALUE: HandleChannelGroupMembership,
+        GatewayEvent.ChannelStartTyping.value.VALUE: HandleChannelTyping,
+        GatewayEvent.ChannelStopTyping.value.VALUE: HandleChannelTyping,
+        GatewayEvent.ServerCreate.value.VALUE: HandleServerCreate,
+        GatewayEvent.ServerUpdate.value.VALUE: HandleServerUpdate,
+        GatewayEvent.ServerDelete.value.VALUE: HandleServerDelete,
+        GatewayEvent.ServerMemberUpdate.value.VALUE: HandleServerMemberUpdate,
+        GatewayEvent.ServerMemberJoin.value.VALUE: HandleServerMembership,
+        GatewayEvent.ServerMemberLeave.value.VALUE: HandleServerMembership,
+        GatewayEvent.ServerRoleUpdate.value.VALUE: HandleServerRoleUpdate,
+        GatewayEvent.ServerRoleDelete.value.VALUE: HandleServerRoleDelete,
+        GatewayEvent.UserUpdate.value.VALUE: HandleUserUpdate,
+        GatewayEvent.UserRelationship.value.VALUE: HandleUserRelationship
+    }
+
+    async def HydrateReady(self, data: dict) -> None:
+        # Everything Ready references is in the payload, so index it all first and link in memory
+        # instead of letting each constructor fall back to a REST fetch
+        users: list[User] = []
+        for raw in data.get("users", []):
+            user: User|None = self.users.get(raw["_id"])
+            if user is None:
+                user = await User.FromDict(raw, self)
+            else:
+                # Objects already handed out to user code are patched rather than replaced
+                await user.update(raw, [key for key in User.OPTIONAL if raw.get(key) is None])
+                self.users.Reindex(user.userID)
+            users.append(user)
+        channels: list[Channel] = []
+        for raw in data.get("channels", []):
+            channel: Channel|None = self.channels.get(raw["_id"])
+            if channel is None or channel.type.value != raw["channel_type"]:
+                channel = await Channel.FromDict(raw, self, fetch=False)
+            else:
+                await channel.Refresh(raw, self)
+            if channel is not None:
+                channels.append(channel)
+        servers: list[Server] = []
+        for raw in data.get("servers", []):
+            server: Server|None = self.servers.get(raw["_id"])
+            if server is None:
+                server = await Server.FromDict(raw, self, fetch=False)
+            else:
+                await server.update(raw, [key for key in Server.OPTIONAL if raw.get(key) is None], session=self, fetch=False)
+            servers.append(server)
+        for channel in channels:
+            if isinstance(channel, ServerChannel):
+                serverID: str = getattr(channel.server, "serverID", channel.server)
+                channel.server = self.servers.get(serverID, channel.server)
+                self.channels.Reindex(channel.channelID)
+        members: list[Member] = []
+        for raw in data.get("members", []):
+            member: Member|None = self.members.get(raw["_id"]["server"] + "." + raw["_id"]["user"])
+            if member is None:
+                member = await Member.FromDict(raw, self, fetch=False)
+            else:
+                await member.update(raw, [key for key in Member.OPTIONAL if raw.get(key) is None])
+            if member is not None:
+                members.append(member)
+
+        # Ready lists every channel and server the bot can see, so anything else went away while disconnected
+        channelIDs: set[str] = {channel.channelID for channel in channels}
+        for channelID in [channelID for channelID in self.channels if channelID not in channelIDs]:
+            self.channels.pop(channelID)
+        serverIDs: set[str] = {server.serverID for server in servers}
+        for serverID in [serverID for serverID in self.servers if serverID not in serverIDs]:
+            self.servers.pop(serverID)
+        for serverID in [serverID for serverID in self.members.indexes["server"] if serverID not in serverIDs]:
+            for memberID in list(self.members.Keys("server", serverID)):
+                self.members.pop(memberID)
+        self.missing.clear()
+        self.permissions.Clear()
+
+        data["users"] = users
+        data["channels"] = channels
+        data["servers"] = servers
+        data["members"] = members
+
     async def GatewayReceive(self) -> dict:
         return await self.ProcessGateway(await self.gateway.Receive())
 
+    def InvalidatePermissions(self, channel: Channel) -> None:
+        if isinstance(channel, ServerChannel):
+            self.permissions.Invalidate(getattr(channel.server, "serverID", channel.server), channelID=channel.channelID)
+
+    def ServerMembers(self, serverID: str) -> list[Member]:
+        return self.members.Lookup("server", serverID)
+
+    def UserServers(self, userID: str) -> list[Server]:
+        serverIDs: list[str] = [memberID.partition(".")[0] for memberID in self.members.Keys("user", userID)]
+        return [self.servers[serverID] for serverID in serverIDs if serverID in self.servers]
+
+    def FindChannels(self, serverID: str, name: str) -> list[Channel]:
+        return self.channels.Lookup("name", (serverID, name.lower()))
+
+    def FindUsers(self, username: str) -> list[User]:
+        return self.users.Lookup("username", username.lower())
+
     async def GetUser(self, userID: str) -> User:
-        if self.users.get(userID) is None:
-            data: dict = await self.Request(Method.GET, f"/users/{userID}")
-            user: User = await User.FromJSON(json.dumps(data), self)
-            return user
-        else:
-            return self.users[userID]
+        return await User.FromID(userID, self)
 
     async def GetChannel(self, channelID: str) -> Channel:
-        if self.channels.get(channelID) is None:
-            data: dict = await self.Request(Method.GET, f"/channels/{channelID}")
-            channel: Channel = await channel.FromJSON(json.dumps(data), self)
-            return channel
-        else:
-            return self.channels[channelID]
+        return await Channel.FromID(channelID, self)
 
     async def GetServer(self, serverID: str) -> Server:
-        if self.servers.get(serverID) is None:
-            data: dict = await self.Request(Method.GET, f"/servers/{serverID}")
-            server: Server = await Server.FromJSON(json.dumps(data), self)
-            return server
-        else:
-            return self.servers[serverID]
+        return await Server.FromID(serverID, self)
 
     async def GetMember(self, serverID: str, userID: str) -> Member:
-        if self.members.get(serverID + "." + userID) is None:
-            data: dict = await self.Request(Method.GET, f"/servers/{serverID}/members/{userID}")
-            member: Member = await Member.FromJSON(json.dumps(data), self)
-            return member
-        return self.members[serverID + "." + userID]
+        return await Member.FromID(serverID + "." + userID, self)
 
     async def GetRole(self, serverID: str, roleID: str) -> Role:
         server: Server = await self.GetServer(serverID)
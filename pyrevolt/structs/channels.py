@@ -1,10 +1,13 @@
 from __future__ import annotations
 from enum import Enum
+import asyncio
 import json
 from ..exceptions import InvalidMessageException
 from ..client import Method
+from ..permissions import Permission
 from .user import User
-from typing import TYPE_CHECKING, Any
+from .common import Intern, SetField
+from typing import TYPE_CHECKING, Any, AsyncIterator
 if TYPE_CHECKING:
     from ..session import Session
     from .server import Server
@@ -17,38 +20,60 @@ class ChannelType(Enum):
     VoiceChannel = "VoiceChannel"
 
 class Channel:
+    __slots__ = ("channelID", "type", "session")
+    # Fields a full channel payload leaves out when they are unset
+    OPTIONAL: tuple[str, ...] = ()
+
     def __init__(self, channelID: str, type: ChannelType, **kwargs) -> None:
-        self.channelID: str = channelID
+        self.channelID: str = Intern(channelID)
         self.type: ChannelType = type
         self.session: Session|None = kwargs.get("session")
 
+    def toDict(self) -> dict:
+        return {"_id": self.channelID, "channel_type": self.type.value}
+
     async def update(self, updateData: dict, clear: list[str] = []) -> None:
         for key, value in updateData.items():
-            setattr(self, key, value)
+            SetField(self, key, value)
         for key in clear:
-            setattr(self, key, None)
+            SetField(self, key, None)
+
+    async def Refresh(self, data: dict, session: Session) -> None:
+        # Patches the channel from a full payload, references are taken from the cache without fetching
+        updateData: dict = {key: value for key, value in data.items() if key not in ("_id", "channel_type")}
+        if data.get("server") is not None:
+            updateData["server"] = session.servers.get(data["server"], data["server"])
+        if data.get("user") is not None:
+            updateData["user"] = session.users.get(data["user"], data["user"])
+        if data.get("owner") is not None:
+            updateData["owner"] = session.users.get(data["owner"])
+        if data.get("recipients") is not None:
+            updateData["recipients"] = [session.users[userID] for userID in data["recipients"] if userID in session.users]
+        await self.update(updateData, [key for key in self.OPTIONAL if data.get(key) is None])
 
     @staticmethod
-    async def FromJSON(jsonData: str|bytes, session: Session) -> Channel:
-        data: dict = json.loads(jsonData)
+    async def ResolveUser(userID: str, session: Session, fetch: bool = True) -> User|None:
+        user: User|None = session.users.get(userID)
+        if user is None and fetch:
+            user = await User.FromID(userID, session)
+        return user
+
+    @staticmethod
+    async def FromDict(data: dict, session: Session, fetch: bool = True) -> Channel:
         kwargs: dict = {}
         kwargs["session"] = session
         channel: Channel = None
         match data["channel_type"]:
             case ChannelType.SavedMessages.value:
-                user: User|None = session.users.get(data["user"])
-                if user is None:
-                    user = await User.FromID(data["user"], session.token)
-                channel = SavedMessages(data["_id"], user)
+                channel = SavedMessages(data["_id"], await Channel.ResolveUser(data["user"], session, fetch), **kwargs)
             case ChannelType.DirectMessage.value:
                 if data.get("last_message_id") is not None:
                     kwargs["lastMessageID"] = data["last_message_id"]
                 recipients: list[User] = []
                 for userID in data["recipients"]:
-                    user: User|None = session.users.get(userID)
-                    if user is None:
-                        user = await User.FromID(userID, session.token)
-                    recipients.append(user)
+                    user: User|None = await Channel.ResolveUser(userID, session, fetch)
+                    if user is not None:
+                        recipients.append(user)
                 channel = DirectMessage(data["_id"], data["active"], recipients, **kwargs)
             case ChannelType.Group.value:
                 if data.get("description") is not None:
@@ -62,9 +87,9 @@ class Channel:
                 recipients: list[User] = []
                 owner: User = None
                 for userID in data["recipients"]:
-                    user: User|None = session.users.get(userID)
+                    user: User|None = await Channel.ResolveUser(userID, session, fetch)
                     if user is None:
-                        user = await User.FromID(userID, session.token)
+                        continue
                     if user.userID == data["owner"]:
                         owner = user
                     recipients.append(user)
@@ -74,30 +99,41 @@ class Channel:
                     kwargs["description"] = data["description"]
                 if data.get("default_permissions") is not None:
                     kwargs["defaultPermissions"] = data["default_permissions"]
+                if data.get("role_permissions") is not None:
+                    kwargs["rolePermissions"] = data["role_permissions"]
                 if data.get("nsfw") is not None:
                     kwargs["nsfw"] = data["nsfw"]
                 if data.get("last_message_id") is not None:
                     kwargs["lastMessageID"] = data["last_message_id"]
-                channel = TextChannel(data["_id"], data["server"], data["name"], **kwargs)
+                channel = TextChannel(data["_id"], session.servers.get(data["server"], data["server"]), data["name"], **kwargs)
             case ChannelType.VoiceChannel.value:
                 if data.get("description") is not None:
                     kwargs["description"] = data["description"]
                 if data.get("default_permissions") is not None:
-                    kwargs["defaultPermissions"] = data["defaultPermissions"]
+                    kwargs["defaultPermissions"] = data["default_permissions"]
+                if data.get("role_permissions") is not None:
+                    kwargs["rolePermissions"] = data["role_permissions"]
                 if data.get("nsfw") is not None:
                     kwargs["nsfw"] = data["nsfw"]
-                channel = VoiceChannel(data["_id"], data["server"], data["name"], **kwargs)
+                channel = VoiceChannel(data["_id"], session.servers.get(data["server"], data["server"]), data["name"], **kwargs)
         session.channels[channel.channelID] = channel
         return channel
 
+    @staticmethod
+    async def FromJSON(jsonData: str|bytes, session: Session) -> Channel:
+        return await Channel.FromDict(json.loads(jsonData), session)
+
     @staticmethod
     async def FromID(channelID: str, session: Session) -> Channel:
-        if session.channels.get(channelID) is not None:
-            return session.channels[channelID]
-        result: dict = await session.Request(Method.GET, f"/channels/{channelID}")
-        if result.get("type") is not None:
-            return
-        return await Channel.FromJSON(json.dumps(result), session)
+        channel: Channel|None = session.channels.get(channelID)
+        if channel is not None:
+            return channel
+        async def fetch() -> Channel|None:
+            result: dict|None = await session.Fetch(f"/channels/{channelID}")
+            if result is None:
+                return
+            return await Channel.FromDict(result, session)
+        return await session.Coalesce(f"/channels/{channelID}", fetch)
 
     @staticmethod
     async def AttemptParse(content: str, session: Session) -> Channel|bool:
@@ -131,7 +167,73 @@ class Channel:
         await self.session.Request(Method.DELETE, f"/channels/{self.channelID}")
         self.session.channels.pop(self.channelID)
 
-class SavedMessages(Channel):
+class Messageable:
+    __slots__ = ()
+
+    async def FetchPage(self, **kwargs) -> dict:
+        params: dict = {"limit": kwargs.get("limit", 100), "include_users": "true"}
+        if kwargs.get("before") is not None:
+            params["before"] = kwargs["before"]
+        if kwargs.get("after") is not None:
+            params["after"] = kwargs["after"]
+        if kwargs.get("around") is not None:
+            params["nearby"] = kwargs["around"]
+        if kwargs.get("sort") is not None:
+            params["sort"] = kwargs["sort"]
+        result: dict|list = await self.session.Request(Method.GET, f"/channels/{self.channelID}/messages", params=params)
+        if isinstance(result, list):
+            return {"messages": result}
+        if result.get("type") is not None:
+            return {"messages": []}
+        return result
+
+    async def IngestPage(self, page: dict, cache: bool = True) -> list[Message]:
+        for user in page.get("users", []):
+            if self.session.users.get(user["_id"]) is None:
+                await User.FromDict(user, self.session)
+        messages: list[Message] = []
+        for message in page.get("messages", []):
+            messages.append(await Message.FromDict(message, self.session, cache=cache))
+        return messages
+
+    async def History(self, **kwargs) -> AsyncIterator[Message]:
+        limit: int|None = kwargs.get("limit")
+        pageSize: int = min(kwargs.get("pageSize", 100), 100)
+        cache: bool = kwargs.get("cache", True)
+        before: str|None = kwargs.get("before")
+        after: str|None = kwargs.get("after")
+        if kwargs.get("around") is not None:
+            page: dict = await self.FetchPage(limit=min(limit or pageSize, pageSize), around=kwargs["around"])
+            for message in await self.IngestPage(page, cache):
+                yield message
+            return
+        # Walk forwards from after, otherwise backwards from before (or the latest message)
+        sort: str = "Oldest" if after is not None and before is None else "Latest"
+        count: int = 0
+        pending: asyncio.Task|None = asyncio.create_task(self.FetchPage(limit=min(limit or pageSize, pageSize), before=before, after=after, sort=sort))
+        while pending is not None:
+            page: dict = await pending
+            pending = None
+            raw: list[dict] = page.get("messages", [])
+            if len(raw) == pageSize and (limit is None or count + len(raw) < limit):
+                cursor: str = raw[-1]["_id"]
+                nextLimit: int = pageSize if limit is None else min(pageSize, limit - count - len(raw))
+                if sort == "Oldest":
+                    pending = asyncio.create_task(self.FetchPage(limit=nextLimit, after=cursor, before=before, sort=sort))
+                else:
+                    pending = asyncio.create_task(self.FetchPage(limit=nextLimit, before=cursor, after=after, sort=sort))
+            try:
+                for message in await self.IngestPage(page, cache):
+                    count += 1
+                    yield message
+            except BaseException:
+                if pending is not None:
+                    pending.cancel()
+                raise
+
+class SavedMessages(Channel, Messageable):
+    __slots__ = ("user",)
+
     def __init__(self, channelID: str, user: User, **kwargs) -> None:
         self.user: User = user
         super().__init__(channelID, ChannelType.SavedMessages, **kwargs)
@@ -139,10 +241,18 @@ class SavedMessages(Channel):
     def __repr__(self) -> str:
         return f"<pyrevolt.SavedMessage id={self.channelID} user={self.user}>"
 
+    def toDict(self) -> dict:
+        data: dict = super().toDict()
+        data["user"] = getattr(self.user, "userID", self.user)
+        return data
+
     def copy(self) -> SavedMessages:
         return SavedMessages(self.channelID, self.user, session=self.session)
 
-class DirectMessage(Channel):
+class DirectMessage(Channel, Messageable):
+    __slots__ = ("active", "recipients", "lastMessageID")
+    OPTIONAL: tuple[str, ...] = ("last_message_id",)
+
     def __init__(self, channelID: str, active: bool, recipients: list[User], **kwargs) -> None:
         self.active: bool = active
         self.recipients: list[User] = recipients
@@ -152,10 +262,21 @@ class DirectMessage(Channel):
     def __repr__(self) -> str:
         return f"<pyrevolt.DirectMessage id={self.channelID} active={self.active} recipients={self.recipients}>"
 
+    def toDict(self) -> dict:
+        data: dict = super().toDict()
+        data["active"] = self.active
+        data["recipients"] = [user.userID for user in self.recipients]
+        if self.lastMessageID is not None:
+            data["last_message_id"] = self.lastMessageID
+        return data
+
     def copy(self) -> DirectMessage:
         return DirectMessage(self.channelID, self.active, self.recipients, session=self.session)
 
-class Group(Channel):
+class Group(Channel, Messageable):
+    __slots__ = ("name", "recipients", "owner", "description", "lastMessageID", "permissions", "nsfw")
+    OPTIONAL: tuple[str, ...] = ("description", "last_message_id", "permissions", "nsfw")
+
     def __init__(self, channelID: str, name: str, recipients: list[User], owner: User, **kwargs) -> None:
         self.name: str = name
         self.recipients: list[User] = recipients
@@ -173,24 +294,59 @@ class Group(Channel):
     def __str__(self) -> str:
         return self.name
 
+    def toDict(self) -> dict:
+        data: dict = super().toDict()
+        data["name"] = self.name
+        data["recipients"] = [user.userID for user in self.recipients]
+        data["owner"] = getattr(self.owner, "userID", self.owner)
+        if self.description is not None:
+            data["description"] = self.description
+        if self.lastMessageID is not None:
+            data["last_message_id"] = self.lastMessageID
+        if self.permissions is not None:
+            data["permissions"] = self.permissions
+        if self.nsfw is not None:
+            data["nsfw"] = self.nsfw
+        return data
+
     def copy(self) -> Group:
         return Group(self.channelID, self.name, self.recipients, self.owner, session=self.session)
 
 class ServerChannel(Channel):
+    __slots__ = ("server", "name", "description", "defaultPermissions", "rolePermissions", "nsfw")
+    OPTIONAL: tuple[str, ...] = ("description", "default_permissions", "role_permissions", "nsfw")
+
     def __init__(self, channelID: str, type: ChannelType, server: Server, name: str, **kwargs) -> None:
         self.server: Server = server
         self.name: str = name
         self.description: str | None = kwargs.get("description")
         # TODO: Icon
-        self.defaultPermissions: int | None = kwargs.get("defaultPermissions")
-        # TODO: Role permissions
+        self.defaultPermissions: dict | int | None = kwargs.get("defaultPermissions")
+        self.rolePermissions: dict[str, dict] | None = kwargs.get("rolePermissions")
         self.nsfw: bool | None = kwargs.get("nsfw")
         super().__init__(channelID, type, **kwargs)
 
     def __str__(self) -> str:
         return self.name
 
-class TextChannel(ServerChannel):
+    def toDict(self) -> dict:
+        data: dict = super().toDict()
+        data["server"] = getattr(self.server, "serverID", self.server)
+        data["name"] = self.name
+        if self.description is not None:
+            data["description"] = self.description
+        if self.defaultPermissions is not None:
+            data["default_permissions"] = self.defaultPermissions
+        if self.rolePermissions is not None:
+            data["role_permissions"] = self.rolePermissions
+        if self.nsfw is not None:
+            data["nsfw"] = self.nsfw
+        return data
+
+class TextChannel(ServerChannel, Messageable):
+    __slots__ = ("lastMessageID",)
+    OPTIONAL: tuple[str, ...] = ServerChannel.OPTIONAL + ("last_message_id",)
+
     def __init__(self, channelID: str, server: Server, name: str, **kwargs) -> None:
         self.lastMessageID: str|None = kwargs.get("lastMessageID")
         super().__init__(channelID, ChannelType.TextChannel, server, name, **kwargs)
@@ -198,10 +354,18 @@ class TextChannel(ServerChannel):
     def __repr__(self) -> str:
         return f"<pyrevolt.TextChannel id={self.channelID} server={self.server.serverID} name={self.name}>"
 
+    def toDict(self) -> dict:
+        data: dict = super().toDict()
+        if self.lastMessageID is not None:
+            data["last_message_id"] = self.lastMessageID
+        return data
+
     def copy(self) -> TextChannel:
         return TextChannel(self.channelID, self.server, self.name, session=self.session)
 
 class VoiceChannel(ServerChannel):
+    __slots__ = ()
+
     def __init__(self, channelID: str, server: Server, name: str, **kwargs) -> None:
         super().__init__(channelID, ChannelType.VoiceChannel, server, name, **kwargs)
 
@@ -250,14 +414,26 @@ class Embed:
     def __repr__(self) -> str:
         return f"<pyrevolt.Embed type={self.type}>"
 
+    # Attribute names and the API fields they are sent as
+    FIELDS: tuple[tuple[str, str], ...] = (
+        ("iconURL", "icon_url"), ("url", "url"), ("title", "title"), ("description", "description"), ("colour", "colour"),
+        ("siteName", "site_name"), ("specials", "specials"), ("width", "width"), ("height", "height")
+    )
+
+    def toDict(self) -> dict[str, Any]:
+        data: dict[str, Any] = {}
+        for name, key in self.FIELDS:
+            if getattr(self, name, None) is not None:
+                data[key] = getattr(self, name)
+        if getattr(self, "size", None) is not None:
+            data["size"] = self.size.value
+        return data
+
     def toJSON(self) -> str:
-        data: dict[str, Any] = self.__dict__
-        data["type"] = None
-        return json.dumps(data)
+        return json.dumps(self.toDict())
 
     @staticmethod
-    async def FromJSON(jsonData: str | bytes) -> Embed:
-        data: dict = json.loads(jsonData)
+    async def FromDict(data: dict) -> Embed:
         kwargs: dict = {}
         match data["type"]:
             case EmbedType.Website.value:
@@ -281,6 +457,10 @@ class Embed:
                 kwargs["colour"] = data.get("colour")
         return Embed(EmbedType(data["type"]), **kwargs)
 
+    @staticmethod
+    async def FromJSON(jsonData: str | bytes) -> Embed:
+        return await Embed.FromDict(json.loads(jsonData))
+
     @staticmethod
     def Create(**kwargs):
         return Embed(EmbedType.Text, **kwargs)
@@ -290,38 +470,120 @@ class Masquerade:
         self.name: str | None = kwargs.get("name")
         self.avatar: str | None = kwargs.get("avatar")
 
+    def toDict(self) -> dict[str, Any]:
+        data: dict[str, Any] = {}
+        if self.name is not None:
+            data["name"] = self.name
+        if self.avatar is not None:
+            data["avatar"] = self.avatar
+        return data
+
+    @staticmethod
+    async def FromDict(data: dict) -> Masquerade:
+        return Masquerade(name=data.get("name"), avatar=data.get("avatar"))
+
     @staticmethod
     async def FromJSON(jsonData: str | bytes) -> Masquerade:
-        data: dict = json.loads(jsonData)
-        return Masquerade(name=data["name"], avatar=data["avatar"])
+        return await Masquerade.FromDict(json.loads(jsonData))
 
 class Reply:
     def __init__(self, messageID: str, mention: bool):
         self.messageID: str = messageID
         self.mention: bool = mention
 
+    def toDict(self) -> dict[str, Any]:
+        return {"id": self.messageID, "mention": self.mention}
+
     @staticmethod
-    async def FromJSON(jsonData: str | bytes, session: Session) -> Reply:
-        data: dict = json.loads(jsonData)
+    async def FromDict(data: dict, session: Session) -> Reply:
         return Reply(data["id"], data["mention"])
 
+    @staticmethod
+    async def FromJSON(jsonData: str | bytes, session: Session) -> Reply:
+        return await Reply.FromDict(json.loads(jsonData), session)
+
 class Message:
-    def __init__(self, messageID: str, channel: Channel, author: User, **kwargs):
+    __slots__ = ("messageID", "channelID", "authorID", "resolvedChannel", "resolvedAuthor", "content", "nonce", "edited", "embeds", "mentionIDs", "replyIDs", "resolvedMentions", "resolvedReplies", "masquerade", "session")
+
+    def __init__(self, messageID: str, channel: Channel|str, author: User|str, **kwargs):
         self.messageID: int = messageID
-        self.channel: Channel = channel
-        self.author: User = author
+        # References are kept as IDs and looked up when first read, see resolve() to fetch them
+        self.channelID: str = Intern(getattr(channel, "channelID", channel))
+        self.authorID: str = Intern(getattr(author, "userID", author))
+        self.resolvedChannel: Channel|None = None if isinstance(channel, str) else channel
+        self.resolvedAuthor: User|None = None if isinstance(author, str) else author
         self.content: str | None = kwargs.get("content")
         self.nonce: str | None = kwargs.get("nonce")
         self.edited: str | None = kwargs.get("edited")
         self.embeds: list[Embed] | None = kwargs.get("embeds")
-        self.mentions: list[User] | None = kwargs.get("mentions")
-        # TODO: Fix replies
-        self.replies: list[Message] | None = kwargs.get("replies")
+        self.mentionIDs: list[str] | None = None
+        self.replyIDs: list[str] | None = None
+        self.resolvedMentions: dict[str, User] = {}
+        self.resolvedReplies: dict[str, Message] = {}
+        if kwargs.get("mentions") is not None:
+            self.mentionIDs = [Intern(getattr(mention, "userID", mention)) for mention in kwargs["mentions"]]
+            self.resolvedMentions = {mention.userID: mention for mention in kwargs["mentions"] if not isinstance(mention, str)}
+        if kwargs.get("replies") is not None:
+            self.replyIDs = [getattr(reply, "messageID", reply) for reply in kwargs["replies"]]
+            self.resolvedReplies = {reply.messageID: reply for reply in kwargs["replies"] if not isinstance(reply, str)}
         self.masquerade: Masquerade | None = kwargs.get("masquerade")
         self.session: Session | None = kwargs.get("session")
 
     def __repr__(self) -> str:
-        return f"<pyrevolt.Message id={self.messageID} channel={self.channel} author={self.author}>"
+        return f"<pyrevolt.Message id={self.messageID} channel={self.channelID} author={self.authorID}>"
+
+    @property
+    def channel(self) -> Channel|None:
+        """The channel from the cache, None when it is not cached and resolve() was not awaited."""
+        if self.resolvedChannel is None and self.session is not None:
+            self.resolvedChannel = self.session.channels.get(self.channelID)
+        return self.resolvedChannel
+
+    @property
+    def author(self) -> User|None:
+        """The author from the cache, None when they are not cached and resolve() was not awaited."""
+        if self.resolvedAuthor is None and self.session is not None:
+            self.resolvedAuthor = self.session.users.get(self.authorID)
+        return self.resolvedAuthor
+
+    @property
+    def mentions(self) -> list[User] | None:
+        if self.mentionIDs is None:
+            return None
+        if self.session is not None:
+            for userID in self.mentionIDs:
+                if self.resolvedMentions.get(userID) is None and self.session.users.get(userID) is not None:
+                    self.resolvedMentions[userID] = self.session.users[userID]
+        return [self.resolvedMentions[userID] for userID in self.mentionIDs if userID in self.resolvedMentions]
+
+    @property
+    def replies(self) -> list[Message] | None:
+        if self.replyIDs is None:
+            return None
+        if self.session is not None:
+            for messageID in self.replyIDs:
+                if self.resolvedReplies.get(messageID) is None:
+                    reply: Message|None = self.session.messages.get(messageID, record=False)
+                    if reply is not None:
+                        self.resolvedReplies[messageID] = reply
+        return [self.resolvedReplies[messageID] for messageID in self.replyIDs if messageID in self.resolvedReplies]
+
+    async def resolve(self, references: bool = True) -> Message:
+        # Everything missing from the caches is fetched in one concurrent batch
+        channel, author, *fetched = await asyncio.gather(
+            Channel.FromID(self.channelID, self.session) if self.channel is None else asyncio.sleep(0, self.channel),
+            User.FromID(self.authorID, self.session) if self.author is None else asyncio.sleep(0, self.author),
+            *[User.FromID(userID, self.session) for userID in self.mentionIDs or [] if references and userID not in self.resolvedMentions],
+            *[Message.FromID(self.channelID, messageID, self.session) for messageID in self.replyIDs or [] if references and messageID not in self.resolvedReplies]
+        )
+        self.resolvedChannel = channel
+        self.resolvedAuthor = author
+        for reference in fetched:
+            if isinstance(reference, User):
+                self.resolvedMentions[reference.userID] = reference
+            elif isinstance(reference, Message):
+                self.resolvedReplies[reference.messageID] = reference
+        return self
 
     def copy(self) -> Message:
         kwargs: dict = {}
@@ -329,10 +591,11 @@ class Message:
         kwargs["nonce"] = self.nonce
         kwargs["edited"] = self.edited
         kwargs["embeds"] = self.embeds
-        kwargs["mentions"] = self.mentions
-        kwargs["replies"] = self.replies
+        kwargs["mentions"] = self.mentionIDs
+        kwargs["replies"] = self.replyIDs
         kwargs["masquerade"] = self.masquerade
-        return Message(self.messageID, self.channel, self.author, **kwargs)
+        kwargs["session"] = self.session
+        return Message(self.messageID, self.resolvedChannel or self.channelID, self.resolvedAuthor or self.authorID, **kwargs)
 
     async def update(self, updatedData: dict) -> None:
         self.edited = updatedData.get("edited", self.edited)
@@ -341,28 +604,21 @@ class Message:
         if updatedData.get("embeds") is not None:
             embeds: list[Embed] = []
             for embed in updatedData["embeds"]:
-                embeds.append(await Embed.FromJSON(json.dumps(embed)))
+                embeds.append(await Embed.FromDict(embed))
             self.embeds = embeds
         if updatedData.get("mentions") is not None:
-            mentions: list[User] = []
-            for mention in updatedData["mentions"]:
-                mentions.append(await User.FromJSON(json.dumps(mention), self.session))
-            self.mentions = mentions
+            self.mentionIDs = list(updatedData["mentions"])
         if updatedData.get("replies") is not None:
-            replies: list[Message] = []
-            for reply in updatedData["replies"]:
-                replies.append(await Message.FromJSON(json.dumps(reply), self.session))
-            self.replies = replies
+            self.replyIDs = list(updatedData["replies"])
         if updatedData.get("masquerade") is not None:
-            self.masquerade = await Masquerade.FromJSON(json.dumps(updatedData["masquerade"]))
+            self.masquerade = await Masquerade.FromDict(updatedData["masquerade"])
 
     @property
     def url(self) -> str:
-        return f"https://app.revolt.chat/channel/{self.channel.channelID}/{self.messageID}"
+        return f"https://app.revolt.chat/channel/{self.channelID}/{self.messageID}"
 
     @staticmethod
-    async def FromJSON(jsonData: str | bytes, session: Session) -> Message:
-        data: dict = json.loads(jsonData)
+    async def FromDict(data: dict, session: Session, cache: bool = True) -> Message:
         kwargs: dict = {}
         kwargs["session"] = session
         if data.get("content") is not None:
@@ -374,29 +630,33 @@ class Message:
         if data.get("embeds") is not None:
             kwargs["embeds"] = []
             for embed in data["embeds"]:
-                kwargs["embeds"].append(await Embed.FromJSON(json.dumps(embed)))
+                kwargs["embeds"].append(await Embed.FromDict(embed))
         if data.get("mentions") is not None:
-            kwargs["mentions"] = []
-            for mention in data["mentions"]:
-                kwargs["mentions"].append(await User.FromID(mention, session))
+            kwargs["mentions"] = data["mentions"]
         if data.get("replies") is not None:
-            kwargs["replies"] = []
-            for reply in data["replies"]:
-                kwargs["replies"].append(await Message.FromID(data["channel"], reply, session))
+            kwargs["replies"] = data["replies"]
         if data.get("masquerade") is not None:
-            kwargs["masquerade"] = await Masquerade.FromJSON(json.dumps(data["masquerade"]))
-        message: Message = Message(data["_id"], await Channel.FromID(data["channel"], session), await User.FromID(data["author"], session), **kwargs)
-        session.messages[data["_id"]] = message
+            kwargs["masquerade"] = await Masquerade.FromDict(data["masquerade"])
+        message: Message = Message(data["_id"], data["channel"], data["author"], **kwargs)
+        if cache:
+            session.messages[data["_id"]] = message
         return message
 
+    @staticmethod
+    async def FromJSON(jsonData: str | bytes, session: Session) -> Message:
+        return await Message.FromDict(json.loads(jsonData), session)
+
     @staticmethod
     async def FromID(channelID: str, messageID: str, session: Session) -> Message:
-        if session.messages.get(messageID) is not None:
-            return session.messages[messageID]
-        data: dict = await session.Request(Method.GET, f"/channels/{channelID}/messages/{messageID}")
-        if data.get("type") is not None:
-            return
-        return await Message.FromJSON(json.dumps(data), session)
+        message: Message|None = session.messages.get(messageID)
+        if message is not None:
+            return message
+        async def fetch() -> Message|None:
+            result: dict|None = await session.Fetch(f"/channels/{channelID}/messages/{messageID}")
+            if result is None:
+                return
+            return await Message.FromDict(result, session)
+        return await session.Coalesce(f"/channels/{channelID}/messages/{messageID}", fetch)
 
     @staticmethod
     async def generateMessageData(**kwargs) -> dict:
@@ -407,50 +667,49 @@ class Message:
         if kwargs.get("content") is not None:
             data["content"] = kwargs["content"]
         if kwargs.get("replies") is not None:
-            data["replies"] = []
-            for reply in kwargs["replies"]:
-                data["replies"].append({"id": reply.messageID, "mention": reply.mention})
+            data["replies"] = [reply.toDict() for reply in kwargs["replies"]]
         if kwargs.get("embed") is not None:
-            data["embeds"] = [json.loads(kwargs["embed"].toJSON())]
+            data["embeds"] = [kwargs["embed"].toDict()]
         if kwargs.get("embeds") is not None:
-            data["embeds"] = data.get("embeds", [])
-            for embed in kwargs["embeds"]:
-                data["embeds"].append(json.loads(embed.toJSON()))
+            data["embeds"] = data.get("embeds", []) + [embed.toDict() for embed in kwargs["embeds"]]
         if kwargs.get("masquerade") is not None:
-            data["masquerade"] = {"id": kwargs["masquerade"].name, "avatar": kwargs["masquerade"].avatar}
+            data["masquerade"] = kwargs["masquerade"].toDict()
         return data
 
     async def Send(self, **kwargs) -> Message:
-        data: dict = await Message.generateMessageData(**kwargs)
-        await Message.FromJSON(json.dumps(await self.session.Request(Method.POST, f"/channels/{self.channel.channelID}/messages", data=data)), self.session)
+        return await self.session.sender.Send(self.channelID, **kwargs)
 
     async def Edit(self, **kwargs) -> None:
         data: dict = {}
         if kwargs.get("content") is not None:
             data["content"] = kwargs["content"]
         if kwargs.get("embed") is not None:
-            data["embeds"] = [json.loads(kwargs["embed"].toJSON())]
+            data["embeds"] = [kwargs["embed"].toDict()]
         if kwargs.get("embeds") is not None:
-            data["embeds"] = data.get("embeds", [])
-            for embed in kwargs["embeds"]:
-                data["embeds"].append(json.loads(embed.toJSON()))
+            data["embeds"] = data.get("embeds", []) + [embed.toDict() for embed in kwargs["embeds"]]
 
-        result: dict = await self.session.Request(Method.PATCH, f"/channels/{self.channel.channelID}/messages/{self.messageID}", data=data)
+        result: dict = await self.session.Request(Method.PATCH, f"/channels/{self.channelID}/messages/{self.messageID}", data=data)
         if result.get("type") is None:
             await self.update(result)
 
     async def Delete(self) -> None:
-        if self.author is self.sesison.self:
-            await self.session.Request(Method.DELETE, f"/channels/{self.channel.channelID}/messages/{self.messageID}")
+        if self.authorID == self.session.self.userID:
+            await self.session.Request(Method.DELETE, f"/channels/{self.channelID}/messages/{self.messageID}")
         else:
-            if self.channel.type == ChannelType.SavedMessages | ChannelType.DirectMessage | ChannelType.Group:
+            if self.channel is not None and self.channel.type in (ChannelType.SavedMessages, ChannelType.DirectMessage, ChannelType.Group):
                 raise TypeError("You can only delete messages by yourself from non-server channels.")
             else:
-                request: dict = await self.session.Request(Method.DELETE, f"/channels/{self.channel.channelID}/messages/{self.messageID}")
+                # Checked locally when the bot's member is cached, saving a request that would be refused
+                channel: Channel|None = self.session.channels.get(self.channelID)
+                if isinstance(channel, ServerChannel):
+                    member: Any = self.session.members.get(getattr(channel.server, "serverID", channel.server) + "." + self.session.self.userID)
+                    if member is not None and not member.Permissions(channel) & Permission.ManageMessages:
+                        raise PermissionError("You are missing the ManageMessages permission.")
+                request: dict = await self.session.Request(Method.DELETE, f"/channels/{self.channelID}/messages/{self.messageID}")
                 if request.get("type") == "MissingPermission":
                     raise PermissionError(f"You are missing the {request['permission']} permission.")
-                self.session.messages.pop(self.messageID)
+                self.session.messages.pop(self.messageID, None)
 
     @staticmethod
     async def Create(channel: Channel, **kwargs) -> Message:
-        return await Message.FromJSON(json.dumps(await channel.session.Request(Method.POST, f"/channels/{channel.channelID}/messages", data=await Message.generateMessageData(**kwargs))), channel.session)
\ No newline at end of file
+        return await channel.session.sender.Send(channel.channelID, **kwargs)
\ No newline at end of file
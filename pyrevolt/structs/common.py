@@ -0,0 +1,84 @@
+from __future__ import annotations
+import inspect
+import sys
+import types
+from typing import Any
+
+# Revolt field names which do not map onto an attribute by camel casing alone
+FIELDS: dict[str, str] = {
+    "_id": "id",
+    "last_message_id": "lastMessageID",
+    "default_permissions": "defaultPermissions",
+    "role_permissions": "rolePermissions",
+    "system_messages": "systemMessages"
+}
+
+def Intern(value: Any) -> Any:
+    # IDs repeat across thousands of cached objects, interning keeps a single copy of each
+    return sys.intern(value) if isinstance(value, str) else value
+
+def AttributeNames(obj: Any) -> list[str]:
+    names: list[str] = []
+    for cls in type(obj).__mro__:
+        for name in getattr(cls, "__slots__", ()):
+            if name not in names and name != "__weakref__" and hasattr(obj, name):
+                names.append(name)
+    names.extend(name for name in getattr(obj, "__dict__", {}) if name not in names)
+    return names
+
+def FieldName(key: str) -> str:
+    if key in FIELDS:
+        return FIELDS[key]
+    parts: list[str] = key.split("_")
+    name: str = parts[0] + "".join(part.capitalize() for part in parts[1:])
+    return name[0].lower() + name[1:] if len(name) > 0 else name
+
+def SetField(obj: Any, key: str, value: Any) -> bool:
+    name: str = FieldName(key)
+    # Slotted objects only take the attributes they declare, unknown fields from newer API versions are skipped
+    if not any(name in getattr(cls, "__slots__", ()) for cls in type(obj).__mro__) and not hasattr(obj, "__dict__"):
+        return False
+    setattr(obj, name, value)
+    return True
+
+class Snapshot:
+    __slots__ = ("target", "values")
+
+    def __init__(self, target: Any, **kwargs) -> None:
+        # Only the attribute references are copied, update() replaces values rather than mutating them
+        object.__setattr__(self, "target", target)
+        object.__setattr__(self, "values", {name: getattr(target, name) for name in AttributeNames(target)})
+        # Values which are patched in place are passed in already copied
+        self.values.update(kwargs)
+
+    def __repr__(self) -> str:
+        return type(self.target).__repr__(self)
+
+    def __str__(self) -> str:
+        return type(self.target).__str__(self)
+
+    @property
+    def __class__(self) -> type:
+        return type(self.target)
+
+    def __getattr__(self, name: str) -> Any:
+        values: dict[str, Any] = object.__getattribute__(self, "values")
+        if name in values:
+            return values[name]
+        attribute: Any = inspect.getattr_static(type(self.target), name, None)
+        if isinstance(attribute, property):
+            # Computed from the snapshot's values, a property which caches onto the object falls back to the live one
+            try:
+                return attribute.fget(self)
+            except AttributeError:
+                return getattr(self.target, name)
+        if isinstance(attribute, types.FunctionType):
+            # Bound to the snapshot, so methods read the old values and cannot write through to the live object
+            return types.MethodType(attribute, self)
+        return getattr(self.target, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("Snapshots are read only")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("Snapshots are read only")
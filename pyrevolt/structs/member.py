@@ -1,13 +1,18 @@
 from __future__ import annotations
 import json
 from typing import TYPE_CHECKING
-from ..client import Method
+from .common import SetField
+from ..permissions import Permission, PermissionCalculator
 if TYPE_CHECKING:
+    from .channels import Channel
     from .user import User
     from .server import Server, Role
     from ..session import Session
 
 class Member:
+    __slots__ = ("user", "server", "nickname", "roles")
+    OPTIONAL: tuple[str, ...] = ("nickname", "roles")
+
     def __init__(self, user: User, server: Server, **kwargs) -> None:
         self.user: User = user
         self.server: Server = server
@@ -24,6 +29,20 @@ class Member:
     def memberID(self) -> str:
         return self.server.serverID + "." + self.user.userID
 
+    def Permissions(self, channel: Channel|None = None) -> Permission:
+        session: Session|None = getattr(self.server, "session", None)
+        if session is None:
+            return PermissionCalculator.Calculate(self, channel)
+        return session.permissions.Get(self, channel)
+
+    def toDict(self) -> dict:
+        data: dict = {"_id": {"server": self.server.serverID, "user": self.user.userID}}
+        if self.nickname is not None:
+            data["nickname"] = self.nickname
+        if self.roles is not None:
+            data["roles"] = [role.roleID for role in self.roles]
+        return data
+
     def copy(self) -> Member:
         return Member(self.user, self.server, nickname=self.nickname, roles=self.roles)
 
@@ -38,28 +57,43 @@ class Member:
                     roles.append(role)
             self.roles = roles
         for key in clear:
-            setattr(self, key, None)
+            SetField(self, key, None)
 
     @staticmethod
-    async def FromJSON(jsonData: str|bytes, session: Session) -> Member:
-        data: dict = json.loads(jsonData)
-        kwargs: dict = {}
+    async def FromDict(data: dict, session: Session, fetch: bool = True, cache: bool = True, **kwargs) -> Member|None:
+        user: User|None = kwargs.pop("user", None)
+        server: Server|None = kwargs.pop("server", None)
+        if fetch:
+            user = user or await session.GetUser(data["_id"]["user"])
+            server = server or await session.GetServer(data["_id"]["server"])
+        else:
+            user = user or session.users.get(data["_id"]["user"])
+            server = server or session.servers.get(data["_id"]["server"])
+            if user is None or server is None:
+                return None
         if data.get("nickname") is not None:
             kwargs["nickname"] = data["nickname"]
         if data.get("roles") is not None:
-            kwargs["roles"] = []
-            for roleID in data["roles"]:
-                kwargs["roles"].append(await session.GetRole(data["_id"]["server"], roleID))
-        member: Member = Member(await session.GetUser(data["_id"]["user"]), await session.GetServer(data["_id"]["server"]), **kwargs)
-        session.members[member.server.serverID + "." + member.user.userID] = member
+            roles: dict[str, Role] = server.roles or {}
+            kwargs["roles"] = [roles[roleID] for roleID in data["roles"] if roleID in roles]
+        member: Member = Member(user, server, **kwargs)
+        if cache:
+            session.members[member.memberID] = member
         return member
 
+    @staticmethod
+    async def FromJSON(jsonData: str|bytes, session: Session) -> Member:
+        return await Member.FromDict(json.loads(jsonData), session)
+
     @staticmethod
     async def FromID(memberID: str, session: Session) -> Member:
-        if session.members.get(memberID) is not None:
-            return session.members[memberID]
+        member: Member|None = session.members.get(memberID)
+        if member is not None:
+            return member
         ids: list[str] = memberID.split(".")
-        result: dict = await session.Request(Method.GET, f"/servers/{ids[0]}/members/{ids[1]}")
-        if result.get("type") is not None:
-            return
-        return await Member.FromJSON(json.dumps(result), session)
\ No newline at end of file
+        async def fetch() -> Member|None:
+            result: dict|None = await session.Fetch(f"/servers/{ids[0]}/members/{ids[1]}")
+            if result is None:
+                return
+            return await Member.FromDict(result, session)
+        return await session.Coalesce(f"/servers/{ids[0]}/members/{ids[1]}", fetch)
\ No newline at end of file
@@ -1,12 +1,14 @@
 from __future__ import annotations
+import asyncio
 import json
 from ..client import Method
 from ..structs.channels import ServerChannel
 from ..structs.user import User
-from typing import TYPE_CHECKING
+from ..structs.member import Member
+from ..structs.common import Intern, SetField
+from typing import TYPE_CHECKING, AsyncIterator
 if TYPE_CHECKING:
     from ..session import Session
-    from .member import Member
 
 class Category:
     def __init__(self, categoryID: str, title: str, channels: list[ServerChannel]) -> None:
@@ -17,17 +19,29 @@ class Category:
     def __repr__(self) -> str:
         return f"<pyrevolt.Category id={self.categoryID} title={self.title} channels={self.channels}>"
 
+    def toDict(self) -> dict:
+        return {"id": self.categoryID, "title": self.title, "channels": [channel.channelID for channel in self.channels]}
+
     @staticmethod
-    async def FromJSON(jsonData: str|bytes, session: Session) -> Category:
-        data: dict = json.loads(jsonData)
+    async def ResolveChannel(channelID: str, session: Session, fetch: bool = True) -> ServerChannel|None:
+        if not fetch:
+            return session.channels.get(channelID)
+        return await ServerChannel.FromID(channelID, session)
+
+    @staticmethod
+    async def FromDict(data: dict, session: Session, fetch: bool = True) -> Category:
         channels: list[ServerChannel] = []
         for channel in data["channels"]:
-            channel: ServerChannel|None = await ServerChannel.FromID(channel, session)
+            channel: ServerChannel|None = await Category.ResolveChannel(channel, session, fetch)
             if channel is not None:
                 channels.append(channel)
             
         return Category(data["id"], data["title"], channels)
 
+    @staticmethod
+    async def FromJSON(jsonData: str|bytes, session: Session) -> Category:
+        return await Category.FromDict(json.loads(jsonData), session)
+
 class SystemMessages:
     def __init__(self, **kwargs) -> None:
         self.userJoinedChannel: ServerChannel|None = kwargs.get("userJoinedChannel")
@@ -38,23 +52,36 @@ class SystemMessages:
     def __repr__(self) -> str:
         return f"<pyrevolt.SystemMessages userJoinedChannel={self.userJoinedChannel} userLeftChannel={self.userLeftChannel} userKickedChannel={self.userKickedChannel} userBannedChannel={self.userBannedChannel}>"
 
+    def toDict(self) -> dict:
+        data: dict = {}
+        for key in ("userJoinedChannel", "userLeftChannel", "userKickedChannel", "userBannedChannel"):
+            if getattr(self, key) is not None:
+                data[key] = getattr(self, key).channelID
+        return data
+
     @staticmethod
-    async def FromJSON(jsonData: str|bytes, session: Session) -> SystemMessages:
-        data: dict = json.loads(jsonData)
+    async def FromDict(data: dict, session: Session, fetch: bool = True) -> SystemMessages:
         kwargs: dict = {}
         if data.get("userJoinedChannel") is not None:
-            kwargs["userJoinedChannel"] = await ServerChannel.FromJSON(json.dumps(data["userJoinedChannel"]), session)
+            kwargs["userJoinedChannel"] = await Category.ResolveChannel(data["userJoinedChannel"], session, fetch)
         if data.get("userLeftChannel") is not None:
-            kwargs["userLeftChannel"] = await ServerChannel.FromJSON(json.dumps(data["userLeftChannel"]), session)
+            kwargs["userLeftChannel"] = await Category.ResolveChannel(data["userLeftChannel"], session, fetch)
         if data.get("userKickedChannel") is not None:
-            kwargs["userKickedChannel"] = await ServerChannel.FromJSON(json.dumps(data["userKickedChannel"]), session)
+            kwargs["userKickedChannel"] = await Category.ResolveChannel(data["userKickedChannel"], session, fetch)
         if data.get("userBannedChannel") is not None:
-            kwargs["userBannedChannel"] = await ServerChannel.FromJSON(json.dumps(data["userBannedChannel"]), session)
+            kwargs["userBannedChannel"] = await Category.ResolveChannel(data["userBannedChannel"], session, fetch)
         return SystemMessages(**kwargs)
 
+    @staticmethod
+    async def FromJSON(jsonData: str|bytes, session: Session) -> SystemMessages:
+        return await SystemMessages.FromDict(json.loads(jsonData), session)
+
 class Role:
+    __slots__ = ("roleID", "name", "permissions", "colour", "hoist", "rank")
+    OPTIONAL: tuple[str, ...] = ("colour", "hoist", "rank")
+
     def __init__(self, roleID: str, name: str, permissions, **kwargs) -> None:
-        self.roleID: str = roleID
+        self.roleID: str = Intern(roleID)
         self.name: str = name
         self.permissions = permissions
         self.colour: int|None = kwargs.get("colour")
@@ -64,15 +91,24 @@ class Role:
     def __repr__(self) -> str:
         return f"<pyrevolt.Roles name={self.name} permissions={self.permissions} colour={self.colour} hoist={self.hoist} rank={self.rank}>"
 
+    def toDict(self) -> dict:
+        data: dict = {"name": self.name, "permissions": self.permissions}
+        if self.colour is not None:
+            data["colour"] = self.colour
+        if self.hoist is not None:
+            data["hoist"] = self.hoist
+        if self.rank is not None:
+            data["rank"] = self.rank
+        return data
+
     async def update(self, updatedData: dict, clear: list[str] = []) -> None:
         for key, value in updatedData.items():
-            setattr(self, key, value)
+            SetField(self, key, value)
         for key in clear:
-            setattr(self, key, None)
+            SetField(self, key, None)
 
     @staticmethod
-    async def FromJSON(jsonData: str|bytes) -> Role:
-        data: dict = json.loads(jsonData)
+    async def FromDict(data: dict) -> Role:
         kwargs: dict = {}
         if data.get("colour") is not None:
             kwargs["colour"] = data["colour"]
@@ -82,7 +118,14 @@ class Role:
             kwargs["rank"] = data["rank"]
         return Role(data["_id"], data["name"], data["permissions"], **kwargs)
 
+    @staticmethod
+    async def FromJSON(jsonData: str|bytes) -> Role:
+        return await Role.FromDict(json.loads(jsonData))
+
 class Server:
+    # Fields a full server payload leaves out when they are unset
+    OPTIONAL: tuple[str, ...] = ("description", "categories", "systemMessages", "roles", "nsfw", "flags", "analytics", "discoverable")
+
     def __init__(self, serverID: str, owner: User, name: str, channels: list[ServerChannel], defaultPermissions, **kwargs) -> None:
         self.serverID: str = serverID
         self.owner: User = owner
@@ -102,38 +145,91 @@ class Server:
     def __repr__(self) -> str:
         return f"<pyrevolt.Server id={self.serverID} owner={self.owner} name={self.name} channels={self.channels} defaultPermissions={self.defaultPermissions}>"
     
+    def toDict(self) -> dict:
+        data: dict = {
+            "_id": self.serverID,
+            "owner": getattr(self.owner, "userID", self.owner),
+            "name": self.name,
+            "channels": [channel.channelID for channel in self.channels],
+            "default_permissions": self.defaultPermissions
+        }
+        if self.description is not None:
+            data["description"] = self.description
+        if self.categories is not None:
+            data["categories"] = [category.toDict() for category in self.categories]
+        if self.systemMessages is not None:
+            data["systemMessages"] = self.systemMessages.toDict()
+        if self.roles is not None:
+            data["roles"] = {roleID: role.toDict() for roleID, role in self.roles.items()}
+        for key in ("nsfw", "flags", "analytics", "discoverable"):
+            if getattr(self, key) is not None:
+                data[key] = getattr(self, key)
+        return data
+
     def copy(self) -> Server:
         return Server(self.serverID, self.owner, self.name, self.channels, self.defaultPermissions, categories=self.categories, systemMessages=self.systemMessages, roles=self.roles, nsfw=self.nsfw, flags=self.flags, analytics=self.analytics, discoverable=self.discoverable)
 
+    async def ResolveChannels(self, channelIDs: list[str], session: Session, fetch: bool = True) -> list[ServerChannel]:
+        # Channels already known are reused, only new IDs are fetched
+        known: dict[str, ServerChannel] = {channel.channelID: channel for channel in self.channels}
+        missing: list[str] = [channelID for channelID in channelIDs if fetch and channelID not in known and session.channels.get(channelID) is None]
+        for channel in await asyncio.gather(*[ServerChannel.FromID(channelID, session) for channelID in missing]):
+            if channel is not None:
+                channel.server = self
+                known[channel.channelID] = channel
+        channels: list[ServerChannel] = []
+        for channelID in channelIDs:
+            channel: ServerChannel|None = known.get(channelID) or session.channels.get(channelID)
+            if channel is not None:
+                channels.append(channel)
+        return channels
+
+    async def UpdateCategories(self, categories: list[dict], session: Session, fetch: bool = True) -> None:
+        known: dict[str, Category] = {category.categoryID: category for category in self.categories or []}
+        channels: list[ServerChannel] = await self.ResolveChannels(list(dict.fromkeys(channelID for category in categories for channelID in category["channels"])), session, fetch)
+        byID: dict[str, ServerChannel] = {channel.channelID: channel for channel in channels}
+        result: list[Category] = []
+        for data in categories:
+            category: Category|None = known.get(data["id"])
+            if category is None or category.title != data["title"] or [channel.channelID for channel in category.channels] != data["channels"]:
+                # Changed categories are replaced rather than patched, so snapshots keep the old one
+                category = Category(data["id"], data["title"], [byID[channelID] for channelID in data["channels"] if channelID in byID])
+            result.append(category)
+        if self.categories is None or len(result) != len(self.categories) or any(new is not old for new, old in zip(result, self.categories)):
+            self.categories = result
+
+    async def UpdateRoles(self, roles: dict[str, dict]) -> None:
+        # Members hold on to their Role objects, so known roles are patched in place
+        current: dict[str, Role] = self.roles or {}
+        for roleID, data in roles.items():
+            if roleID in current:
+                await current[roleID].update({key: value for key, value in data.items() if key != "_id"}, [key for key in Role.OPTIONAL if data.get(key) is None])
+        if self.roles is not None and set(roles) == set(current):
+            return
+        result: dict[str, Role] = {}
+        for roleID, data in roles.items():
+            result[roleID] = current.get(roleID) or await Role.FromDict({**data, "_id": roleID})
+        self.roles = result
+
     async def update(self, updatedData: dict, clear: list[str] = [], **kwargs) -> None:
-        if updatedData.get("owner") is not None:
-            self.owner = await User.FromID(updatedData["owner"], kwargs["session"])
+        session: Session = kwargs.get("session") or self.session
+        fetch: bool = kwargs.get("fetch", True)
+        if updatedData.get("owner") is not None and getattr(self.owner, "userID", None) != updatedData["owner"]:
+            self.owner = await User.FromID(updatedData["owner"], session) if fetch else session.users.get(updatedData["owner"])
         if updatedData.get("name") is not None:
             self.name = updatedData["name"]
         if updatedData.get("description") is not None:
             self.description = updatedData["description"]
-        if updatedData.get("channels") is not None:
-            self.channels = []
-            for channel in updatedData["channels"]:
-                channel: ServerChannel|None = await ServerChannel.FromJSON(json.dumps(channel), kwargs["session"])
-                if channel is not None:
-                    self.channels.append(channel)
+        if updatedData.get("channels") is not None and [channel.channelID for channel in self.channels] != updatedData["channels"]:
+            self.channels = await self.ResolveChannels(updatedData["channels"], session, fetch)
         if updatedData.get("default_permissions") is not None:
             self.defaultPermissions = updatedData["default_permissions"]
         if updatedData.get("categories") is not None:
-            self.categories = []
-            for category in updatedData["categories"]:
-                category: Category|None = await Category.FromJSON(json.dumps(category), kwargs["session"])
-                if category is not None:
-                    self.categories.append(category)
+            await self.UpdateCategories(updatedData["categories"], session, fetch)
         if updatedData.get("systemMessages") is not None:
-            self.systemMessages = SystemMessages.FromJSON(json.dumps(updatedData["systemMessages"]), kwargs["session"])
+            self.systemMessages = await SystemMessages.FromDict(updatedData["systemMessages"], session, fetch)
         if updatedData.get("roles") is not None:
-            self.roles = {}
-            for role in updatedData["roles"]:
-                role: Role|None = await Role.FromJSON(json.dumps(role))
-                if role is not None:
-                    self.roles[role.roleID] = role
+            await self.UpdateRoles(updatedData["roles"])
         if updatedData.get("nsfw") is not None:
             self.nsfw = updatedData["nsfw"]
         if updatedData.get("flags") is not None:
@@ -144,31 +240,32 @@ class Server:
             self.discoverable = updatedData["discoverable"]
 
         for key in clear:
-            setattr(self, key, None)
+            SetField(self, key, None)
 
     @staticmethod
-    async def FromJSON(jsonData: str|bytes, session: Session) -> Server:
-        data: dict = json.loads(jsonData)
+    async def FromDict(data: dict, session: Session, fetch: bool = True) -> Server:
         kwargs: dict = {}
         kwargs["session"] = session
         channels: list[ServerChannel] = []
         for channel in data["channels"]:
-            channels.append(await ServerChannel.FromID(channel, session))
+            channel: ServerChannel|None = await Category.ResolveChannel(channel, session, fetch)
+            if channel is not None:
+                channels.append(channel)
 
         if data.get("description") is not None:
             kwargs["description"] = data["description"]
         if data.get("categories") is not None:
             categories: list[Category] = []
             for category in data["categories"]:
-                categories.append(await Category.FromJSON(json.dumps(category), session))
+                categories.append(await Category.FromDict(category, session, fetch))
             kwargs["categories"] = categories
         if data.get("systemMessages") is not None:
-            kwargs["systemMessages"] = await SystemMessages.FromJSON(json.dumps(data["systemMessages"]), session)
+            kwargs["systemMessages"] = await SystemMessages.FromDict(data["systemMessages"], session, fetch)
         if data.get("roles") is not None:
             roles: dict[str, Role] = {}
             for roleID, role in data["roles"].items():
                 role["_id"] = roleID
-                roles[roleID] = await Role.FromJSON(json.dumps(role))
+                roles[roleID] = await Role.FromDict(role)
             kwargs["roles"] = roles
         if data.get("nsfw") is not None:
             kwargs["nsfw"] = data["nsfw"]
@@ -179,18 +276,30 @@ class Server:
         if data.get("discoverable") is not None:
             kwargs["discoverable"] = data["discoverable"]
 
-        server: Server = Server(data["_id"], await User.FromID(data["owner"], session), data["name"], channels, data["default_permissions"], **kwargs)
+        owner: User|None = session.users.get(data["owner"])
+        if owner is None and fetch:
+            owner = await User.FromID(data["owner"], session)
+        server: Server = Server(data["_id"], owner, data["name"], channels, data["default_permissions"], **kwargs)
         session.servers[server.serverID] = server
+        for channel in channels:
+            channel.server = server
         return server
 
+    @staticmethod
+    async def FromJSON(jsonData: str|bytes, session: Session) -> Server:
+        return await Server.FromDict(json.loads(jsonData), session)
+
     @staticmethod
     async def FromID(serverID: str, session: Session) -> Server:
-        if session.servers.get(serverID) is not None:
-            return session.servers[serverID]
-        result: dict = await session.Request(Method.GET, f"/servers/{serverID}")
-        if result.get("type") is not None:
-            return
-        return await Server.FromJSON(json.dumps(result), session)
+        server: Server|None = session.servers.get(serverID)
+        if server is not None:
+            return server
+        async def fetch() -> Server|None:
+            result: dict|None = await session.Fetch(f"/servers/{serverID}")
+            if result is None:
+                return
+            return await Server.FromDict(result, session)
+        return await session.Coalesce(f"/servers/{serverID}", fetch)
 
     async def Edit(self, **kwargs) -> None:
         data: dict = {}
@@ -205,21 +314,50 @@ class Server:
 
         result: dict = await self.session.Request(Method.PATCH, f"/servers/{self.serverID}", data=data)
         if result.get("type") is None:
-            await self.update(result, data["remove"])
+            await self.update(result, data.get("remove", []))
 
     async def Delete(self) -> None:
         await self.session.Request(Method.DELETE, f"/servers/{self.serverID}")
         self.session.servers.pop(self.serverID)
 
+    async def IterMembers(self, **kwargs) -> AsyncIterator[Member]:
+        params: dict = {}
+        if kwargs.get("excludeOffline"):
+            params["exclude_offline"] = "true"
+        cache: bool = kwargs.get("cache", True)
+        chunkSize: int = kwargs.get("chunkSize", 1000)
+        result: dict = await self.session.Request(Method.GET, f"/servers/{self.serverID}/members", params=params)
+        if result.get("type") is not None:
+            return
+        users: dict[str, dict] = {user["_id"]: user for user in result.get("users", [])}
+        members: list[dict] = result.get("members", [])
+        result.clear()
+        for index in range(len(members)):
+            data: dict = members[index]
+            # Drop the raw payload as it is consumed so only the objects the caller keeps stay alive
+            members[index] = None
+            userID: str = data["_id"]["user"]
+            user: User|None = self.session.users.get(userID)
+            if user is None and users.get(userID) is not None:
+                user = await User.FromDict(users.pop(userID), self.session, cache=cache)
+            member: Member|None = await Member.FromDict(data, self.session, fetch=False, cache=cache, user=user, server=self)
+            if member is not None:
+                yield member
+            if (index + 1) % chunkSize == 0:
+                await asyncio.sleep(0)
+
+    async def FetchMembers(self, **kwargs) -> list[Member]:
+        return [member async for member in self.IterMembers(**kwargs)]
+
     async def Kick(self, member: Member) -> None:
         if member.server != self:
             raise ValueError("Member is not in this server")
-        await self.session.Request(Method.DELETE, f"/servers/{self.serverID}/members/{member.userID}")
+        await self.session.Request(Method.DELETE, f"/servers/{self.serverID}/members/{member.user.userID}")
 
     async def Ban(self, member: Member) -> None:
         if member.server != self:
             raise ValueError("Member is not in this server")
-        await self.session.Request(Method.PUT, f"/servers/{self.serverID}/bans/{member.userID}")
+        await self.session.Request(Method.PUT, f"/servers/{self.serverID}/bans/{member.user.userID}")
 
     async def Unban(self, user: User) -> None:
         await self.session.Request(Method.DELETE, f"/servers/{self.serverID}/bans/{user.userID}")
\ No newline at end of file
@@ -1,8 +1,8 @@
 from __future__ import annotations
 from enum import Enum
 import json
-from ..client import Method
 from typing import TYPE_CHECKING
+from .common import Intern, SetField
 if TYPE_CHECKING:
     from ..session import Session
 
@@ -22,6 +22,8 @@ class Presence(Enum):
     Online = "Online"
 
 class Status:
+    __slots__ = ("presence", "text")
+
     def __init__(self, presence: Presence, **kwargs) -> None:
         self.presence: Presence = presence
         self.text: str|None = kwargs.get("text")
@@ -29,24 +31,39 @@ class Status:
     def __repr__(self) -> str:
         return f"<pyrevolt.Status presence={self.presence.value} text={self.text}>"
 
+    def toDict(self) -> dict:
+        data: dict = {"presence": self.presence.value}
+        if self.text is not None:
+            data["text"] = self.text
+        return data
+
     @staticmethod
-    async def FromJSON(jsonData: str|bytes) -> Status:
-        data: dict = json.loads(jsonData)
+    async def FromDict(data: dict) -> Status:
         kwargs: dict = {}
         if data.get("text") is not None:
             kwargs["text"] = data["text"]
         return Status(Presence(data["presence"]), **kwargs)
 
+    @staticmethod
+    async def FromJSON(jsonData: str|bytes) -> Status:
+        return await Status.FromDict(json.loads(jsonData))
+
 class BotUser:
+    __slots__ = ("ownerID",)
+
     def __init__(self, ownerID: str) -> None:
-        self.ownerID: str = ownerID
+        self.ownerID: str = Intern(ownerID)
     
     def __repr__(self) -> str:
         return f"<pyrevolt.Bot owner={self.ownerID}>"
 
 class User:
+    __slots__ = ("userID", "username", "badges", "online", "relationship", "status", "flags", "bot")
+    # Fields a full user payload leaves out when they are unset
+    OPTIONAL: tuple[str, ...] = ("badges", "online", "relationship", "status", "flags", "bot")
+
     def __init__(self, userID: str, username: str, **kwargs) -> None:
-        self.userID: str = userID
+        self.userID: str = Intern(userID)
         self.username: str = username
         self.badges: int|None = kwargs.get("badges")
         self.online: bool|None = kwargs.get("online")
@@ -61,6 +78,22 @@ class User:
     def __str__(self) -> str:
         return self.username
 
+    def toDict(self) -> dict:
+        data: dict = {"_id": self.userID, "username": self.username}
+        if self.badges is not None:
+            data["badges"] = self.badges
+        if self.online is not None:
+            data["online"] = self.online
+        if self.relationship is not None:
+            data["relationship"] = self.relationship.value
+        if self.status is not None:
+            data["status"] = self.status.toDict()
+        if self.flags is not None:
+            data["flags"] = self.flags
+        if self.bot is not None:
+            data["bot"] = {"owner": self.bot.ownerID}
+        return data
+
     def copy(self) -> User:
         return User(self.userID, self.username, badges=self.badges, online=self.online, relationship=self.relationship, status=self.status, flags=self.flags, bot=self.bot)
 
@@ -71,19 +104,19 @@ class User:
         if updateData.get("relationship") is not None:
             self.relationship = Relationship(updateData.get("relationship"))
         if updateData.get("status") is not None:
-            self.status = await Status.FromJSON(json.dumps(updateData.get("status")))
+            self.status = await Status.FromDict(updateData["status"])
         self.flags = updateData.get("flags", self.flags)
-        self.bot = updateData.get("bot", self.bot)
+        if updateData.get("bot") is not None:
+            self.bot = BotUser(updateData["bot"]["owner"])
         for key in clear:
-            setattr(self, key, None)
+            SetField(self, key, None)
 
     @property
     def mention(self) -> str:
         return f"<@{self.userID}>"
 
     @staticmethod
-    async def FromJSON(jsonData: str|bytes, session: Session) -> User:
-        data: dict = json.loads(jsonData)
+    async def FromDict(data: dict, session: Session, cache: bool = True) -> User:
         kwargs: dict = {}
         if data.get("badges") is not None:
             kwargs["badges"] = data["badges"]
@@ -92,28 +125,42 @@ class User:
         if data.get("relationship") is not None:
             kwargs["relationship"] = Relationship(data["relationship"])
         if data.get("status") is not None:
-            kwargs["status"] = await Status.FromJSON(json.dumps(data["status"]))
+            kwargs["status"] = await Status.FromDict(data["status"])
+        if data.get("flags") is not None:
+            kwargs["flags"] = data["flags"]
         if data.get("bot") is not None:
             kwargs["bot"] = BotUser(data["bot"]["owner"])
         user: User = User(data["_id"], data["username"], **kwargs)
-        session.users[user.userID] = user
+        if cache:
+            session.users[user.userID] = user
         return user
-        
+
+    @staticmethod
+    async def FromJSON(jsonData: str|bytes, session: Session) -> User:
+        return await User.FromDict(json.loads(jsonData), session)
+
     @staticmethod
     async def FromID(userID: str, session: Session) -> User:
-        if session.users.get(userID) is not None:
-            return session.users[userID]
-        result: dict = await session.Request(Method.GET, f"/users/{userID}")
-        if result.get("type") is not None:
-            return
-        return await User.FromJSON(json.dumps(result), session)
+        user: User|None = session.users.get(userID)
+        if user is not None:
+            return user
+        async def fetch() -> User|None:
+            result: dict|None = await session.Fetch(f"/users/{userID}")
+            if result is None:
+                return
+            return await User.FromDict(result, session)
+        return await session.Coalesce(f"/users/{userID}", fetch)
 
     @staticmethod
-    async def AttemptParse(content: str, session: Session) -> User | bool:
+    async def AttemptParse(content: str, session: Session) -> User | bool | None:
         if content.startswith("<@") and content.endswith(">"):
             userID: str = content[2:content.find(">")]
             user: User | None = session.users.get(userID)
             if user is None:
                 user = await User.FromID(userID, session)
             return user
+        if content.startswith("@") and len(content) > 1:
+            # Only cached users can be found by name, a name shared by several users does not resolve
+            users: list[User] = session.FindUsers(content[1:])
+            return users[0] if len(users) == 1 else None
         return False
\ No newline at end of file
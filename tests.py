@@ -1,6 +1,13 @@
 import asyncio
+import copy
+import json
+import time
+import types
 import unittest
+import unittest.mock
 import os
+import aiohttp.web
+import tempfile
 import pyrevolt
 
 class HTTPTests(unittest.IsolatedAsyncioTestCase):
@@ -27,6 +34,389 @@ class HTTPTests(unittest.IsolatedAsyncioTestCase):
         result: dict = await self.client.Request(request)
         self.assertEqual(result["username"], "Fabio")
 
+class ClientPoolTests(unittest.IsolatedAsyncioTestCase):
+    async def test_shared_client(self) -> None:
+        client: pyrevolt.HTTPClient = pyrevolt.HTTPClient(limit=10, limitPerHost=4, dnsCacheTTL=60)
+        session: pyrevolt.Session = pyrevolt.Session(client=client)
+        self.assertIs(session.gateway.client, client)
+        await session.Close()
+        self.assertFalse(client.closed)
+        self.assertEqual(client.GetClient().connector.limit_per_host, 4)
+        await client.Close()
+        with self.assertRaises(pyrevolt.ClosedSocketException):
+            client.GetClient()
+
+class NonJSONResponseTests(unittest.IsolatedAsyncioTestCase):
+    async def test_retry_html_error(self) -> None:
+        responses: list[aiohttp.web.Response] = [
+            aiohttp.web.Response(status=502, text="<html>Bad Gateway</html>", content_type="text/html"),
+            aiohttp.web.json_response({"_id": "U1", "username": "User"})
+        ]
+        async def handler(request: aiohttp.web.Request) -> aiohttp.web.Response:
+            return responses.pop(0)
+        application: aiohttp.web.Application = aiohttp.web.Application()
+        application.router.add_get("/users/U1", handler)
+        runner: aiohttp.web.AppRunner = aiohttp.web.AppRunner(application)
+        await runner.setup()
+        site: aiohttp.web.TCPSite = aiohttp.web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port: int = site._server.sockets[0].getsockname()[1]
+        client: pyrevolt.HTTPClient = pyrevolt.HTTPClient()
+        try:
+            with unittest.mock.patch.object(pyrevolt.Request, "API_BASE_URL", f"http://127.0.0.1:{port}"), unittest.mock.patch.object(pyrevolt.RateLimiter, "Backoff", return_value=0):
+                result: dict = await client.Request(pyrevolt.Request(pyrevolt.Method.GET, "/users/U1"))
+        finally:
+            await client.Close()
+            await runner.cleanup()
+        self.assertEqual(result["username"], "User")
+        self.assertEqual(responses, [])
+        self.assertEqual(client.DecodeBody(b"<html></html>", "text/html", 404)["type"], "InvalidResponse")
+
+    async def test_post_not_retried(self) -> None:
+        received: list[bytes] = []
+        async def handler(request: aiohttp.web.Request) -> aiohttp.web.Response:
+            received.append(await request.read())
+            return aiohttp.web.Response(status=502, text="<html>Bad Gateway</html>", content_type="text/html")
+        application: aiohttp.web.Application = aiohttp.web.Application()
+        application.router.add_post("/channels/C1/messages", handler)
+        runner: aiohttp.web.AppRunner = aiohttp.web.AppRunner(application)
+        await runner.setup()
+        site: aiohttp.web.TCPSite = aiohttp.web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port: int = site._server.sockets[0].getsockname()[1]
+        client: pyrevolt.HTTPClient = pyrevolt.HTTPClient()
+        try:
+            with unittest.mock.patch.object(pyrevolt.Request, "API_BASE_URL", f"http://127.0.0.1:{port}"), unittest.mock.patch.object(pyrevolt.RateLimiter, "Backoff", return_value=0):
+                with self.assertRaises(pyrevolt.HTTPException):
+                    await client.Request(pyrevolt.Request(pyrevolt.Method.POST, "/channels/C1/messages", data={"content": "hello"}))
+        finally:
+            await client.Close()
+            await runner.cleanup()
+        self.assertEqual(len(received), 1)
+
+class CodecTests(unittest.TestCase):
+    def test_codec_round_trip(self) -> None:
+        payload: dict = {"type": "Message", "content": "héllo", "mentions": ["01FYEQ9FTJ62N39TGZ9P7BMCZD"]}
+        for codec in pyrevolt.codec.AvailableCodecs().values():
+            codec: pyrevolt.JSONCodec = codec()
+            self.assertEqual(payload, codec.Decode(codec.Encode(payload)))
+            self.assertEqual(payload, codec.Decode(json.dumps(payload).encode()))
+
+    def test_codec_fallback(self) -> None:
+        self.assertIsInstance(pyrevolt.GetCodec("unknown"), pyrevolt.JSONCodec)
+        self.assertEqual(pyrevolt.GetCodec("json").NAME, "json")
+        codec: pyrevolt.JSONCodec = pyrevolt.JSONCodec()
+        self.assertIs(pyrevolt.GetCodec(codec), codec)
+
+    def test_request_body(self) -> None:
+        self.assertFalse(pyrevolt.Request(pyrevolt.Method.GET, "/", data={"a": 1}).hasBody)
+        self.assertFalse(pyrevolt.Request(pyrevolt.Method.DELETE, "/").hasBody)
+        self.assertTrue(pyrevolt.Request(pyrevolt.Method.POST, "/", data={"a": 1}).hasBody)
+        self.assertTrue(pyrevolt.Request(pyrevolt.Method.PUT, "/servers/S1/bans/U1").hasBody)
+
+class DispatcherTests(unittest.IsolatedAsyncioTestCase):
+    class FakeGateway:
+        def __init__(self, frames: list[dict]) -> None:
+            self.frames: list[dict] = frames
+
+        async def Receive(self) -> dict:
+            if len(self.frames) == 0:
+                await asyncio.sleep(0.05)
+                raise pyrevolt.ClosedSocketException()
+            return self.frames.pop(0)
+
+    async def test_dispatch_order(self) -> None:
+        frames: list[dict] = [{"type": "Ready"}]
+        frames.append({"type": "Bulk", "v": [{"type": "Message", "channel": "A", "n": 0}]})
+        for index in range(1, 20):
+            frames.append({"type": "Message", "channel": "AB"[index % 2], "n": index})
+        for index in range(8):
+            frames.append({"type": "ChannelCreate", "_id": f"C{index}"})
+            frames.append({"type": "ChannelUpdate", "id": f"C{index}"})
+        frames.append({"type": "ServerCreate", "_id": "S1"})
+        frames.append({"type": "ChannelCreate", "_id": "T1", "server": "S1"})
+        frames.append({"type": "Message", "channel": "T1", "n": 0})
+        processed: list[dict] = []
+
+        async def callback(data: dict) -> None:
+            if data["type"] == "Message" and data["channel"] == "A":
+                await asyncio.sleep(0.001)
+            if data["type"] == "ChannelCreate":
+                await asyncio.sleep(0.005)
+            if data["type"] == "ServerCreate":
+                await asyncio.sleep(0.02)
+            processed.append(data)
+
+        session: pyrevolt.Session = unittest.mock.Mock(gateway=self.FakeGateway(frames))
+        dispatcher: pyrevolt.Dispatcher = pyrevolt.Dispatcher(session, callback, workers=4, queueSize=2)
+        with self.assertRaises(pyrevolt.ClosedSocketException):
+            await dispatcher.Run()
+        self.assertEqual(processed[0]["type"], "Ready")
+        self.assertEqual(len(processed), 40)
+        for channel in "AB":
+            numbers: list[int] = [data["n"] for data in processed if data.get("channel") == channel]
+            self.assertEqual(numbers, sorted(numbers))
+        for index in range(8):
+            types: list[str] = [data["type"] for data in processed if f"C{index}" in (data.get("_id"), data.get("id"))]
+            self.assertEqual(types, ["ChannelCreate", "ChannelUpdate"])
+        self.assertEqual([data["type"] for data in processed[-3:]], ["ServerCreate", "ChannelCreate", "Message"])
+
+class RateLimitTests(unittest.IsolatedAsyncioTestCase):
+    def test_route(self) -> None:
+        route, major = pyrevolt.RateLimiter.Route("DELETE", "/servers/01FYEQ9FTJ62N39TGZ9P7BMCZD/members/01G2A3TMN0H5VD7JG5CSDT5B7R")
+        self.assertEqual(route, "DELETE /servers/:id/members/:id")
+        self.assertEqual(major, "01FYEQ9FTJ62N39TGZ9P7BMCZD")
+
+    async def test_bucket_waits_for_reset(self) -> None:
+        limiter: pyrevolt.RateLimiter = pyrevolt.RateLimiter()
+        path: str = "/channels/01FYEQ9FTJ62N39TGZ9P7BMCZD/messages"
+        limiter.Update("POST", path, {"X-RateLimit-Bucket": "messaging", "X-RateLimit-Limit": "2", "X-RateLimit-Remaining": "1", "X-RateLimit-Reset-After": "100"})
+        bucket: pyrevolt.Bucket = limiter.GetBucket("POST", path)
+        self.assertEqual(bucket.name, "messaging:01FYEQ9FTJ62N39TGZ9P7BMCZD")
+        await bucket.Acquire()
+        self.assertEqual(bucket.remaining, 0)
+        waiter: asyncio.Task = asyncio.create_task(bucket.Acquire())
+        await asyncio.sleep(0.01)
+        self.assertEqual(limiter.QueueDepth()[bucket.name], 1)
+        self.assertFalse(waiter.done())
+        await asyncio.wait_for(waiter, timeout=1)
+        self.assertEqual(bucket.remaining, 1)
+
+class CommandRouterTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.bot: pyrevolt.Bot = pyrevolt.Bot(prefix=["!", "bot "], caseInsensitive=True)
+        self.bot.session = unittest.mock.Mock()
+        self.calls: list[tuple] = []
+        return await super().asyncSetUp()
+
+    async def dispatch(self, content: str) -> None:
+        await self.bot.commands.dispatchCommand(types.SimpleNamespace(content=content, channel=types.SimpleNamespace(), author=types.SimpleNamespace()))
+
+    async def test_route(self) -> None:
+        @self.bot.commands.Command(name="ping", aliases=["p"])
+        async def ping(context, *args) -> None:
+            self.calls.append(("ping",) + args)
+
+        @self.bot.commands.Command(name="config")
+        async def config(context, *args) -> None:
+            self.calls.append(("config",) + args)
+
+        @self.bot.commands.Command(name="config set", aliases=["s"])
+        async def configSet(context, key, value) -> None:
+            self.calls.append(("config set", key, value))
+
+        await self.dispatch("!PING a")
+        await self.dispatch("bot p")
+        await self.dispatch("!config S colour red")
+        await self.dispatch("!config get colour")
+        await self.dispatch("?ping")
+        await self.dispatch("!unknown")
+        self.assertEqual(self.calls, [("ping", "a"), ("ping",), ("config set", "colour", "red"), ("config", "get", "colour")])
+
+    async def test_error_handler(self) -> None:
+        @self.bot.commands.Command(name="fail")
+        async def fail(context) -> None:
+            raise ValueError("failed")
+
+        @fail.Error
+        async def onError(context, error: Exception) -> None:
+            self.calls.append(("error", str(error)))
+
+        await self.dispatch("!fail")
+        self.assertEqual(self.calls, [("error", "failed")])
+
+class ConverterTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.bot: pyrevolt.Bot = pyrevolt.Bot(prefix="!")
+        self.bot.session = pyrevolt.Session()
+        self.calls: list[tuple] = []
+        async def request(method: pyrevolt.Method, url: str, **kwargs) -> dict:
+            await asyncio.sleep(0.05)
+            userID: str = url.split("/")[-1]
+            return {"_id": userID, "username": f"User {userID}"}
+        self.bot.session.Request = unittest.mock.AsyncMock(side_effect=request)
+        return await super().asyncSetUp()
+
+    async def asyncTearDown(self) -> None:
+        await self.bot.session.Close()
+        return await super().asyncTearDown()
+
+    async def dispatch(self, content: str) -> None:
+        await self.bot.commands.dispatchCommand(types.SimpleNamespace(content=content, session=self.bot.session, channel=types.SimpleNamespace(), author=types.SimpleNamespace()))
+
+    async def test_annotated_arguments(self) -> None:
+        @self.bot.commands.Command(name="give")
+        async def give(context, amount: int, *users: pyrevolt.User, reason: str = "none") -> None:
+            self.calls.append((amount, [user.username for user in users], reason))
+
+        @self.bot.commands.Command(name="echo")
+        async def echo(context, text, *, rest: str) -> None:
+            self.calls.append((text, rest))
+
+        started: float = time.perf_counter()
+        await self.dispatch("!give 5 <@U1> <@U2> <@U1> <@U3>")
+        self.assertLess(time.perf_counter() - started, 0.1)
+        await self.dispatch("!echo <@U9> hello <@U9>")
+        self.assertEqual(self.calls, [(5, ["User U1", "User U2", "User U1", "User U3"], "none"), ("<@U9>", "hello <@U9>")])
+        self.assertEqual(self.bot.session.Request.await_count, 3)
+
+    async def test_conversion_error(self) -> None:
+        @self.bot.commands.Command(name="add")
+        async def add(context, first: int, second: int|None = None) -> None:
+            self.calls.append((first, second))
+
+        @add.Error
+        async def onError(context, error: Exception) -> None:
+            self.calls.append(type(error))
+
+        await self.dispatch("!add 1 two")
+        await self.dispatch("!add one")
+        await self.dispatch("!add")
+        self.assertEqual(self.calls, [(1, None), pyrevolt.ArgumentConversionException, pyrevolt.ArgumentConversionException])
+
+    async def test_uncached_context(self) -> None:
+        await pyrevolt.Server.FromDict({"_id": "S1", "owner": "U1", "name": "Server", "channels": [], "default_permissions": 0}, self.bot.session, fetch=False)
+        async def request(method: pyrevolt.Method, url: str, **kwargs) -> dict:
+            if url == "/channels/C1":
+                return {"channel_type": "TextChannel", "_id": "C1", "server": "S1", "name": "general"}
+            if url == "/servers/S1/members/U2":
+                return {"_id": {"server": "S1", "user": "U2"}}
+            return {"_id": url.split("/")[-1], "username": "User"}
+        self.bot.session.Request = unittest.mock.AsyncMock(side_effect=request)
+
+        @self.bot.commands.Command(name="kick")
+        async def kick(context, member: pyrevolt.Member) -> None:
+            self.calls.append((context.author.userID, context.channel.channelID, member.memberID))
+
+        message: pyrevolt.Message = await pyrevolt.Message.FromDict({"_id": "M1", "channel": "C1", "author": "U1", "content": "!kick <@U2>"}, self.bot.session)
+        self.assertIsNone(message.channel)
+        await self.bot.commands.dispatchCommand(message)
+        self.assertEqual(self.calls, [("U1", "C1", "S1.U2")])
+
+class MessageFilterTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.bot: pyrevolt.Bot = pyrevolt.Bot(prefix="!")
+        self.bot.session = pyrevolt.Session(messageFilter=self.bot.FilterMessage)
+        self.bot.session.Request = unittest.mock.AsyncMock(side_effect=AssertionError("Unexpected REST request"))
+        await self.bot.session.HydrateReady(copy.deepcopy(ReadyTests.READY))
+        self.calls: list[str] = []
+        return await super().asyncSetUp()
+
+    async def asyncTearDown(self) -> None:
+        await self.bot.session.Close()
+        pyrevolt.OnMessage.LISTENERS.clear()
+        return await super().asyncTearDown()
+
+    def payload(self, messageID: str, content: str) -> dict:
+        return {"type": "Message", "_id": messageID, "channel": "C1", "author": "U1", "content": content}
+
+    async def test_prefilter(self) -> None:
+        @self.bot.commands.Command(name="ping")
+        async def ping(context) -> None:
+            self.calls.append(context.messageID)
+
+        with unittest.mock.patch.object(pyrevolt.Message, "FromDict", wraps=pyrevolt.Message.FromDict) as fromDict:
+            await self.bot.ProcessEvent(self.payload("M1", "hello there"))
+            await self.bot.ProcessEvent(self.payload("M2", "!pong"))
+            await self.bot.ProcessEvent(self.payload("M3", "!ping"))
+            self.assertEqual(fromDict.call_count, 1)
+        self.assertEqual(self.calls, ["M3"])
+        self.assertNotIn("M1", self.bot.session.messages)
+
+    async def test_listener_receives_every_message(self) -> None:
+        async def listener(message: pyrevolt.Message) -> None:
+            self.calls.append(message.content)
+        pyrevolt.OnMessage.LISTENERS.append(listener)
+        await self.bot.ProcessEvent(self.payload("M1", "hello there"))
+        self.assertEqual(self.calls, ["hello there"])
+        self.assertIn("M1", self.bot.session.messages)
+
+class ClusterTests(unittest.IsolatedAsyncioTestCase):
+    async def test_shared_client(self) -> None:
+        cluster: pyrevolt.Cluster = pyrevolt.Cluster(codec="json")
+        bots: list[pyrevolt.Bot] = [cluster.Add(pyrevolt.Bot(), f"token{index}") for index in range(3)]
+        bots[1].Start = unittest.mock.AsyncMock(side_effect=pyrevolt.HTTPException("Unauthorized", status=401))
+        for bot in bots[::2]:
+            bot.Start = unittest.mock.AsyncMock()
+        await cluster.Start()
+        self.assertTrue(all(bot.client is cluster.client for bot in bots))
+        self.assertEqual(list(cluster.failures), [1])
+        self.assertTrue(cluster.client.closed)
+        metrics: dict = cluster.Metrics()
+        self.assertEqual(metrics["bots"], 3)
+        self.assertEqual(metrics["failures"], 1)
+        self.assertIsNone(metrics["latency"])
+
+    async def test_listeners_per_bot(self) -> None:
+        cluster: pyrevolt.Cluster = pyrevolt.Cluster(codec="json")
+        bots: list[pyrevolt.Bot] = [cluster.Add(pyrevolt.Bot(messageFilter=lambda data: False), f"token{index}") for index in range(2)]
+        received: list[tuple[int, str]] = []
+        for index, bot in enumerate(bots):
+            async def listener(message: pyrevolt.Message, index: int = index) -> None:
+                received.append((index, message.content))
+            bot.on(pyrevolt.GatewayEvent.OnMessage)(listener)
+            bot.session = pyrevolt.Session(registry=bot.registry, messageFilter=bot.FilterMessage)
+            bot.session.users["U1"] = pyrevolt.User("U1", "Author")
+            bot.session.channels["C1"] = pyrevolt.SavedMessages("C1", bot.session.users["U1"], session=bot.session)
+        self.assertTrue(bots[0].session.WantsMessage({"content": "hello"}))
+        self.assertEqual(pyrevolt.OnMessage.LISTENERS, [])
+        await bots[0].ProcessEvent({"type": "Message", "_id": "M1", "channel": "C1", "author": "U1", "content": "first"})
+        await bots[1].ProcessEvent({"type": "Message", "_id": "M2", "channel": "C1", "author": "U1", "content": "second"})
+        self.assertEqual(received, [(0, "first"), (1, "second")])
+        for bot in bots:
+            await bot.session.Close()
+        await cluster.Close()
+
+    def test_aggregate(self) -> None:
+        metrics: dict = pyrevolt.Cluster.Aggregate([
+            {"bots": 2, "connected": 2, "latency": 0.1, "latencySamples": 2},
+            {"bots": 1, "connected": 0, "latency": None, "latencySamples": 0},
+            {"bots": 1, "connected": 1, "latency": 0.4, "latencySamples": 1}
+        ])
+        self.assertEqual(metrics["bots"], 4)
+        self.assertEqual(metrics["connected"], 3)
+        self.assertAlmostEqual(metrics["latency"], 0.2)
+
+    def test_rate_limits_per_token(self) -> None:
+        limiter: pyrevolt.RateLimiter = pyrevolt.RateLimiter()
+        first: pyrevolt.Bucket = limiter.GetBucket("GET", "/users/@me", "token1")
+        self.assertIsNot(first, limiter.GetBucket("GET", "/users/@me", "token2"))
+        self.assertIs(first, limiter.GetBucket("GET", "/users/@me", "token1"))
+        self.assertNotIn("token1", first.name)
+
+class MessageCacheTests(unittest.TestCase):
+    @staticmethod
+    def message(channelID: str) -> object:
+        return types.SimpleNamespace(channel=types.SimpleNamespace(channelID=channelID))
+
+    def test_lru_eviction(self) -> None:
+        cache: pyrevolt.MessageCache = pyrevolt.MessageCache(maxSize=2)
+        cache["1"] = self.message("A")
+        cache["2"] = self.message("A")
+        self.assertIsNotNone(cache.get("1"))
+        cache["3"] = self.message("B")
+        self.assertIsNone(cache.get("2"))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats.evictions, 1)
+        self.assertEqual((cache.stats.hits, cache.stats.misses), (1, 1))
+
+    def test_channel_cap(self) -> None:
+        cache: pyrevolt.MessageCache = pyrevolt.MessageCache(maxPerChannel=1)
+        cache["1"] = self.message("A")
+        cache["2"] = self.message("B")
+        cache["3"] = self.message("A")
+        self.assertNotIn("1", cache)
+        self.assertEqual(len(cache.Channel("A")), 1)
+        self.assertIsNotNone(cache.pop("2"))
+        self.assertIsNone(cache.pop("2", None))
+
+    def test_ttl(self) -> None:
+        cache: pyrevolt.MessageCache = pyrevolt.MessageCache(ttl=0)
+        cache["1"] = self.message("A")
+        time.sleep(0.001)
+        self.assertIsNone(cache.get("1"))
+        self.assertEqual(len(cache), 0)
+
 class GatewayTests(unittest.IsolatedAsyncioTestCase):
     async def asyncSetUp(self) -> None:
         self.gateway: pyrevolt.Gateway = pyrevolt.Gateway()
@@ -79,6 +469,583 @@ class GatewayTests(unittest.IsolatedAsyncioTestCase):
         await self.gateway.Authenticate(os.getenv("token"))
         self.assertEqual(expectedAuthenticatedResult, await self.gateway.Receive())
 
+class FakeWebsocket:
+    def __init__(self, reply: bool) -> None:
+        self.open: bool = True
+        self.reply: bool = reply
+        self.sent: list[dict] = []
+        self.frames: asyncio.Queue = asyncio.Queue()
+
+    async def send(self, payload: str) -> None:
+        self.sent.append(json.loads(payload))
+        if self.reply:
+            self.frames.put_nowait(json.dumps({"type": "Pong", "data": 0}))
+
+    async def ping(self) -> asyncio.Future:
+        waiter: asyncio.Future = asyncio.get_running_loop().create_future()
+        if self.reply:
+            waiter.set_result(0.0)
+        return waiter
+
+    async def recv(self) -> str:
+        return await self.frames.get()
+
+    async def close(self) -> None:
+        self.open = False
+
+class HeartbeatTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.gateway: pyrevolt.Gateway = pyrevolt.Gateway(codec="json", heartbeat={"interval": 0.01})
+        return await super().asyncSetUp()
+
+    async def asyncTearDown(self) -> None:
+        await self.gateway.Close()
+        return await super().asyncTearDown()
+
+    async def test_latency(self) -> None:
+        self.gateway.websocket = FakeWebsocket(True)
+        self.gateway.keepAlive.Start()
+        for _ in range(3):
+            self.assertEqual(await asyncio.wait_for(self.gateway.Receive(), timeout=1), {"type": "Pong", "data": 0})
+        await asyncio.sleep(0)
+        self.assertIsNotNone(self.gateway.latency)
+        self.assertGreaterEqual(sum(self.gateway.LatencyHistogram().values()), 3)
+        self.assertTrue(self.gateway.keepAlive.running)
+
+    async def test_pongs_without_receive(self) -> None:
+        # Nothing drives Receive, like a handler stuck on a slow event
+        self.gateway.websocket = FakeWebsocket(True)
+        self.gateway.keepAlive.Start()
+        await asyncio.sleep(0.1)
+        self.assertTrue(self.gateway.websocket.open)
+        self.assertTrue(self.gateway.keepAlive.running)
+        self.assertEqual(self.gateway.keepAlive.missed, 0)
+
+    async def test_send_failure_closes_socket(self) -> None:
+        self.gateway.websocket = FakeWebsocket(True)
+        self.gateway.websocket.send = unittest.mock.AsyncMock(side_effect=ConnectionResetError())
+        with self.assertLogs("pyrevolt.gateway", level="WARNING"):
+            self.gateway.keepAlive.Start()
+            await asyncio.wait_for(self.gateway.keepAlive.task, timeout=1)
+        self.assertFalse(self.gateway.websocket.open)
+
+    async def test_missed_pongs_close_socket(self) -> None:
+        self.gateway.websocket = FakeWebsocket(False)
+        self.gateway.keepAlive.Start()
+        await asyncio.wait_for(self.gateway.keepAlive.task, timeout=1)
+        self.assertFalse(self.gateway.websocket.open)
+        self.assertEqual(len(self.gateway.websocket.sent), 2)
+        self.assertIsNone(self.gateway.latency)
+
+    async def test_reconnect(self) -> None:
+        self.gateway.websocket = FakeWebsocket(False)
+        self.gateway.token = "token"
+        self.gateway.GetWebsocketURL = unittest.mock.AsyncMock(return_value="wss://example")
+        reconnected: FakeWebsocket = FakeWebsocket(False)
+        reconnected.frames.put_nowait(json.dumps({"type": "Authenticated"}))
+        await self.gateway.websocket.close()
+        with unittest.mock.patch("pyrevolt.gateway.client.connect", unittest.mock.AsyncMock(return_value=reconnected)):
+            self.assertEqual(await self.gateway.Receive(), {"type": "Authenticated"})
+        self.assertEqual(reconnected.sent, [{"type": "Authenticate", "token": "token"}])
+        self.assertEqual(self.gateway.reconnects, 1)
+        await self.gateway.Close()
+        with self.assertRaises(pyrevolt.ClosedSocketException):
+            await self.gateway.Receive()
+
+class ReadyTests(unittest.IsolatedAsyncioTestCase):
+    READY: dict = {
+        "type": "Ready",
+        "users": [
+            {"_id": "U1", "username": "Owner", "online": True},
+            {"_id": "U2", "username": "Bot", "bot": {"owner": "U1"}}
+        ],
+        "channels": [
+            {"channel_type": "TextChannel", "_id": "C1", "server": "S1", "name": "general"},
+            {"channel_type": "DirectMessage", "_id": "C2", "active": True, "recipients": ["U1", "U2"]}
+        ],
+        "servers": [{
+            "_id": "S1", "owner": "U1", "name": "Server", "channels": ["C1"], "default_permissions": 0,
+            "categories": [{"id": "K1", "title": "Text", "channels": ["C1"]}],
+            "roles": {"R1": {"name": "Moderator", "permissions": {"a": 0, "d": 0}, "rank": 0}}
+        }],
+        "members": [{"_id": {"server": "S1", "user": "U2"}, "roles": ["R1"]}]
+    }
+
+    async def asyncSetUp(self) -> None:
+        self.session: pyrevolt.Session = pyrevolt.Session()
+        self.session.Request = unittest.mock.AsyncMock(side_effect=AssertionError("Unexpected REST request"))
+        return await super().asyncSetUp()
+
+    async def asyncTearDown(self) -> None:
+        await self.session.Close()
+        return await super().asyncTearDown()
+
+    async def test_hydrate_ready(self) -> None:
+        data: dict = copy.deepcopy(self.READY)
+        await self.session.HydrateReady(data)
+        server: pyrevolt.Server = self.session.servers["S1"]
+        channel: pyrevolt.TextChannel = self.session.channels["C1"]
+        self.assertIs(channel.server, server)
+        self.assertIs(server.owner, self.session.users["U1"])
+        self.assertEqual(server.channels, [channel])
+        self.assertEqual(server.categories[0].channels, [channel])
+        self.assertEqual(self.session.members["S1.U2"].roles, [server.roles["R1"]])
+        self.assertEqual(len(self.session.channels["C2"].recipients), 2)
+        self.session.Request.assert_not_awaited()
+
+    async def test_reconcile_ready(self) -> None:
+        await self.session.HydrateReady(copy.deepcopy(self.READY))
+        owner: pyrevolt.User = self.session.users["U1"]
+        server: pyrevolt.Server = self.session.servers["S1"]
+        channel: pyrevolt.TextChannel = self.session.channels["C1"]
+        data: dict = copy.deepcopy(self.READY)
+        data["users"][0]["username"] = "Renamed"
+        data["channels"].pop()
+        await self.session.HydrateReady(data)
+        self.assertIs(self.session.users["U1"], owner)
+        self.assertEqual(owner.username, "Renamed")
+        self.assertIs(self.session.servers["S1"], server)
+        self.assertIs(self.session.channels["C1"], channel)
+        self.assertIs(channel.server, server)
+        self.assertIs(self.session.members["S1.U2"].server, server)
+        self.assertNotIn("C2", self.session.channels)
+        self.session.Request.assert_not_awaited()
+
+    async def test_ready_keeps_roles(self) -> None:
+        await self.session.HydrateReady(copy.deepcopy(self.READY))
+        await pyrevolt.User.FromDict({"_id": "U3", "username": "Member"}, self.session)
+        member: pyrevolt.Member = await pyrevolt.Member.FromDict({"_id": {"server": "S1", "user": "U3"}, "roles": ["R1"]}, self.session, fetch=False)
+        role: pyrevolt.Role = self.session.servers["S1"].roles["R1"]
+        data: dict = copy.deepcopy(self.READY)
+        data["users"][0].pop("online")
+        with unittest.mock.patch.object(pyrevolt.User, "FromDict", side_effect=AssertionError("Cached user rebuilt")):
+            await self.session.HydrateReady(data)
+        self.assertIsNone(self.session.users["U1"].online)
+        self.assertIs(self.session.servers["S1"].roles["R1"], role)
+        self.assertIs(self.session.members["S1.U3"], member)
+        await self.session.HandleServerRoleUpdate({"id": "S1", "role_id": "R1", "data": {"name": "Admin"}})
+        self.assertEqual(member.roles[0].name, "Admin")
+        self.assertEqual(self.session.members["S1.U2"].roles[0].name, "Admin")
+
+class MemberListTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.session: pyrevolt.Session = pyrevolt.Session()
+        self.session.Request = unittest.mock.AsyncMock(side_effect=AssertionError("Unexpected REST request"))
+        await self.session.HydrateReady(copy.deepcopy(ReadyTests.READY))
+        self.session.Request = unittest.mock.AsyncMock(side_effect=lambda *args, **kwargs: {
+            "members": [{"_id": {"server": "S1", "user": f"M{index}"}, "nickname": str(index), "roles": ["R1"]} for index in range(5)],
+            "users": [{"_id": f"M{index}", "username": f"Member {index}"} for index in range(5)]
+        })
+        return await super().asyncSetUp()
+
+    async def asyncTearDown(self) -> None:
+        await self.session.Close()
+        return await super().asyncTearDown()
+
+    async def test_fetch_members(self) -> None:
+        server: pyrevolt.Server = self.session.servers["S1"]
+        members: list[pyrevolt.Member] = await server.FetchMembers()
+        self.assertEqual(len(members), 5)
+        self.assertEqual(self.session.Request.await_count, 1)
+        self.assertIs(self.session.members["S1.M3"], members[3])
+        self.assertEqual(members[3].user.username, "Member 3")
+        self.assertEqual(members[3].roles, [server.roles["R1"]])
+
+    async def test_iterate_without_cache(self) -> None:
+        server: pyrevolt.Server = self.session.servers["S1"]
+        nicknames: list[str] = [member.nickname async for member in server.IterMembers(cache=False, chunkSize=2)]
+        self.assertEqual(nicknames, ["0", "1", "2", "3", "4"])
+        self.assertNotIn("S1.M0", self.session.members)
+        self.assertNotIn("M0", self.session.users)
+
+class HistoryTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.session: pyrevolt.Session = pyrevolt.Session()
+        self.session.Request = unittest.mock.AsyncMock(side_effect=AssertionError("Unexpected REST request"))
+        await self.session.HydrateReady(copy.deepcopy(ReadyTests.READY))
+        self.messages: list[dict] = [{"_id": f"{index:04}", "channel": "C1", "author": "U3", "content": str(index)} for index in range(250)]
+
+        async def request(method: pyrevolt.Method, url: str, **kwargs) -> dict:
+            params: dict = kwargs["params"]
+            messages: list[dict] = [message for message in self.messages if message["_id"] < params.get("before", "9999") and message["_id"] > params.get("after", "")]
+            if params.get("sort") == "Latest":
+                messages.reverse()
+            return {"messages": messages[:params["limit"]], "users": [{"_id": "U3", "username": "Author"}]}
+        self.session.Request = unittest.mock.AsyncMock(side_effect=request)
+        return await super().asyncSetUp()
+
+    async def asyncTearDown(self) -> None:
+        await self.session.Close()
+        return await super().asyncTearDown()
+
+    async def test_history_latest(self) -> None:
+        channel: pyrevolt.TextChannel = self.session.channels["C1"]
+        contents: list[str] = [message.content async for message in channel.History()]
+        self.assertEqual(contents, [str(index) for index in range(249, -1, -1)])
+        self.assertEqual(self.session.Request.await_count, 3)
+        self.assertEqual(self.session.users["U3"].username, "Author")
+
+    async def test_history_after_without_cache(self) -> None:
+        channel: pyrevolt.TextChannel = self.session.channels["C1"]
+        messages: list[pyrevolt.Message] = [message async for message in channel.History(after="0099", limit=120, cache=False)]
+        self.assertEqual([message.content for message in messages], [str(index) for index in range(100, 220)])
+        self.assertEqual(len(self.session.messages), 0)
+
+class LazyMessageTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.session: pyrevolt.Session = pyrevolt.Session()
+        self.session.Request = unittest.mock.AsyncMock(side_effect=AssertionError("Unexpected REST request"))
+        await self.session.HydrateReady(copy.deepcopy(ReadyTests.READY))
+        return await super().asyncSetUp()
+
+    async def asyncTearDown(self) -> None:
+        await self.session.Close()
+        return await super().asyncTearDown()
+
+    async def test_lazy_references(self) -> None:
+        message: pyrevolt.Message = await pyrevolt.Message.FromDict({
+            "_id": "M2", "channel": "C1", "author": "U1", "content": "hi",
+            "mentions": ["U1", "U5", "U6"], "replies": ["M1"]
+        }, self.session)
+        self.session.Request.assert_not_awaited()
+        self.assertEqual(message.content, "hi")
+        self.assertIs(message.channel, self.session.channels["C1"])
+        self.assertIs(message.author, self.session.users["U1"])
+        self.assertEqual(message.mentions, [self.session.users["U1"]])
+        self.assertEqual(message.replies, [])
+
+        async def request(method: pyrevolt.Method, url: str, **kwargs) -> dict:
+            if "/messages/" in url:
+                return {"_id": "M1", "channel": "C1", "author": "U5", "content": "first"}
+            return {"_id": url.split("/")[-1], "username": "Fetched"}
+        self.session.Request = unittest.mock.AsyncMock(side_effect=request)
+        await message.resolve()
+        self.assertEqual(self.session.Request.await_count, 3)
+        self.assertEqual([user.userID for user in message.mentions], ["U1", "U5", "U6"])
+        self.assertEqual(message.replies[0].content, "first")
+        self.assertIsNone(message.replies[0].resolvedAuthor)
+
+class SlotsTests(unittest.IsolatedAsyncioTestCase):
+    async def test_slotted_update(self) -> None:
+        user: pyrevolt.User = pyrevolt.User("U1", "User")
+        self.assertFalse(hasattr(user, "__dict__"))
+        role: pyrevolt.Role = pyrevolt.Role("R1", "Role", 0, colour="#fff")
+        await role.update({"name": "Renamed", "icon": "unknown"}, ["Colour"])
+        self.assertEqual(role.name, "Renamed")
+        self.assertIsNone(role.colour)
+        channel: pyrevolt.TextChannel = pyrevolt.TextChannel("C1", None, "general")
+        await channel.update({"default_permissions": 5, "last_message_id": "M1", "icon": {}}, ["Description"])
+        self.assertEqual(channel.defaultPermissions, 5)
+        self.assertEqual(channel.lastMessageID, "M1")
+        self.assertEqual(channel.copy().name, "general")
+
+class SnapshotTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.session: pyrevolt.Session = pyrevolt.Session()
+        self.session.Request = unittest.mock.AsyncMock(side_effect=AssertionError("Unexpected REST request"))
+        await self.session.HydrateReady(copy.deepcopy(ReadyTests.READY))
+        return await super().asyncSetUp()
+
+    async def asyncTearDown(self) -> None:
+        await self.session.Close()
+        return await super().asyncTearDown()
+
+    async def test_update_snapshots(self) -> None:
+        user: pyrevolt.User = self.session.users["U1"]
+        data: dict = await self.session.ProcessGateway({"type": "UserUpdate", "id": "U1", "data": {"username": "Renamed"}, "clear": ["StatusText"]})
+        self.assertEqual(data["type"], pyrevolt.GatewayEvent.UserUpdate.value)
+        before: pyrevolt.User = pyrevolt.Snapshot(user)
+        await user.update({"username": "Again"})
+        self.assertIsInstance(before, pyrevolt.User)
+        self.assertEqual(str(before), "Renamed")
+        self.assertEqual(before.mention, "<@U1>")
+        self.assertIs(self.session.users["U1"], user)
+        self.assertEqual(user.username, "Again")
+        with self.assertRaises(AttributeError):
+            before.username = "Changed"
+
+        events: list[tuple] = []
+        async def listener(old: pyrevolt.Channel, new: pyrevolt.Channel) -> None:
+            events.append((old.name, new.name, new))
+        pyrevolt.GatewayEvent.ChannelUpdate.value.LISTENERS.append(listener)
+        try:
+            await self.session.ProcessGateway({"type": "ChannelUpdate", "id": "C1", "data": {"name": "renamed"}})
+            await self.session.ProcessGateway({"type": "ChannelUpdate", "id": "C9", "data": {"name": "unknown"}})
+        finally:
+            pyrevolt.GatewayEvent.ChannelUpdate.value.LISTENERS.remove(listener)
+        self.assertEqual(events, [("general", "renamed", self.session.channels["C1"])])
+
+        member: pyrevolt.Member = self.session.members["S1.U2"]
+        await self.session.ProcessGateway({"type": "ServerMemberUpdate", "id": {"server": "S1", "user": "U2"}, "data": {"nickname": "Nick"}})
+        self.assertIs(self.session.members["S1.U2"], member)
+        self.assertEqual(member.nickname, "Nick")
+        self.session.Request.assert_not_awaited()
+
+class IndexTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.session: pyrevolt.Session = pyrevolt.Session()
+        self.session.Request = unittest.mock.AsyncMock(side_effect=AssertionError("Unexpected REST request"))
+        await self.session.HydrateReady(copy.deepcopy(ReadyTests.READY))
+        return await super().asyncSetUp()
+
+    async def asyncTearDown(self) -> None:
+        await self.session.Close()
+        return await super().asyncTearDown()
+
+    async def test_indexes(self) -> None:
+        server: pyrevolt.Server = self.session.servers["S1"]
+        self.assertEqual(self.session.ServerMembers("S1"), [self.session.members["S1.U2"]])
+        self.assertEqual(self.session.UserServers("U2"), [server])
+        self.assertEqual(self.session.FindChannels("S1", "GENERAL"), [self.session.channels["C1"]])
+        self.assertEqual(await pyrevolt.User.AttemptParse("@owner", self.session), self.session.users["U1"])
+
+        await self.session.ProcessGateway({"type": "UserUpdate", "id": "U1", "data": {"username": "Admin"}})
+        self.assertEqual(self.session.FindUsers("owner"), [])
+        self.assertEqual(self.session.FindUsers("admin"), [self.session.users["U1"]])
+        await self.session.ProcessGateway({"type": "ChannelCreate", "channel_type": "TextChannel", "_id": "C3", "server": "S1", "name": "General"})
+        self.assertEqual({channel.channelID for channel in self.session.FindChannels("S1", "general")}, {"C1", "C3"})
+        await self.session.ProcessGateway({"type": "ChannelUpdate", "id": "C1", "data": {"name": "rules"}})
+        await self.session.ProcessGateway({"type": "ChannelDelete", "id": "C3"})
+        self.assertEqual(self.session.FindChannels("S1", "general"), [])
+        self.assertEqual(self.session.FindChannels("S1", "rules"), [self.session.channels["C1"]])
+        await self.session.ProcessGateway({"type": "ServerMemberLeave", "id": "S1", "user": "U2"})
+        self.assertEqual(self.session.ServerMembers("S1"), [])
+        self.assertEqual(self.session.UserServers("U2"), [])
+        self.session.Request.assert_not_awaited()
+
+    async def test_server_update(self) -> None:
+        server: pyrevolt.Server = self.session.servers["S1"]
+        role: pyrevolt.Role = server.roles["R1"]
+        category: pyrevolt.Category = server.categories[0]
+        await self.session.ProcessGateway({"type": "ChannelCreate", "channel_type": "TextChannel", "_id": "C3", "server": "S1", "name": "rules"})
+        updates: list = []
+        async def listener(before: pyrevolt.Server, after: pyrevolt.Server) -> None:
+            updates.append((before, after))
+        self.session.registry.Listen(pyrevolt.GatewayEvent.ServerUpdate.value, listener)
+        await self.session.ProcessGateway({"type": "ServerUpdate", "id": "S1", "data": {
+            "channels": ["C1", "C3"],
+            "categories": [{"id": "K1", "title": "Text", "channels": ["C1"]}, {"id": "K2", "title": "Info", "channels": ["C3"]}],
+            "roles": {"R1": {"name": "Admin", "permissions": {"a": 0, "d": 0}, "rank": 0}}
+        }})
+        before, after = updates[0]
+        self.assertIs(after, server)
+        self.assertEqual(before.roles["R1"].name, "Moderator")
+        self.assertIsInstance(before.roles["R1"], pyrevolt.Role)
+        self.assertEqual(server.channels, [self.session.channels["C1"], self.session.channels["C3"]])
+        self.assertIs(server.categories[0], category)
+        self.assertEqual(server.categories[1].channels, [self.session.channels["C3"]])
+        self.assertIs(server.roles["R1"], role)
+        self.assertIs(self.session.members["S1.U2"].roles[0], role)
+        self.assertEqual(role.name, "Admin")
+        self.session.Request.assert_not_awaited()
+
+class PermissionTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.session: pyrevolt.Session = pyrevolt.Session()
+        self.session.Request = unittest.mock.AsyncMock(side_effect=AssertionError("Unexpected REST request"))
+        ready: dict = copy.deepcopy(ReadyTests.READY)
+        view: int = pyrevolt.Permission.ViewChannel | pyrevolt.Permission.SendMessage
+        ready["servers"][0]["default_permissions"] = view
+        ready["servers"][0]["roles"]["R1"]["permissions"] = {"a": pyrevolt.Permission.ManageMessages, "d": pyrevolt.Permission.SendMessage}
+        ready["channels"][0]["role_permissions"] = {"R1": {"a": pyrevolt.Permission.SendMessage, "d": 0}}
+        await self.session.HydrateReady(ready)
+        return await super().asyncSetUp()
+
+    async def asyncTearDown(self) -> None:
+        await self.session.Close()
+        return await super().asyncTearDown()
+
+    async def test_effective_permissions(self) -> None:
+        member: pyrevolt.Member = self.session.members["S1.U2"]
+        channel: pyrevolt.TextChannel = self.session.channels["C1"]
+        self.assertEqual(member.Permissions(), pyrevolt.Permission.ViewChannel | pyrevolt.Permission.ManageMessages)
+        permissions: pyrevolt.Permission = member.Permissions(channel)
+        self.assertTrue(permissions & pyrevolt.Permission.SendMessage)
+        self.assertIs(self.session.permissions.Get(member, channel), permissions)
+
+        await self.session.ProcessGateway({"type": "ChannelUpdate", "id": "C1", "data": {"default_permissions": {"a": 0, "d": pyrevolt.Permission.ViewChannel}}})
+        self.assertEqual(member.Permissions(channel), pyrevolt.Permission(0))
+        await self.session.ProcessGateway({"type": "ServerRoleDelete", "id": "S1", "role_id": "R1"})
+        self.assertEqual(member.roles, [])
+        self.assertEqual(member.Permissions(), pyrevolt.Permission.ViewChannel | pyrevolt.Permission.SendMessage)
+        self.assertEqual(self.session.permissions.Calculate(pyrevolt.Member(self.session.users["U1"], self.session.servers["S1"]), channel), pyrevolt.Permission.All())
+
+    async def test_private_channel_permissions(self) -> None:
+        owner: pyrevolt.User = self.session.users["U1"]
+        member: pyrevolt.Member = self.session.members["S1.U2"]
+        stranger: pyrevolt.User = pyrevolt.User("U3", "stranger")
+        direct: pyrevolt.DirectMessage = self.session.channels["C2"]
+        self.assertEqual(member.Permissions(direct), pyrevolt.permissions.DEFAULT_DIRECT_MESSAGE)
+        self.assertEqual(self.session.permissions.Get(stranger, direct), pyrevolt.Permission(0))
+        owner.relationship = pyrevolt.Relationship.Blocked
+        self.assertEqual(self.session.permissions.Calculate(member, direct), pyrevolt.permissions.DEFAULT_VIEW_ONLY)
+
+        group: pyrevolt.Group = pyrevolt.Group("G1", "Group", [owner, member.user], owner, session=self.session)
+        self.assertEqual(self.session.permissions.Calculate(owner, group), pyrevolt.Permission.All())
+        self.assertEqual(member.Permissions(group), pyrevolt.permissions.DEFAULT_DIRECT_MESSAGE)
+        self.assertEqual(self.session.permissions.Calculate(stranger, group), pyrevolt.Permission(0))
+        group.permissions = pyrevolt.Permission.SendMessage
+        self.assertEqual(self.session.permissions.Get(member, group), pyrevolt.Permission.SendMessage | pyrevolt.Permission.ViewChannel)
+        self.assertEqual(self.session.permissions.entries.get("S1", {}).get(("U2", "G1")), None)
+
+class SenderTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.session: pyrevolt.Session = pyrevolt.Session(sender={"merge": True})
+        self.sent: list[tuple[str, dict]] = []
+        async def request(method: pyrevolt.Method, url: str, **kwargs) -> dict:
+            channelID: str = url.split("/")[2]
+            self.sent.append((channelID, kwargs["data"]))
+            await asyncio.sleep(0.05)
+            return {"_id": f"M{len(self.sent)}", "channel": channelID, "author": "U1", "content": kwargs["data"]["content"]}
+        self.session.Request = unittest.mock.AsyncMock(side_effect=request)
+        return await super().asyncSetUp()
+
+    async def asyncTearDown(self) -> None:
+        await self.session.Close()
+        return await super().asyncTearDown()
+
+    async def test_send_queue(self) -> None:
+        embed: pyrevolt.Embed = pyrevolt.Embed.Create(title="Title", iconURL="icon")
+        start: float = time.perf_counter()
+        messages: list[pyrevolt.Message] = await asyncio.gather(
+            self.session.sender.Send("C1", content="one"),
+            self.session.sender.Send("C1", content="two"),
+            self.session.sender.Send("C1", content="three", embed=embed, masquerade=pyrevolt.Masquerade(name="Name")),
+            *[self.session.sender.Send(f"D{index}", content="hello") for index in range(5)]
+        )
+        self.assertLess(time.perf_counter() - start, 0.25)
+        self.assertEqual(self.session.sender.QueueDepth(), {})
+        self.assertEqual([data for channelID, data in self.sent if channelID == "C1"], [
+            {"content": "one\ntwo"},
+            {"content": "three", "embeds": [{"icon_url": "icon", "title": "Title"}], "masquerade": {"name": "Name"}}
+        ])
+        self.assertIs(messages[0], messages[1])
+        self.assertEqual(messages[2].content, "three")
+        self.assertEqual(embed.type, pyrevolt.EmbedType.Text)
+
+    async def test_close_in_flight(self) -> None:
+        sends: list[asyncio.Task] = [asyncio.create_task(self.session.sender.Send("C1", content=content)) for content in ("one", "two")]
+        await asyncio.sleep(0.01)
+        self.assertEqual(len(self.sent), 1)
+        await self.session.sender.Close()
+        results: list = await asyncio.wait_for(asyncio.gather(*sends, return_exceptions=True), timeout=1)
+        self.assertTrue(all(isinstance(result, asyncio.CancelledError) for result in results))
+
+class StoreTests(unittest.IsolatedAsyncioTestCase):
+    async def test_warm_start(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path: str = os.path.join(directory, "cache.db")
+            session: pyrevolt.Session = pyrevolt.Session(store=path)
+            session.Request = unittest.mock.AsyncMock(side_effect=AssertionError("Unexpected REST request"))
+            await session.HydrateReady(copy.deepcopy(ReadyTests.READY))
+            session.token = "token"
+            session.self = session.users["U2"]
+            await session.Close()
+
+            session = pyrevolt.Session(store=path)
+            session.Request = unittest.mock.AsyncMock(side_effect=AssertionError("Unexpected REST request"))
+            session.Connect = unittest.mock.AsyncMock()
+            session.gateway.Authenticate = unittest.mock.AsyncMock()
+            await session.Start("token")
+            self.assertIs(session.self, session.users["U2"])
+            self.assertEqual(session.users["U2"].bot.ownerID, "U1")
+            channel: pyrevolt.TextChannel = session.channels["C1"]
+            server: pyrevolt.Server = session.servers["S1"]
+            self.assertIs(channel.server, server)
+            self.assertEqual(server.categories[0].channels, [channel])
+            self.assertIs(session.members["S1.U2"].roles[0], server.roles["R1"])
+            self.assertEqual(session.channels["C2"].recipients, [session.users["U1"], session.users["U2"]])
+
+            ready: dict = copy.deepcopy(ReadyTests.READY)
+            ready["channels"].pop()
+            await session.HydrateReady(ready)
+            self.assertIs(session.channels["C1"], channel)
+            self.assertIs(session.servers["S1"], server)
+            self.assertNotIn("C2", session.channels)
+            session.Request.assert_not_awaited()
+            await session.Close()
+
+    async def test_other_token(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path: str = os.path.join(directory, "cache.db")
+            session: pyrevolt.Session = pyrevolt.Session(store=path)
+            await session.HydrateReady(copy.deepcopy(ReadyTests.READY))
+            session.token = "token"
+            session.self = session.users["U2"]
+            await session.Close()
+
+            session = pyrevolt.Session(store=path)
+            self.assertEqual(await session.store.Load(session, "other"), {})
+            self.assertEqual(len(session.users), 0)
+            self.assertEqual(len(session.servers), 0)
+            await session.Close()
+
+class CoalesceTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.session: pyrevolt.Session = pyrevolt.Session()
+        return await super().asyncSetUp()
+
+    async def asyncTearDown(self) -> None:
+        await self.session.Close()
+        return await super().asyncTearDown()
+
+    async def test_single_flight(self) -> None:
+        async def request(method: pyrevolt.Method, url: str, **kwargs) -> dict:
+            await asyncio.sleep(0.01)
+            return {"_id": "U1", "username": "User"}
+        self.session.Request = unittest.mock.AsyncMock(side_effect=request)
+        users: list[pyrevolt.User] = await asyncio.gather(*[pyrevolt.User.FromID("U1", self.session) for _ in range(10)])
+        self.assertEqual(self.session.Request.await_count, 1)
+        for user in users:
+            self.assertIs(user, self.session.users["U1"])
+        self.assertEqual(len(self.session.inflight), 0)
+
+    async def test_negative_cache(self) -> None:
+        self.session.Request = unittest.mock.AsyncMock(return_value={"type": "NotFound"})
+        self.assertIsNone(await pyrevolt.User.FromID("U1", self.session))
+        self.assertIsNone(await pyrevolt.User.FromID("U1", self.session))
+        self.assertEqual(self.session.Request.await_count, 1)
+        self.session.missingTTL = 0
+        self.session.missing.clear()
+        await pyrevolt.User.FromID("U1", self.session)
+        self.assertEqual(self.session.Request.await_count, 2)
+
+class EventRegistryTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.session: pyrevolt.Session = pyrevolt.Session()
+        return await super().asyncSetUp()
+
+    async def asyncTearDown(self) -> None:
+        await self.session.Close()
+        pyrevolt.Unknown.LISTENERS.clear()
+        return await super().asyncTearDown()
+
+    def test_resolve(self) -> None:
+        event, handler = self.session.registry.Resolve("ChannelStartTyping")
+        self.assertIs(event, pyrevolt.GatewayEvent.ChannelStartTyping.value)
+        self.assertIsNotNone(handler)
+        event, _ = self.session.registry.Resolve("SomethingNew")
+        self.assertIs(event, pyrevolt.GatewayEvent.Unknown.value)
+
+    async def test_unknown_and_custom_events(self) -> None:
+        received: list[dict] = []
+        async def listener(data: dict) -> None:
+            received.append(data)
+        pyrevolt.Unknown.LISTENERS.append(listener)
+        data: dict = await self.session.ProcessGateway({"type": "SomethingNew", "value": 1})
+        self.assertEqual(data["type"], "SomethingNew")
+        self.assertEqual(received, [{"type": "SomethingNew", "value": 1}])
+
+        class EmojiCreate(pyrevolt.Event):
+            VALUE = "EmojiCreate"
+            LISTENERS: list[callable] = []
+        async def handler(session: pyrevolt.Session, data: dict) -> list:
+            return [data["name"]]
+        EmojiCreate.LISTENERS.append(listener)
+        self.session.RegisterEvent(EmojiCreate(), handler)
+        await self.session.ProcessGateway({"type": "EmojiCreate", "name": "party"})
+        self.assertEqual(received[-1], "party")
+
 class SessionTests(unittest.IsolatedAsyncioTestCase):
     async def asyncSetUp(self) -> None:
         self.session: pyrevolt.Session = pyrevolt.Session()